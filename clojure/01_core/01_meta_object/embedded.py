@@ -1,3 +1,11 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""from PySide6.QtCore import QCoreApplication
-app = QCoreApplication([])""", globals())
+    run_block(__file__, 1, r"""from PySide6.QtCore import QCoreApplication
+app = QCoreApplication.instance() or QCoreApplication([])""", globals())
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtCore import QCoreApplication, QTimer
 import sys
 if not QCoreApplication.instance():
@@ -7,7 +15,7 @@ if not QCoreApplication.instance():
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtCore import QTimer, QCoreApplication
 
 def delayed_task():
@@ -20,7 +28,7 @@ timer.singleShot(100, delayed_task)
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 from PySide6.QtCore import QObject, QEvent, QCoreApplication
 
 class CustomEvent(QEvent):
@@ -46,7 +54,7 @@ QCoreApplication.postEvent(receiver, event)
 """, globals())
 
 def run_block_4():
-    exec(r"""
+    run_block(__file__, 4, r"""
 from PySide6.QtCore import QObject, Signal, QCoreApplication, QTimer
 
 class EventEmitter(QObject):
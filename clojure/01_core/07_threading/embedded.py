@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtCore import QThread, Signal
 import time
 
@@ -24,7 +32,7 @@ class WorkerThread(QThread):
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtCore import QRunnable, QThread
 
 class Task(QRunnable):
@@ -40,7 +48,7 @@ class Task(QRunnable):
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 from PySide6.QtCore import QCoreApplication
 import sys
 if not QCoreApplication.instance():
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QImage, QPolygon
 from PySide6.QtCore import Qt, QPoint
 
@@ -46,7 +54,7 @@ else:
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtGui import QPainter, QColor, QImage
 from PySide6.QtCore import Qt, QRect
 
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtGui import QImage, QColor, QPainter, QPen, QBrush
 from PySide6.QtCore import Qt
 
@@ -41,7 +49,7 @@ else:
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtGui import QImage, QImageWriter
 
 # 支持的格式
@@ -63,7 +71,7 @@ print('\n已保存为 PNG, JPEG, BMP 格式')
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 from PySide6.QtGui import QImage, QColor
 
 # 创建图像
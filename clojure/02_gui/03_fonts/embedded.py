@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtGui import QFont, QFontMetrics
 
 # 创建字体
@@ -24,7 +32,7 @@ print(f'  (Normal={QFont.Normal}, Bold={QFont.Bold})')
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtGui import QFont
 
 # 不同字重
@@ -51,7 +59,7 @@ print(f'\n当前字重: {font.weight()} (Bold={QFont.Bold})')
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 from PySide6.QtGui import QFont
 
 font = QFont('Helvetica', 14)
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtCore import QCoreApplication
 import sys
 if not QCoreApplication.instance():
@@ -7,7 +15,7 @@ if not QCoreApplication.instance():
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtCore import QTimer, QCoreApplication
 
 counter = 0
@@ -29,7 +37,7 @@ print('定时器已启动 (500ms)')
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 from PySide6.QtCore import QObject, QEvent, QCoreApplication
 
 # 定义自定义事件类型
@@ -57,7 +65,7 @@ print('自定义事件已发送')
 """, globals())
 
 def run_block_4():
-    exec(r"""
+    run_block(__file__, 4, r"""
 from PySide6.QtCore import QObject, Signal, QTimer
 
 class EventEmitter(QObject):
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QCheckBox, QRadioButton,
@@ -10,7 +18,7 @@ from PySide6.QtCore import Qt
 import sys
 
 # 创建应用
-app = QApplication([])
+app = QApplication.instance() or QApplication([])
 
 # 创建主窗口
 window = QWidget()
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QListWidget, QListWidgetItem, QTableWidget, QTableWidgetItem,
@@ -153,7 +161,7 @@ def create_proxy_model_demo():
     layout.addWidget(list_view)
     return widget
 
-app = QApplication(sys.argv)
+app = QApplication.instance() or QApplication(sys.argv)
 print('=== PySide6 模型/视图示例 ===\n')
 
 main_window = QMainWindow()
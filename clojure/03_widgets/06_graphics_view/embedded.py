@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QGraphicsScene, QGraphicsView,
     QGraphicsItem, QToolBar
@@ -17,7 +25,7 @@ class ZoomView(QGraphicsView):
         factor = 1.2 if event.angleDelta().y() > 0 else 0.8
         self.scale(factor, factor)
 
-app = QApplication(sys.argv)
+app = QApplication.instance() or QApplication(sys.argv)
 win = QMainWindow()
 win.setWindowTitle('PySide6 Graphics View Demo')
 win.resize(800, 600)
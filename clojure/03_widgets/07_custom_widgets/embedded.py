@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QSlider
@@ -289,7 +297,7 @@ print('2. 开关按钮 (带动画)')
 print('3. 星级评分 (鼠标交互)')
 print()
 
-app = QApplication(sys.argv)
+app = QApplication.instance() or QApplication(sys.argv)
 demo = CustomWidgetsDemo()
 demo.show()
 print('窗口已显示，请在 GUI 中操作自定义控件')
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtCore import QObject, QTimer, QCoreApplication
 from PySide6.QtNetwork import QTcpServer, QTcpSocket, QHostAddress, QAbstractSocket
 import sys
@@ -77,7 +85,7 @@ class TcpClient(QObject):
     def _on_error(self, error):
         print(f'[client] error {error} {self._socket.errorString()}')
 
-app = QCoreApplication(sys.argv)
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
 print('=== PySide6 TCP 通信示例 ===\n')
 server = EchoServer(0)
 port = server.port()
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtCore import QObject, QTimer, QCoreApplication
 from PySide6.QtNetwork import QUdpSocket, QHostAddress
 import sys
@@ -59,7 +67,7 @@ class UdpSender(QObject):
         else:
             self._timer.stop()
 
-app = QCoreApplication(sys.argv)
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
 print('=== PySide6 UDP 通信示例 ===\n')
 receiver = UdpReceiver(0)
 sender = UdpSender()
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtCore import QUrl, QTimer, QCoreApplication
 from PySide6.QtWebSockets import QWebSocket
 from PySide6.QtNetwork import QAbstractSocket
@@ -95,7 +103,7 @@ client = WebSocketClient()
 """, globals())
 
 def run_block_4():
-    exec(r"""
+    run_block(__file__, 4, r"""
 from PySide6.QtCore import QCoreApplication
 
 # 获取已有的应用实例
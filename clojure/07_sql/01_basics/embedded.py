@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 import sqlite3
 import os
 
@@ -39,7 +47,7 @@ conn.close()
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 import sqlite3
 
 db_path = '/tmp/clojure_test.db'
@@ -68,7 +76,7 @@ conn.close()
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 import sqlite3
 
 db_path = '/tmp/clojure_test.db'
@@ -97,7 +105,7 @@ conn.close()
 """, globals())
 
 def run_block_4():
-    exec(r"""
+    run_block(__file__, 4, r"""
 from PySide6.QtSql import QSqlDatabase, QSqlQuery
 
 # 添加数据库
@@ -124,7 +132,7 @@ else:
 """, globals())
 
 def run_block_5():
-    exec(r"""
+    run_block(__file__, 5, r"""
 import os
 db_path = '/tmp/clojure_test.db'
 if os.path.exists(db_path):
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtSql import QSqlDatabase, QSqlQuery, QSqlError
 import os
 
@@ -19,7 +27,7 @@ else:
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtSql import QSqlQuery
 
 query = QSqlQuery()
@@ -36,7 +44,7 @@ query.exec('''
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 from PySide6.QtSql import QSqlQuery
 
 query = QSqlQuery()
@@ -85,7 +93,7 @@ else:
 """, globals())
 
 def run_block_4():
-    exec(r"""
+    run_block(__file__, 4, r"""
 from PySide6.QtSql import QSqlQuery
 
 query = QSqlQuery()
@@ -138,7 +146,7 @@ while query.next():
 """, globals())
 
 def run_block_5():
-    exec(r"""
+    run_block(__file__, 5, r"""
 from PySide6.QtSql import QSqlQuery
 
 query = QSqlQuery()
@@ -176,7 +184,7 @@ while query.next():
 """, globals())
 
 def run_block_6():
-    exec(r"""
+    run_block(__file__, 6, r"""
 from PySide6.QtSql import QSqlQuery
 
 query = QSqlQuery()
@@ -203,7 +211,7 @@ if query.next():
 """, globals())
 
 def run_block_7():
-    exec(r"""
+    run_block(__file__, 7, r"""
 from PySide6.QtSql import QSqlDatabase, QSqlQuery
 
 db = QSqlDatabase.database()
@@ -263,7 +271,7 @@ if query.next():
 """, globals())
 
 def run_block_8():
-    exec(r"""
+    run_block(__file__, 8, r"""
 from PySide6.QtSql import QSqlQuery
 
 query = QSqlQuery()
@@ -285,7 +293,7 @@ if not query.exec():
 """, globals())
 
 def run_block_9():
-    exec(r"""
+    run_block(__file__, 9, r"""
 from PySide6.QtSql import QSqlDatabase
 import os
 
@@ -6,7 +6,7 @@ def run_block_1():
         print(f"[Audio] QtMultimedia unavailable: {exc}")
         return
 
-    app = QCoreApplication([])
+    app = QCoreApplication.instance() or QCoreApplication([])
     outputs = QMediaDevices.audioOutputs()
     for device in outputs:
         print(f' - {device.description()}')
@@ -6,7 +6,7 @@ def run_block_1():
         print(f"[Video] QtMultimedia unavailable: {exc}")
         return
 
-    app = QCoreApplication([])
+    app = QCoreApplication.instance() or QCoreApplication([])
     cameras = QMediaDevices.videoInputs()
     if not cameras:
         print('No video devices found.')
@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""class Calculator:
+    run_block(__file__, 1, r"""class Calculator:
     def __init__(self):
         pass
     
@@ -22,7 +30,7 @@ def run_block_1():
 """, globals())
 
 def run_block_2():
-    exec(r"""import unittest
+    run_block(__file__, 2, r"""import unittest
 
 class TestCalculator(unittest.TestCase):
     @classmethod
@@ -93,7 +101,7 @@ class TestCalculator(unittest.TestCase):
 """, globals())
 
 def run_block_3():
-    exec(r"""from PySide6.QtWidgets import QApplication, QPushButton, QLineEdit
+    run_block(__file__, 3, r"""from PySide6.QtWidgets import QApplication, QPushButton, QLineEdit
 from PySide6.QtTest import QTest
 from PySide6.QtCore import Qt
 import unittest
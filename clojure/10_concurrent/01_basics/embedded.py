@@ -1,5 +1,13 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtCore import QCoreApplication
 import sys
 if not QCoreApplication.instance():
@@ -7,7 +15,7 @@ if not QCoreApplication.instance():
 """, globals())
 
 def run_block_2():
-    exec(r"""
+    run_block(__file__, 2, r"""
 from PySide6.QtCore import QRunnable, QThreadPool, QThread
 import threading
 
@@ -33,7 +41,7 @@ print('所有 Runnable 任务完成')
 """, globals())
 
 def run_block_3():
-    exec(r"""
+    run_block(__file__, 3, r"""
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
@@ -55,7 +63,7 @@ print('所有计算完成')
 """, globals())
 
 def run_block_4():
-    exec(r"""
+    run_block(__file__, 4, r"""
 from concurrent.futures import ThreadPoolExecutor
 import time
 
@@ -80,7 +88,7 @@ print(f'Reduce 结果 (平方和): {result}')
 """, globals())
 
 def run_block_5():
-    exec(r"""
+    run_block(__file__, 5, r"""
 import asyncio
 
 async def async_task(name, delay):
@@ -1,6 +1,14 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 import sys
 from PySide6.QtGui import QGuiApplication
-app = QGuiApplication(sys.argv)
+app = QGuiApplication.instance() or QGuiApplication(sys.argv)
 """, globals())
@@ -1,18 +1,36 @@
+import os as _os
+import sys as _sys
+
+_ROOT = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+if _ROOT not in _sys.path:
+    _sys.path.append(_ROOT)
+from block_runner import run_block
+
 def run_block_1():
-    exec(r"""
+    run_block(__file__, 1, r"""
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLineEdit, QPushButton, QListWidget, QListWidgetItem, QLabel,
     QFrame, QComboBox, QInputDialog, QButtonGroup
 )
-from PySide6.QtCore import Qt, QStandardPaths, QTimer
+from PySide6.QtCore import (
+    Qt, QStandardPaths, QTimer, QFileSystemWatcher, QLockFile, QObject, QEvent,
+    QCoreApplication
+)
 from PySide6.QtGui import QColor
+from array import array
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 import json
 import os
+import sys
+import tempfile
+import time
 from pathlib import Path
 
-app = QApplication([])
+app = QApplication.instance() or QApplication([])
 app.setStyle('Fusion')
 
 # Setup palette
@@ -24,37 +42,184 @@ palette.setColor(palette.ColorRole.Highlight, '#2f6fed')
 palette.setColor(palette.ColorRole.HighlightedText, '#ffffff')
 app.setPalette(palette)
 
-ui_queue = []
+class UiDispatcher(QObject):
+    # Runs callbacks enqueued from any thread (e.g. JVM threads) on the Qt thread.
+    # deque.append/popleft are atomic, so producers never take a lock; a posted
+    # event wakes the loop only when the queue goes from idle to busy, and each
+    # drain stops after budget_ms so a flood of callbacks can't freeze the UI.
+    WAKE_EVENT = QEvent.Type(QEvent.registerEventType())
+
+    def __init__(self, budget_ms=8):
+        super().__init__()
+        self.budget = budget_ms / 1000
+        self.queue = deque()
+        self.scheduled = False
+        self.processed = 0
+        self.errors = 0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.last_drain_ms = 0.0
+
+    def enqueue(self, callback):
+        self.queue.append((time.perf_counter(), callback))
+        if not self.scheduled:
+            self.scheduled = True
+            QCoreApplication.postEvent(self, QEvent(self.WAKE_EVENT))
+
+    def event(self, event):
+        if event.type() == self.WAKE_EVENT:
+            self.drain()
+            return True
+        return super().event(event)
+
+    def drain(self, budget=None):
+        # Clear the flag first: anything enqueued from now on posts a new wakeup
+        self.scheduled = False
+        start = time.perf_counter()
+        deadline = start + (self.budget if budget is None else budget)
+        queue = self.queue
+        while queue:
+            enqueued_at, cb = queue.popleft()
+            now = time.perf_counter()
+            latency = now - enqueued_at
+            self.total_latency += latency
+            if latency > self.max_latency:
+                self.max_latency = latency
+            try:
+                cb()
+            except Exception as e:
+                self.errors += 1
+                print(f'UI dispatch error: {e}')
+            self.processed += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.last_drain_ms = (time.perf_counter() - start) * 1000
+        if queue and not self.scheduled:
+            # Out of budget: let the event loop paint, then continue
+            self.scheduled = True
+            QCoreApplication.postEvent(self, QEvent(self.WAKE_EVENT))
+
+    def metrics(self):
+        processed = self.processed
+        depth = len(self.queue)
+        return {
+            'depth': depth,
+            'enqueued': processed + depth,
+            'processed': processed,
+            'errors': self.errors,
+            'avg_latency_ms': self.total_latency / processed * 1000 if processed else 0.0,
+            'max_latency_ms': self.max_latency * 1000,
+            'last_drain_ms': self.last_drain_ms
+        }
+
+ui_dispatcher = UiDispatcher()
 
 def enqueue_ui(callback):
-    ui_queue.append(callback)
+    ui_dispatcher.enqueue(callback)
 
 def flush_ui_queue():
-    while ui_queue:
-        cb = ui_queue.pop(0)
-        try:
-            cb()
-        except Exception as e:
-            print(f'UI dispatch error: {e}')
+    # Run everything queued so far, without a time budget
+    while ui_dispatcher.queue:
+        ui_dispatcher.drain(budget=float('inf'))
 
-ui_timer = QTimer()
-ui_timer.setInterval(0)
-ui_timer.timeout.connect(flush_ui_queue)
-ui_timer.start()
+def ui_metrics():
+    return ui_dispatcher.metrics()
 
 def data_file_path():
     data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
     Path(data_dir).mkdir(parents=True, exist_ok=True)
     return os.path.join(data_dir, 'todos.json')
 
+# todos.json is shared with python/12_project/todo_app (same format, same lock):
+# {"version": 2, "tasks": [{"id", "text", "done", "priority", "tag", "createdAt"}]}
+TASKS_FORMAT_VERSION = 2
+# Item data roles as plain ints: Qt enum arithmetic is slow in hot loops
+CREATED_ROLE = int(Qt.UserRole)
+PRIORITY_ROLE = CREATED_ROLE + 1
+TAG_ROLE = CREATED_ROLE + 2
+TEXT_ROLE = CREATED_ROLE + 3
+ID_ROLE = CREATED_ROLE + 4
+PRIORITY_LABELS = ('High', 'Medium', 'Low')
+PRIORITY_CODES = {label: code for code, label in enumerate(PRIORITY_LABELS)}
+TASK_FIELDS = ('text', 'done', 'priority', 'tag', 'createdAt')
+
+@contextmanager
+def file_lock(path, timeout_ms=5000):
+    # Advisory lock held around "check the file, then replace it"
+    lock = QLockFile(path + '.lock')
+    lock.setStaleLockTime(30000)
+    if not lock.tryLock(timeout_ms):
+        raise TimeoutError(f'{path} is locked by another process')
+    try:
+        yield
+    finally:
+        lock.unlock()
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(prefix='.todos-', suffix='.tmp', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def read_records(path):
+    # {id: record}; version 1 files (bare array of labels) get positional ids
+    with open(path, 'r', encoding='utf-8') as f:
+        content = json.load(f)
+    if isinstance(content, dict):
+        return {task.get('id'): task for task in content.get('tasks', [])}
+    records = {}
+    for task_id, task in enumerate(content, start=1):
+        raw_text = task.get('text', '')
+        records[task_id] = {
+            'id': task_id,
+            'text': raw_text.split(' [')[0] if ' [' in raw_text else raw_text,
+            'done': task.get('done', False),
+            'priority': task.get('priority') or 'Medium',
+            'tag': task.get('tag') or '',
+            'createdAt': task.get('createdAt') or ''
+        }
+    return records
+
+def item_record(item):
+    return {
+        'id': item.data(ID_ROLE),
+        'text': item.data(TEXT_ROLE) or '',
+        'done': item.checkState() == Qt.Checked,
+        'priority': item.data(PRIORITY_ROLE) or 'Medium',
+        'tag': item.data(TAG_ROLE) or '',
+        'createdAt': item.data(CREATED_ROLE) or ''
+    }
+
+def set_item_record(item, task):
+    item.setCheckState(Qt.Checked if task.get('done', False) else Qt.Unchecked)
+    item.setData(CREATED_ROLE, task.get('createdAt') or '')
+    item.setData(PRIORITY_ROLE, task.get('priority') or 'Medium')
+    item.setData(TAG_ROLE, task.get('tag') or '')
+    item.setData(TEXT_ROLE, task.get('text', ''))
+    item.setData(ID_ROLE, task['id'])
+    update_item_label(item)
+
 def priority_color(priority):
     colors = {'High': '#ef4444', 'Medium': '#f59e0b', 'Low': '#10b981'}
     return colors.get(priority, '#9ca3af')
 
 def update_item_label(item):
-    base = item.data(Qt.UserRole + 3) or ''
-    priority = item.data(Qt.UserRole + 1) or 'Medium'
-    tag = item.data(Qt.UserRole + 2) or ''
+    base = item.data(TEXT_ROLE) or ''
+    priority = item.data(PRIORITY_ROLE) or 'Medium'
+    tag = item.data(TAG_ROLE) or ''
     suffix = f' [{priority}]'
     if tag:
         suffix += f' #{tag}'
@@ -68,6 +233,9 @@ class TodoApp(QWidget):
         self.resize(560, 680)
         self.loading = True
         self.current_filter = 0  # ALL
+        self.next_id = 1
+        self.base = {}  # id -> record, as last read from or written to the file
+        self.signature = None
         self._setup_ui()
         self._setup_styles()
         self._connect_signals()
@@ -191,49 +359,111 @@ class TodoApp(QWidget):
         self.clear_button.clicked.connect(self.clear_completed)
         self.list_widget.itemChanged.connect(self.on_item_changed)
         self.filters.idClicked.connect(self.on_filter_changed)
+        
+        # Other processes (e.g. the Python todo_app) may change the file
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.addPath(os.path.dirname(data_file_path()))
+        self.watcher.fileChanged.connect(self.schedule_merge)
+        self.watcher.directoryChanged.connect(self.schedule_merge)
+        self.merge_timer = QTimer(self)
+        self.merge_timer.setSingleShot(True)
+        self.merge_timer.setInterval(100)
+        self.merge_timer.timeout.connect(self.merge_external)
     
     def save_tasks(self):
-        tasks = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            tasks.append({
-                'text': item.text(),
-                'done': item.checkState() == Qt.Checked,
-                'createdAt': item.data(Qt.UserRole) or '',
-                'priority': item.data(Qt.UserRole + 1) or 'Medium',
-                'tag': item.data(Qt.UserRole + 2) or ''
-            })
+        path = data_file_path()
         try:
-            with open(data_file_path(), 'w') as f:
-                json.dump(tasks, f)
+            with file_lock(path):
+                if file_signature(path) != self.signature:
+                    self.merge_file(path)  # never overwrite changes we haven't seen
+                records = [item_record(self.list_widget.item(i))
+                           for i in range(self.list_widget.count())]
+                write_atomic(path, json.dumps({'version': TASKS_FORMAT_VERSION,
+                                               'tasks': records}))
+                self.base = {task['id']: task for task in records}
+                self.signature = file_signature(path)
         except Exception as e:
             print(f'Error saving tasks: {e}')
     
+    def new_item(self, task):
+        item = QListWidgetItem()
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
+        set_item_record(item, task)
+        self.next_id = max(self.next_id, task['id'] + 1)
+        return item
+    
     def load_tasks(self):
+        path = data_file_path()
         try:
-            with open(data_file_path(), 'r') as f:
-                tasks = json.load(f)
-            for task in tasks:
-                raw_text = task.get('text', '')
-                done = task.get('done', False)
-                created_at = task.get('createdAt', '')
-                priority = task.get('priority', 'Medium')
-                tag = task.get('tag', '')
-                base_text = raw_text.split(' [')[0] if ' [' in raw_text else raw_text
-                
-                item = QListWidgetItem()
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
-                item.setCheckState(Qt.Checked if done else Qt.Unchecked)
-                item.setData(Qt.UserRole, created_at)
-                item.setData(Qt.UserRole + 1, priority)
-                item.setData(Qt.UserRole + 2, tag)
-                item.setData(Qt.UserRole + 3, base_text)
-                update_item_label(item)
-                self.list_widget.addItem(item)
+            self.signature = file_signature(path)
+            records = read_records(path)
+            for task_id in sorted(records):
+                self.list_widget.addItem(self.new_item(records[task_id]))
+            self.base = records
         except FileNotFoundError:
             pass
         except Exception as e:
             print(f'Error loading tasks: {e}')
+        if os.path.exists(path):
+            self.watcher.addPath(path)
+    
+    def schedule_merge(self, path=''):
+        self.merge_timer.start()
+    
+    def merge_external(self):
+        path = data_file_path()
+        if os.path.exists(path) and path not in self.watcher.files():
+            self.watcher.addPath(path)  # an atomic replace drops the old file
+        if file_signature(path) == self.signature:
+            return
+        try:
+            with file_lock(path):
+                rekeyed = self.merge_file(path)
+            if rekeyed:
+                self.save_tasks()
+        except Exception as e:
+            print(f'Error merging external changes: {e}')
+    
+    def merge_file(self, path):
+        # Apply the changes between self.base and the file to the list, by id.
+        # Only changed tasks are touched. Returns True if a task added there
+        # had to be renumbered because we added a different task with its id.
+        signature = file_signature(path)
+        theirs = read_records(path) if signature is not None else {}
+        items = {}
+        for i in range(self.list_widget.count()):
+            item = self.list_widget.item(i)
+            items[item.data(ID_ROLE)] = item
+        rekeyed = False
+        self.loading = True
+        try:
+            for task_id in self.base:
+                if task_id not in theirs and task_id in items:
+                    self.list_widget.takeItem(self.list_widget.row(items.pop(task_id)))
+            for task_id, task in theirs.items():
+                if self.base.get(task_id) == task:
+                    continue
+                item = items.get(task_id)
+                if item is None:
+                    if task_id not in self.base:
+                        ids = [self.list_widget.item(i).data(ID_ROLE)
+                               for i in range(self.list_widget.count())]
+                        self.list_widget.insertItem(bisect_left(ids, task_id), self.new_item(task))
+                    # else: removed here, the local removal wins
+                elif task_id not in self.base and item_record(item) != task:
+                    # Both sides added a task with this id: keep ours, renumber theirs
+                    self.list_widget.addItem(self.new_item(dict(task, id=self.next_id)))
+                    rekeyed = True
+                else:
+                    set_item_record(item, task)
+        finally:
+            self.loading = False
+        self.base = theirs
+        self.signature = signature
+        self.update_stats()
+        self.update_empty_state()
+        self.apply_filter()
+        return rekeyed
     
     def update_empty_state(self):
         is_empty = self.list_widget.count() == 0
@@ -261,14 +491,14 @@ class TodoApp(QWidget):
         raw_text = self.input_field.text().strip()
         if not raw_text:
             return
-        item = QListWidgetItem()
-        item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
-        item.setCheckState(Qt.Unchecked)
-        item.setData(Qt.UserRole, datetime.now().isoformat())
-        item.setData(Qt.UserRole + 1, self.priority_box.currentText())
-        item.setData(Qt.UserRole + 2, self.tag_input.text().strip())
-        item.setData(Qt.UserRole + 3, raw_text)
-        update_item_label(item)
+        item = self.new_item({
+            'id': self.next_id,
+            'text': raw_text,
+            'done': False,
+            'priority': self.priority_box.currentText(),
+            'tag': self.tag_input.text().strip(),
+            'createdAt': datetime.now().isoformat()
+        })
         self.list_widget.addItem(item)
         self.input_field.clear()
         self.tag_input.clear()
@@ -282,10 +512,10 @@ class TodoApp(QWidget):
         item = self.list_widget.currentItem()
         if not item:
             return
-        current_text = item.data(Qt.UserRole + 3) or ''
+        current_text = item.data(TEXT_ROLE) or ''
         text, ok = QInputDialog.getText(self, 'Edit Task', 'Task:', QLineEdit.Normal, current_text)
         if ok and text.strip():
-            item.setData(Qt.UserRole + 3, text.strip())
+            item.setData(TEXT_ROLE, text.strip())
             update_item_label(item)
             self.save_tasks()
     
@@ -319,6 +549,101 @@ class TodoApp(QWidget):
     def on_filter_changed(self, filter_id):
         self.current_filter = filter_id
         self.apply_filter()
+    
+    def snapshot_tasks(self):
+        # The whole table as columns, so a caller on the JVM side needs one call
+        # instead of one per field per row. Numeric columns are raw buffers
+        # (ids: int64, done and priority: uint8 in PRIORITY_LABELS order).
+        ids, done, priority = array('q'), bytearray(), bytearray()
+        text, tag, created_at = [], [], []
+        for i in range(self.list_widget.count()):
+            item = self.list_widget.item(i)
+            ids.append(item.data(ID_ROLE))
+            done.append(item.checkState() == Qt.Checked)
+            priority.append(PRIORITY_CODES.get(item.data(PRIORITY_ROLE), 1))
+            text.append(item.data(TEXT_ROLE) or '')
+            tag.append(item.data(TAG_ROLE) or '')
+            created_at.append(item.data(CREATED_ROLE) or '')
+        return {
+            'count': len(ids),
+            'byteorder': sys.byteorder,
+            'ids': ids.tobytes(),
+            'done': bytes(done),
+            'priority': bytes(priority),
+            'priorities': list(PRIORITY_LABELS),
+            'text': text,
+            'tag': tag,
+            'createdAt': created_at
+        }
+    
+    def apply_ops(self, ops):
+        # Apply a batch of edits with one repaint, one filter pass and one save.
+        # Ops are dicts: {'op': 'add', 'text', 'priority', 'tag', 'done', 'createdAt'},
+        # {'op': 'set', 'id', <fields>}, {'op': 'toggle', 'id'}, {'op': 'remove', 'id'}
+        # and {'op': 'clear_done'}. Unknown ids are skipped.
+        ops = list(ops)
+        for op in ops:
+            if op.get('op') not in ('add', 'set', 'toggle', 'remove', 'clear_done'):
+                raise ValueError(f"Unknown op: {op.get('op')}")
+        items = {}
+        for i in range(self.list_widget.count()):
+            item = self.list_widget.item(i)
+            items[item.data(ID_ROLE)] = item
+        added, changed, removed = [], 0, 0
+        self.loading = True
+        self.list_widget.setUpdatesEnabled(False)
+        try:
+            for op in ops:
+                kind = op.get('op')
+                if kind == 'add':
+                    text = str(op.get('text') or '').strip()
+                    if not text:
+                        continue
+                    item = self.new_item({
+                        'id': self.next_id,
+                        'text': text,
+                        'done': bool(op.get('done', False)),
+                        'priority': op.get('priority') or 'Medium',
+                        'tag': str(op.get('tag') or '').strip(),
+                        'createdAt': op.get('createdAt') or datetime.now().isoformat()
+                    })
+                    self.list_widget.addItem(item)
+                    items[item.data(ID_ROLE)] = item
+                    added.append(item.data(ID_ROLE))
+                elif kind == 'clear_done':
+                    for task_id in [task_id for task_id, item in items.items()
+                                    if item.checkState() == Qt.Checked]:
+                        self.list_widget.takeItem(self.list_widget.row(items.pop(task_id)))
+                        removed += 1
+                else:
+                    item = items.get(op.get('id'))
+                    if item is None:
+                        continue
+                    if kind == 'remove':
+                        self.list_widget.takeItem(self.list_widget.row(items.pop(op['id'])))
+                        removed += 1
+                        continue
+                    task = item_record(item)
+                    if kind == 'toggle':
+                        task['done'] = not task['done']
+                    else:
+                        task.update((key, op[key]) for key in TASK_FIELDS if key in op)
+                    set_item_record(item, task)
+                    changed += 1
+        finally:
+            self.loading = False
+            self.list_widget.setUpdatesEnabled(True)
+        self.update_stats()
+        self.update_empty_state()
+        self.apply_filter()
+        self.save_tasks()
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+def snapshot_tasks():
+    return window.snapshot_tasks()
+
+def apply_ops(ops):
+    return window.apply_ops(ops)
 
 print('=== PySide6 Todo App (via Clojure) ===')
 print('Data is saved to:', data_file_path())
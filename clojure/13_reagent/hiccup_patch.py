@@ -0,0 +1,289 @@
+"""
+Batched widget patches for the Hiccup renderer (qt6_tutorials.ch13.reagent.core)
+
+The Clojure side diffs the virtual tree and sends the result as one list
+of patches, so a re-render is a single bridge call no matter how many
+widgets it touches. Nodes are integer ids chosen by the caller:
+
+    ['create', id, 'QPushButton', kind]      kind: 'widget' or 'layout'
+    ['stretch', id, layout_id, value]        append a stretch to a layout
+    ['insert', layout_id, id]                append a widget/layout to a layout
+    ['set-layout', widget_id, layout_id]
+    ['set-content', widget_id, id]           QScrollArea.setWidget
+    ['set', id, 'prop-name', value]          kebab-case property -> setPropName
+    ['connect', id, 'signalName', 'on-event']
+    ['disconnect', id, 'signalName']
+    ['reorder', layout_id, [id, ...]]        move layout items into this order
+    ['remove', id]                           detach and delete a subtree
+
+Class and setter lookups are cached per tag and per (class, property).
+Signals are connected once per node; they call dispatch(id, event, *args)
+and the Clojure side keeps the current handler, so re-rendering with new
+closures doesn't reconnect anything.
+
+A 'set' patch that cannot be applied (the value doesn't convert to the
+setter's type) is reported to on_error(id, message) and the rest of the
+patch list still runs. So is a prop with neither a setter nor a Qt
+property: it becomes a dynamic property under its camelCase Qt name
+(my-flag -> myFlag, usable in QSS selectors), which is also where a
+misspelled prop would end up.
+"""
+
+import sys
+
+import shiboken6
+from PySide6 import QtCore, QtGui, QtWidgets
+
+
+def kebab_to_camel(name):
+    head, *tail = name.split('-')
+    return head + ''.join(part.capitalize() for part in tail)
+
+
+def style_to_str(value):
+    if isinstance(value, dict):
+        return ''.join(f'{k}:{v};' for k, v in value.items())
+    return str(value)
+
+
+def _set_items(widget, value):
+    widget.clear()
+    widget.addItems([str(item) for item in value or []])
+
+
+def _set_contents_margins(widget, value):
+    if value is not None and len(value) == 4:
+        widget.setContentsMargins(*[int(v) for v in value])
+
+
+def _set_style(widget, value):
+    widget.setStyleSheet(style_to_str(value))
+
+
+SPECIAL_SETTERS = {
+    'items': _set_items,
+    'contents-margins': _set_contents_margins,
+    'widget-resizable': lambda widget, value: widget.setWidgetResizable(bool(value)),
+    'fixed-height': lambda widget, value: widget.setFixedHeight(int(value)),
+    'fixed-width': lambda widget, value: widget.setFixedWidth(int(value)),
+    'style': _set_style,
+    'qss': _set_style,
+}
+
+
+class PatchApplier:
+    """Apply patch lists to a tree of widgets and layouts kept by id."""
+
+    def __init__(self, dispatch=None, on_error=None):
+        self.dispatch = dispatch
+        self.on_error = on_error
+        self.nodes = {}        # id -> QWidget, QLayout or QSpacerItem
+        self.kinds = {}        # id -> 'widget', 'layout' or 'stretch'
+        self.parents = {}      # id -> (parent id, 'layout' | 'set-layout' | 'content')
+        self.children = {}     # id -> [child ids]
+        self.connections = {}  # id -> {signal name: slot}
+        self.tags = {}         # registered tag -> class
+        self._classes = {}
+        self._setters = {}
+        self._dynamic = set()  # (class, prop) set as dynamic properties, not reported yet
+        self._ops = {
+            'create': self.create,
+            'stretch': self.stretch,
+            'insert': self.insert,
+            'set-layout': self.set_layout,
+            'set-content': self.set_content,
+            'set': self.set_prop,
+            'connect': self.connect,
+            'disconnect': self.disconnect,
+            'reorder': self.reorder,
+            'remove': self.remove,
+        }
+
+    # === Lookup ===
+
+    def register_tag(self, tag, cls):
+        self.tags[tag] = cls
+        self._classes.pop(tag, None)
+
+    def register(self, node_id, obj, kind='widget'):
+        """Track an existing object (e.g. the root widget) under node_id."""
+        self.nodes[node_id] = obj
+        self.kinds[node_id] = kind
+
+    def node(self, node_id):
+        return self.nodes.get(node_id)
+
+    def resolve_class(self, tag):
+        cls = self._classes.get(tag)
+        if cls is None:
+            cls = self.tags.get(tag)
+            for module in (QtWidgets, QtGui, QtCore):
+                if cls is not None:
+                    break
+                cls = getattr(module, tag, None)
+            if cls is None:
+                raise ValueError(f'Unknown Qt class tag: {tag}')
+            self._classes[tag] = cls
+        return cls
+
+    def setter(self, obj, prop):
+        """Cached setter(obj, value) of a kebab-case property."""
+        key = (type(obj), prop)
+        fn = self._setters.get(key)
+        if fn is None:
+            camel = kebab_to_camel(prop)
+            fn = SPECIAL_SETTERS.get(prop)
+            if fn is None:
+                fn = getattr(type(obj), 'set' + camel[:1].upper() + camel[1:], None)
+            if fn is None:
+                fn = lambda target, value, _name=camel: target.setProperty(_name, value)
+                self._dynamic.add(key)
+            self._setters[key] = fn
+        return fn
+
+    def report(self, node_id, message):
+        if self.on_error is not None:
+            self.on_error(node_id, message)
+        else:
+            print(f'hiccup_patch: node {node_id}: {message}', file=sys.stderr)
+
+    # === Patches ===
+
+    def apply(self, root, patches):
+        """Apply a patch list with updates of root disabled; returns the count."""
+        root.setUpdatesEnabled(False)
+        try:
+            ops = self._ops
+            for patch in patches:
+                ops[patch[0]](*patch[1:])
+        finally:
+            root.setUpdatesEnabled(True)
+        return len(patches)
+
+    def create(self, node_id, tag, kind='widget'):
+        self.nodes[node_id] = self.resolve_class(tag)()
+        self.kinds[node_id] = kind
+
+    def stretch(self, node_id, layout_id, value=1):
+        layout = self.nodes[layout_id]
+        layout.addStretch(int(value))
+        self.nodes[node_id] = layout.itemAt(layout.count() - 1)
+        self.kinds[node_id] = 'stretch'
+        self._adopt(layout_id, node_id, 'layout')
+
+    def insert(self, layout_id, node_id):
+        layout = self.nodes[layout_id]
+        if self.kinds[node_id] == 'layout':
+            layout.addLayout(self.nodes[node_id])
+        else:
+            layout.addWidget(self.nodes[node_id])
+        self._adopt(layout_id, node_id, 'layout')
+
+    def set_layout(self, widget_id, layout_id):
+        self.nodes[widget_id].setLayout(self.nodes[layout_id])
+        self._adopt(widget_id, layout_id, 'set-layout')
+
+    def set_content(self, widget_id, node_id):
+        self.nodes[widget_id].setWidget(self.nodes[node_id])
+        self._adopt(widget_id, node_id, 'content')
+
+    def set_prop(self, node_id, prop, value):
+        obj = self.nodes[node_id]
+        key = (type(obj), prop)
+        name = kebab_to_camel(prop)  # the Qt property name
+        try:
+            self.setter(obj, prop)(obj, value)
+        except (TypeError, ValueError) as e:
+            # The typed setter rejected the value: let QVariant convert it
+            if not (isinstance(obj, QtCore.QObject) and obj.setProperty(name, value)):
+                self.report(node_id, f'cannot set {name} of {type(obj).__name__} '
+                                     f'to {value!r}: {e}')
+            return
+        if key in self._dynamic:
+            self._dynamic.discard(key)  # once per class and prop
+            self.report(node_id, f'{type(obj).__name__} has no setter or property '
+                                 f'{name}; set as a dynamic property')
+
+    def connect(self, node_id, signal_name, event):
+        slots = self.connections.setdefault(node_id, {})
+        if signal_name in slots:
+            return
+        slot = lambda *args: self.dispatch(node_id, event, *args)
+        getattr(self.nodes[node_id], signal_name).connect(slot)
+        slots[signal_name] = slot
+
+    def disconnect(self, node_id, signal_name):
+        slot = self.connections.get(node_id, {}).pop(signal_name, None)
+        if slot is not None:
+            try:
+                getattr(self.nodes[node_id], signal_name).disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass
+
+    def reorder(self, layout_id, order):
+        """Move the items of a layout into the given id order.
+
+        Only items that are out of place are taken and re-inserted, so
+        keyed moves cost one takeAt/insertItem each instead of a rebuild.
+        """
+        layout = self.nodes[layout_id]
+        current = self.children.setdefault(layout_id, [])
+        for index, node_id in enumerate(order):
+            if index < len(current) and current[index] == node_id:
+                continue
+            if node_id not in current:
+                continue
+            position = current.index(node_id)
+            layout.insertItem(index, layout.takeAt(position))
+            current.insert(index, current.pop(position))
+
+    def remove(self, node_id):
+        if node_id not in self.nodes:
+            return
+        parent = self.parents.pop(node_id, None)
+        obj = self.nodes[node_id]
+        if parent is not None:
+            parent_id, relation = parent
+            holder = self.nodes.get(parent_id)
+            siblings = self.children.get(parent_id)
+            if siblings and node_id in siblings:
+                siblings.remove(node_id)
+            if relation == 'layout' and holder is not None:
+                index = holder.indexOf(obj)
+                if index >= 0:
+                    holder.takeAt(index)
+            elif relation == 'content' and holder is not None:
+                holder.takeWidget()
+        self._destroy(node_id)
+
+    # === Internals ===
+
+    def _adopt(self, parent_id, node_id, relation):
+        self.parents[node_id] = (parent_id, relation)
+        self.children.setdefault(parent_id, []).append(node_id)
+
+    def _destroy(self, node_id):
+        kind = self.kinds.pop(node_id, None)
+        obj = self.nodes.pop(node_id, None)
+        self.connections.pop(node_id, None)
+        children = self.children.pop(node_id, [])
+        if kind == 'layout':
+            # The widgets of a layout belong to the layout's widget: remove them
+            for child_id in list(children):
+                self.remove(child_id)
+            if obj is not None:
+                shiboken6.delete(obj)  # now, so the widget can take a new layout
+            return
+        for child_id in children:
+            self._forget(child_id)  # Qt deletes them with the widget
+        if kind == 'widget' and obj is not None:
+            obj.hide()
+            obj.deleteLater()
+
+    def _forget(self, node_id):
+        self.kinds.pop(node_id, None)
+        self.nodes.pop(node_id, None)
+        self.parents.pop(node_id, None)
+        self.connections.pop(node_id, None)
+        for child_id in self.children.pop(node_id, []):
+            self._forget(child_id)
@@ -0,0 +1,269 @@
+"""
+Compile-once runner for the run_block_N() functions of embedded.py
+
+Every embedded.py wraps its example code in
+
+    def run_block_2():
+        run_block(__file__, 2, r'''...''', globals())
+
+run_block() compiles each block once per process (keyed by file and block
+number; a :reload with changed source recompiles) and then only executes
+the cached code object, so REPL sessions that call the same block again
+don't pay for compiling it again. Tracebacks point at the real lines of
+embedded.py.
+
+Options (configure() or environment variables):
+- bytecode:  also cache compiled blocks on disk, in __pycache__ next to
+             embedded.py (QT6_BLOCK_BYTECODE=1)
+- namespace: where a block runs (QT6_BLOCK_NAMESPACE)
+             'module'   the embedded module's globals (default; Clojure
+                        reads results such as `window` from there)
+             'block'    a private namespace per block, kept between runs
+             'isolated' a fresh namespace for every run
+- timing:    print compile and run time of each call (QT6_BLOCK_TIMING=1)
+
+stats() / format_stats() report per-block compile and run timing and the
+PySide6 modules each block imported on its first run (see lazy_qt.py for
+a full import profile).
+"""
+
+import ast
+import hashlib
+import marshal
+import os
+import sys
+import time
+from importlib.util import MAGIC_NUMBER
+
+
+NAMESPACE_MODES = ('module', 'block', 'isolated')
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class BlockStats:
+    """Compile and run timing of one block."""
+
+    def __init__(self, path, number):
+        self.path = path
+        self.number = number
+        self.origin = None  # 'compiled' or 'bytecode'
+        self.compile_ms = 0.0
+        self.runs = 0
+        self.errors = 0
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+        self.qt_imports = []  # PySide6 modules the first run imported
+
+    def as_dict(self):
+        return {
+            'path': self.path,
+            'block': self.number,
+            'origin': self.origin,
+            'compile_ms': round(self.compile_ms, 3),
+            'runs': self.runs,
+            'errors': self.errors,
+            'last_ms': round(self.last_ms, 3),
+            'avg_ms': round(self.total_ms / self.runs, 3) if self.runs else 0.0,
+            'total_ms': round(self.total_ms, 3),
+            'qt_imports': list(self.qt_imports),
+        }
+
+
+class BlockRunner:
+    """Cache of compiled blocks plus the namespaces they run in."""
+
+    def __init__(self, bytecode=None, namespace=None, timing=None):
+        self.bytecode = _env_flag('QT6_BLOCK_BYTECODE') if bytecode is None else bytecode
+        self.namespace = namespace or os.environ.get('QT6_BLOCK_NAMESPACE', 'module')
+        if self.namespace not in NAMESPACE_MODES:
+            self.namespace = 'module'
+        self.timing = _env_flag('QT6_BLOCK_TIMING') if timing is None else timing
+        self._code = {}        # (path, number) -> (source, code)
+        self._namespaces = {}  # (path, number) -> dict ('block' mode)
+        self._stats = {}       # (path, number) -> BlockStats
+
+    def configure(self, bytecode=None, namespace=None, timing=None):
+        if bytecode is not None:
+            self.bytecode = bool(bytecode)
+        if namespace is not None:
+            if namespace not in NAMESPACE_MODES:
+                raise ValueError(f'Unknown namespace mode: {namespace}')
+            self.namespace = namespace
+        if timing is not None:
+            self.timing = bool(timing)
+
+    def clear(self):
+        """Drop compiled blocks, block namespaces and statistics."""
+        self._code.clear()
+        self._namespaces.clear()
+        self._stats.clear()
+
+    # === Compiling ===
+
+    def code(self, path, number, source):
+        """The code object of a block, compiled at most once per source."""
+        key = (path, number)
+        cached = self._code.get(key)
+        if cached is not None and cached[0] == source:
+            return cached[1]
+        stats = self._stats_for(key)
+        start = time.perf_counter()
+        code = self._load_bytecode(path, number, source) if self.bytecode else None
+        if code is None:
+            code = self._compile(path, source)
+            stats.origin = 'compiled'
+            if self.bytecode:
+                self._store_bytecode(path, number, source, code)
+        else:
+            stats.origin = 'bytecode'
+        stats.compile_ms = (time.perf_counter() - start) * 1000
+        self._code[key] = (source, code)
+        return code
+
+    def _compile(self, path, source):
+        tree = ast.parse(source, path)
+        ast.increment_lineno(tree, _line_offset(path, source))
+        return compile(tree, path, 'exec')
+
+    def _bytecode_path(self, path, number):
+        directory, name = os.path.split(path)
+        stem = os.path.splitext(name)[0]
+        return os.path.join(directory, '__pycache__',
+                            f'{stem}.block{number}.{sys.implementation.cache_tag}.pyc')
+
+    def _load_bytecode(self, path, number, source):
+        try:
+            with open(self._bytecode_path(path, number), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        header = MAGIC_NUMBER + _digest(path, source)
+        if not data.startswith(header):
+            return None
+        try:
+            return marshal.loads(data[len(header):])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _store_bytecode(self, path, number, source, code):
+        target = self._bytecode_path(path, number)
+        temp = f'{target}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(temp, 'wb') as f:
+                f.write(MAGIC_NUMBER + _digest(path, source) + marshal.dumps(code))
+            os.replace(temp, target)
+        except OSError:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+
+    # === Running ===
+
+    def run(self, path, number, source, namespace=None):
+        """Run block number of path; namespace is the module's globals()."""
+        path = os.path.abspath(path)
+        code = self.code(path, number, source)
+        target = self._namespace_for((path, number), namespace)
+        stats = self._stats[(path, number)]
+        before = _qt_modules() if stats.runs == 0 else None
+        start = time.perf_counter()
+        try:
+            exec(code, target)
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            stats.last_ms = (time.perf_counter() - start) * 1000
+            if before is not None:
+                stats.qt_imports = sorted(_qt_modules() - before)
+            stats.total_ms += stats.last_ms
+            stats.runs += 1
+            if self.timing:
+                print(f'[block] {_short(path)}#{number}: compile {stats.compile_ms:.2f} ms '
+                      f'({stats.origin}), run {stats.last_ms:.2f} ms', file=sys.stderr)
+        return target
+
+    def _namespace_for(self, key, namespace):
+        if self.namespace == 'module' and namespace is not None:
+            return namespace
+        if self.namespace == 'block':
+            target = self._namespaces.get(key)
+            if target is None:
+                target = self._namespaces[key] = _fresh_namespace(key)
+            return target
+        return _fresh_namespace(key)
+
+    def _stats_for(self, key):
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = BlockStats(*key)
+        return stats
+
+    # === Reporting ===
+
+    def stats(self):
+        """Per-block timing as a list of dicts, in first-run order."""
+        return [stats.as_dict() for stats in self._stats.values()]
+
+    def format_stats(self):
+        lines = [f'{"block":<48} {"origin":<9} {"compile ms":>10} {"runs":>5} {"avg ms":>9} {"last ms":>9}  qt imports']
+        for stats in self._stats.values():
+            row = stats.as_dict()
+            lines.append(f'{_short(stats.path) + "#" + str(stats.number):<48} {row["origin"] or "-":<9} '
+                         f'{row["compile_ms"]:>10.2f} {row["runs"]:>5} {row["avg_ms"]:>9.2f} '
+                         f'{row["last_ms"]:>9.2f}  '
+                         + ' '.join(name.split('.')[-1] for name in stats.qt_imports))
+        return '\n'.join(lines)
+
+
+def _digest(path, source):
+    return hashlib.sha1(f'{path}\0{source}'.encode('utf-8')).digest()
+
+
+def _line_offset(path, source):
+    # Line of embedded.py where the block's source starts (0 if not found)
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return 0
+    index = text.find(source)
+    return text.count('\n', 0, index) if index >= 0 else 0
+
+
+def _qt_modules():
+    return {name for name in list(sys.modules) if name.startswith('PySide6.Qt')}
+
+
+def _fresh_namespace(key):
+    return {'__name__': f'block{key[1]}', '__file__': key[0], '__builtins__': __builtins__}
+
+
+def _short(path):
+    root = os.path.dirname(os.path.abspath(__file__))
+    return os.path.relpath(path, root) if path.startswith(root) else path
+
+
+runner = BlockRunner()
+
+
+def run_block(path, number, source, namespace=None):
+    """Run a block through the shared runner (see BlockRunner.run)."""
+    return runner.run(path, number, source, namespace)
+
+
+def configure(bytecode=None, namespace=None, timing=None):
+    runner.configure(bytecode, namespace, timing)
+
+
+def stats():
+    return runner.stats()
+
+
+def format_stats():
+    return runner.format_stats()
@@ -0,0 +1,227 @@
+"""
+Lazy PySide6 modules and an import-time profile
+
+PySide6 submodules are large binary extensions (QtWidgets, QtSql,
+QtNetwork, QtMultimedia, ...). Importing them eagerly makes every chapter
+pay for all of them at startup. module('PySide6.QtSql') (or simply
+lazy_qt.QtSql) returns a placeholder module that imports the real one on
+first attribute access:
+
+    import lazy_qt
+    QtSql = lazy_qt.QtSql                   # nothing imported yet
+    db = QtSql.QSqlDatabase.addDatabase(...)  # imported here
+
+The import profile times every module import (PySide6 and everything
+else) while it is installed, with self and cumulative milliseconds like
+`python -X importtime`. Set QT6_IMPORT_PROFILE=1 to install it as soon as
+lazy_qt is imported and print the report at exit, or call
+start_profile() / report() yourself.
+"""
+
+import atexit
+import importlib
+import importlib.abc
+import os
+import sys
+import threading
+import time
+import types
+
+
+# === Import profile ===
+
+class ImportProfile(importlib.abc.MetaPathFinder):
+    """Time the loading of every module imported while installed."""
+
+    def __init__(self):
+        self.records = []  # dicts: module, self_ms, total_ms, depth, lazy
+        self._local = threading.local()  # .stack: [start, child_ms] per module loading
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            sys.meta_path.remove(self)
+            self.installed = False
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self):
+        self._stack().append([time.perf_counter(), 0.0])
+
+    def _leave(self, name, lazy=False):
+        stack = self._stack()
+        start, child_ms = stack.pop()
+        total_ms = (time.perf_counter() - start) * 1000
+        if stack:
+            stack[-1][1] += total_ms
+        self.records.append({
+            'module': name,
+            'self_ms': round(total_ms - child_ms, 3),
+            'total_ms': round(total_ms, 3),
+            'depth': len(stack),
+            'lazy': lazy,
+        })
+
+    def summary(self, prefix=''):
+        """Records of modules starting with prefix, most expensive first."""
+        rows = [r for r in self.records if r['module'].startswith(prefix)]
+        return sorted(rows, key=lambda r: r['total_ms'], reverse=True)
+
+    def report(self, prefix='', limit=30):
+        rows = self.summary(prefix)
+        lines = [f'{"module":<44} {"self ms":>9} {"total ms":>9}']
+        for row in rows[:limit]:
+            name = row['module'] + (' (lazy)' if row['lazy'] else '')
+            lines.append(f'{name:<44} {row["self_ms"]:>9.2f} {row["total_ms"]:>9.2f}')
+        top = [r['total_ms'] for r in self.records if r['depth'] == 0]
+        lines.append(f'{len(self.records)} modules, {sum(top):.1f} ms in top-level imports')
+        return '\n'.join(lines)
+
+
+class _TimedLoader:
+    """Loader wrapper that reports module load time to an ImportProfile.
+
+    Timing starts in create_module(): extension modules (all of PySide6)
+    do their work there, plain modules in exec_module().
+    """
+
+    def __init__(self, loader, profile):
+        self._loader = loader
+        self._profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        self._profile._enter()
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._profile._leave(spec.name)
+            raise
+
+    def exec_module(self, module):
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile._leave(module.__name__)
+
+
+profile = ImportProfile()
+
+
+def start_profile():
+    profile.install()
+    return profile
+
+
+def stop_profile():
+    profile.uninstall()
+
+
+def summary(prefix=''):
+    return profile.summary(prefix)
+
+
+def report(prefix='', limit=30):
+    return profile.report(prefix, limit)
+
+
+# === Lazy modules ===
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first use."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            name = self.__name__
+            profile._enter()
+            try:
+                module = importlib.import_module(name)
+            finally:
+                profile._leave(name, lazy=True)
+            self.__dict__.update(module.__dict__)  # later lookups skip __getattr__
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, name):
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f'<lazy module {self.__name__!r} ({state})>'
+
+
+_lazy_modules = {}
+_lock = threading.Lock()
+
+
+def module(name):
+    """The module name, or a LazyModule for it if it isn't imported yet."""
+    if name in sys.modules:
+        return sys.modules[name]
+    with _lock:
+        lazy = _lazy_modules.get(name)
+        if lazy is None:
+            lazy = _lazy_modules[name] = LazyModule(name)
+        return lazy
+
+
+def is_loaded(name):
+    return name in sys.modules
+
+
+def loaded_qt_modules():
+    """Names of the PySide6 submodules imported so far."""
+    return sorted(name for name in sys.modules if name.startswith('PySide6.Qt'))
+
+
+def __getattr__(name):
+    # lazy_qt.QtWidgets -> module('PySide6.QtWidgets')
+    if name.startswith('Qt'):
+        return module('PySide6.' + name)
+    raise AttributeError(name)
+
+
+if os.environ.get('QT6_IMPORT_PROFILE', '').strip().lower() in ('1', 'true', 'yes', 'on'):
+    start_profile()
+    atexit.register(lambda: print(report(), file=sys.stderr))
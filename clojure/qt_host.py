@@ -0,0 +1,332 @@
+"""
+Warm Python/Qt host for the Clojure chapters
+
+Every `clj -M:chNN-...` run boots a new interpreter, imports PySide6 and
+creates a QApplication before the first line of the example runs. The
+host keeps one interpreter and one QApplication alive and loads the
+chapters' embedded.py modules on demand, so switching chapters costs a
+module import (once) plus the blocks themselves:
+
+    python3 qt_host.py serve                       # start the host (foreground)
+    python3 qt_host.py run 10_concurrent/01_basics     # run all blocks of a chapter
+    python3 qt_host.py run 07_sql/02_queries 3         # run block 3
+    python3 qt_host.py stats                       # block timings, import profile
+    python3 qt_host.py stop
+
+The Clojure side talks to the same server (qt6_tutorials.host).
+
+Transport: a QLocalServer (Unix domain socket, named pipe on Windows),
+by default $TMPDIR/qt6-tutorials-host.sock, or QT6_HOST_SOCKET.
+Protocol: one JSON object per line in each direction.
+
+    {"id": 1, "op": "run", "chapter": "07_sql/01_basics", "block": 2, "args": []}
+    {"id": 1, "ok": true, "result": null, "output": "...", "ms": 12.5}
+
+Ops: ping, load (chapter, reload), blocks (chapter), run (chapter,
+block, args; without block all argument-free blocks run in order),
+stats, shutdown. Requests run one at a time on the Qt thread; a request
+that arrives while a block runs a local event loop waits in the queue.
+Blocks print to the response's "output" as well as to the host console.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import inspect
+import io
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from collections import deque
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+import lazy_qt  # noqa: E402  (first, so QT6_IMPORT_PROFILE sees every import)
+import block_runner  # noqa: E402
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer  # noqa: E402
+from PySide6.QtNetwork import QLocalServer, QLocalSocket  # noqa: E402
+
+
+DEFAULT_NAME = 'qt6-tutorials-host'
+CONNECT_TIMEOUT_MS = 2000
+
+
+def server_name():
+    """Socket path (named pipe name on Windows) shared with the Clojure client."""
+    name = os.environ.get('QT6_HOST_SOCKET')
+    if name:
+        return name
+    if sys.platform == 'win32':
+        return DEFAULT_NAME
+    return os.path.join(os.environ.get('TMPDIR') or '/tmp', DEFAULT_NAME + '.sock')
+
+
+class _Tee(io.TextIOBase):
+    """Write to the console and keep a copy for the response."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        if self.stream is not None:
+            self.stream.write(text)
+        return len(text)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+
+class BlockHost(QObject):
+    """Serve chapter blocks from one warm interpreter."""
+
+    def __init__(self, name, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.stopping = False
+        self.started = time.time()
+        self.chapters = {}  # chapter -> embedded module
+        self._queue = deque()
+        self._busy = False
+        self._buffers = {}
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        QLocalServer.removeServer(name)  # stale socket of a crashed host
+        if not self.server.listen(name):
+            raise OSError(f'Cannot listen on {name}: {self.server.errorString()}')
+        self.server.newConnection.connect(self._accept)
+
+    # === Connections ===
+
+    def _accept(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b''
+            socket.readyRead.connect(lambda s=socket: self._read(s))
+            socket.disconnected.connect(lambda s=socket: self._drop(s))
+
+    def _drop(self, socket):
+        if socket not in self._buffers:
+            return  # already dropped
+        del self._buffers[socket]
+        socket.readyRead.disconnect()
+        socket.disconnected.disconnect()
+        socket.deleteLater()
+
+    def close(self):
+        """Close the client connections, then stop listening.
+
+        The server deletes its sockets on close(); closing them first keeps
+        their disconnected signals from reaching _drop() afterwards.
+        """
+        for socket in list(self._buffers):
+            self._drop(socket)
+            socket.abort()
+        self.server.close()
+
+    def _read(self, socket):
+        data = self._buffers.get(socket, b'') + bytes(socket.readAll())
+        *lines, rest = data.split(b'\n')
+        self._buffers[socket] = rest
+        for line in lines:
+            if line.strip():
+                self._queue.append((socket, line))
+        self._process()
+
+    def _process(self):
+        if self._busy:
+            return  # a block runs a nested event loop: answer afterwards
+        self._busy = True
+        try:
+            while self._queue:
+                socket, line = self._queue.popleft()
+                response = self.handle_line(line)
+                if socket in self._buffers:
+                    socket.write(json.dumps(response, default=repr).encode('utf-8') + b'\n')
+                    socket.flush()
+        finally:
+            self._busy = False
+
+    # === Requests ===
+
+    def handle_line(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {'ok': False, 'error': f'Invalid request: {e}'}
+        response = self.handle(request)
+        response['id'] = request.get('id')
+        return response
+
+    def handle(self, request):
+        op = request.get('op')
+        handler = getattr(self, 'op_' + str(op), None)
+        if handler is None:
+            return {'ok': False, 'error': f'Unknown op: {op}'}
+        tee_out, tee_err = _Tee(sys.__stdout__), _Tee(sys.__stderr__)
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(tee_out), contextlib.redirect_stderr(tee_err):
+                result = handler(request)
+            response = {'ok': True, 'result': result}
+        except BaseException as e:  # a block calling sys.exit() must not stop the host
+            if isinstance(e, KeyboardInterrupt):
+                raise
+            response = {'ok': False, 'error': f'{type(e).__name__}: {e}',
+                        'traceback': traceback.format_exc()}
+        response['ms'] = round((time.perf_counter() - start) * 1000, 3)
+        response['output'] = tee_out.buffer.getvalue() + tee_err.buffer.getvalue()
+        return response
+
+    def op_ping(self, request):
+        return {'pid': os.getpid(), 'uptime_s': round(time.time() - self.started, 1),
+                'chapters': sorted(self.chapters)}
+
+    def op_load(self, request):
+        module = self.load(request['chapter'], reload=request.get('reload', False))
+        return {'chapter': request['chapter'], 'blocks': block_numbers(module)}
+
+    def op_blocks(self, request):
+        return block_numbers(self.load(request['chapter']))
+
+    def op_run(self, request):
+        module = self.load(request['chapter'], reload=request.get('reload', False))
+        block = request.get('block')
+        if block is None:
+            numbers = [n for n in block_numbers(module)
+                       if not _required_args(getattr(module, f'run_block_{n}'))]
+            for number in numbers:
+                getattr(module, f'run_block_{number}')()
+            return {'ran': numbers}
+        function = getattr(module, f'run_block_{int(block)}', None)
+        if function is None:
+            raise LookupError(f'{request["chapter"]} has no block {block}')
+        return function(*request.get('args', []))
+
+    def op_stats(self, request):
+        return {'blocks': block_runner.stats(),
+                'imports': lazy_qt.summary(request.get('prefix', 'PySide6')),
+                'qt_modules': lazy_qt.loaded_qt_modules()}
+
+    def op_shutdown(self, request):
+        self.stopping = True
+        QTimer.singleShot(0, QCoreApplication.quit)
+        return 'bye'
+
+    # === Chapters ===
+
+    def load(self, chapter, reload=False):
+        """Import (or re-import) the embedded.py of a chapter directory."""
+        chapter = chapter.strip('/').replace('\\', '/')
+        module = self.chapters.get(chapter)
+        if module is not None and not reload:
+            return module
+        path = os.path.realpath(os.path.join(ROOT, chapter, 'embedded.py'))
+        if not path.startswith(os.path.realpath(ROOT) + os.sep) or not os.path.isfile(path):
+            raise FileNotFoundError(f'No embedded.py in {chapter}')
+        name = 'embedded_' + re.sub(r'\W', '_', chapter)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        self.chapters[chapter] = module
+        return module
+
+
+def block_numbers(module):
+    return sorted(int(m.group(1)) for m in
+                  (re.fullmatch(r'run_block_(\d+)', name) for name in vars(module)) if m)
+
+
+def _required_args(function):
+    return [p for p in inspect.signature(function).parameters.values()
+            if p.default is p.empty and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+
+
+def serve(name=None, gui=True):
+    """Run the host until a shutdown request (blocks may call quit())."""
+    if gui:
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        app.setQuitOnLastWindowClosed(False)  # closing a chapter window keeps the host
+    else:
+        app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    host = BlockHost(name or server_name())
+    print(f'Qt host listening on {host.name} (pid {os.getpid()})', flush=True)
+    while not host.stopping:
+        app.exec()  # returns when a block calls QCoreApplication.quit()
+    host.close()
+    return 0
+
+
+def request(payload, name=None, timeout_ms=None):
+    """Send one request to a running host and wait for its response."""
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        raise ConnectionError(f'No Qt host on {name or server_name()}: {socket.errorString()}')
+    socket.write(json.dumps(payload).encode('utf-8') + b'\n')
+    socket.flush()
+    data = b''
+    while not data.endswith(b'\n'):
+        if not socket.waitForReadyRead(-1 if timeout_ms is None else timeout_ms):
+            raise ConnectionError(f'Qt host closed the connection: {socket.errorString()}')
+        data += bytes(socket.readAll())
+    socket.disconnectFromServer()
+    return json.loads(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Warm Python/Qt host for the Clojure chapters.')
+    parser.add_argument('--socket', help='server name (default: $QT6_HOST_SOCKET or $TMPDIR/%s.sock)' % DEFAULT_NAME)
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve_parser = sub.add_parser('serve', help='run the host')
+    serve_parser.add_argument('--core', action='store_true', help='QCoreApplication instead of QApplication')
+    run_parser = sub.add_parser('run', help='run the blocks of a chapter')
+    run_parser.add_argument('chapter', help='chapter directory, e.g. 10_concurrent/01_basics')
+    run_parser.add_argument('block', nargs='?', type=int)
+    run_parser.add_argument('args', nargs='*', help='block arguments (JSON values)')
+    run_parser.add_argument('--reload', action='store_true', help='re-import embedded.py first')
+    for command in ('ping', 'stats', 'stop'):
+        sub.add_parser(command)
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        return serve(args.socket, gui=not args.core)
+    if args.command == 'run':
+        payload = {'op': 'run', 'chapter': args.chapter, 'reload': args.reload}
+        if args.block is not None:
+            payload['block'] = args.block
+            payload['args'] = [_json_arg(arg) for arg in args.args]
+    else:
+        payload = {'op': {'stop': 'shutdown'}.get(args.command, args.command)}
+
+    response = request(payload, args.socket)
+    if response.get('output'):
+        sys.stdout.write(response['output'])
+    if not response.get('ok'):
+        print(response.get('traceback') or response.get('error'), file=sys.stderr)
+        return 1
+    if response.get('result') is not None:
+        print(json.dumps(response['result'], indent=2, ensure_ascii=False))
+    print(f'[{response["ms"]:.1f} ms]', file=sys.stderr)
+    return 0
+
+
+def _json_arg(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+if __name__ == '__main__':
+    sys.exit(main())
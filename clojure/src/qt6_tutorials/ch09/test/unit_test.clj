@@ -6,7 +6,8 @@
 (ns qt6_tutorials.ch09.test.unit_test)
 
 (require '[libpython-clj2.python :as py]
-         '[libpython-clj2.require :refer [require-python]])
+         '[libpython-clj2.require :refer [require-python]]
+         '[qt6_tutorials.lazy_qt :as lazy])
 
 ;; 初始化 Python
 (py/initialize!)
@@ -17,17 +18,16 @@
 (require-python :from "09_test/01_unit_test"
                 '[embedded :as py-embedded :bind-ns :reload])
 (require-python '[timeit :as timeit :bind-ns])
-(require-python '[PySide6.QtWidgets :as QtWidgets :bind-ns])
-(require-python '[PySide6.QtTest :as QtTest :bind-ns])
 (require-python '[PySide6.QtCore :as QtCore :bind-ns])
 
 ;; 获取类
 (def TestCase (py/get-attr unittest "TestCase"))
 (def ValueError (py/get-attr builtins "ValueError"))
-(def QApplication (py/get-attr QtWidgets "QApplication"))
-(def QPushButton (py/get-attr QtWidgets "QPushButton"))
-(def QLineEdit (py/get-attr QtWidgets "QLineEdit"))
-(def QTest (py/get-attr QtTest "QTest"))
+;; QtWidgets/QtTest 只在运行 Qt 控件测试时才导入
+(def QApplication (lazy/qt-class :QtWidgets "QApplication"))
+(def QPushButton (lazy/qt-class :QtWidgets "QPushButton"))
+(def QLineEdit (lazy/qt-class :QtWidgets "QLineEdit"))
+(def QTest (lazy/qt-class :QtTest "QTest"))
 (def Qt (py/get-attr QtCore "Qt"))
 
 ;; ========== 被测试的类 ==========
@@ -163,28 +163,28 @@
 
 (defn- test-qtest-mouse-click [self]
   "测试鼠标点击 (GUI测试示例)"
-  (let [existing (py/call-attr QApplication "instance")
-        app (or existing (QApplication (py/->py-list [])))
-        button (QPushButton)]
+  (let [existing (py/call-attr @QApplication "instance")
+        app (or existing (@QApplication (py/->py-list [])))
+        button (@QPushButton)]
     (py/call-attr button "setCheckable" true)
     ;; 使用 QTest 模拟点击
-    (py/call-attr QTest "mouseClick" button (py/get-attr Qt "LeftButton"))
+    (py/call-attr @QTest "mouseClick" button (py/get-attr Qt "LeftButton"))
     (py/call-attr self "assertTrue" (py/call-attr button "isChecked"))))
 
 (defn- test-qtest-key-events [self]
   "测试键盘事件"
-  (let [existing (py/call-attr QApplication "instance")
-        app (or existing (QApplication (py/->py-list [])))
-        line-edit (QLineEdit)]
+  (let [existing (py/call-attr @QApplication "instance")
+        app (or existing (@QApplication (py/->py-list [])))
+        line-edit (@QLineEdit)]
     ;; 模拟按键
-    (py/call-attr QTest "keyClicks" line-edit "Hello Qt")
+    (py/call-attr @QTest "keyClicks" line-edit "Hello Qt")
     (py/call-attr self "assertEqual"
                   (py/call-attr line-edit "text")
                   "Hello Qt")))
 
-;; 创建 Qt 特定测试类
+;; 创建 Qt 特定测试类 (block 3 导入 QtWidgets/QtTest, 用到时才运行)
 (def TestQtSpecific
-  (do
+  (delay
     (py/call-attr py-embedded "run_block_3")
     (py/get-attr py-embedded "TestQtSpecific")))
 
@@ -209,16 +209,16 @@
   (let [run-qt? (run-qt-widget-tests?)]
     (when run-qt?
       ;; 确保 QApplication 存在 (某些 Qt 测试需要)
-      (let [existing (py/call-attr QApplication "instance")]
+      (let [existing (py/call-attr @QApplication "instance")]
         (when-not existing
-          (QApplication (py/->py-list [])))))
+          (@QApplication (py/->py-list [])))))
     (when-not run-qt?
       (println "跳过 Qt Widgets/QTest 测试 (macOS 非主线程限制). 设置 QT_WIDGET_TESTS=1 可强制启用。")))
 
   ;; 获取测试类
   (def TestCalculatorClass TestCalculator)
   (when (run-qt-widget-tests?)
-    (def TestQtSpecificClass TestQtSpecific))
+    (def TestQtSpecificClass @TestQtSpecific))
 
   ;; 运行测试
   (let [loader (py/call-attr unittest "TestLoader")
@@ -230,7 +230,7 @@
                   (py/call-attr loader "loadTestsFromTestCase" TestCalculator))
     (when (run-qt-widget-tests?)
       (py/call-attr suite "addTests"
-                    (py/call-attr loader "loadTestsFromTestCase" TestQtSpecific)))
+                    (py/call-attr loader "loadTestsFromTestCase" @TestQtSpecific)))
 
     ;; 运行
     (let [result (py/call-attr runner "run" suite)]
@@ -6,7 +6,6 @@
 
 (require '[libpython-clj2.python :as py]
          '[libpython-clj2.require :refer [require-python]]
-         '[clojure.data.json :as json]
          '[clojure.java.io :as io]
          '[nrepl.server :as nrepl])
 
@@ -70,6 +69,12 @@
                                      nil))]
     (py/call-attr py-embedded "enqueue_ui" callback)))
 
+(defn ui-metrics
+  "UI dispatch queue metrics: :depth, :enqueued, :processed, :errors, latencies in ms."
+  []
+  (into {} (map (fn [[k v]] [(keyword k) v]))
+        (py/->jvm (py/call-attr py-embedded "ui_metrics"))))
+
 (defn set-title!
   "Update the window title."
   [title]
@@ -131,67 +136,61 @@
     "Low" "#10b981"
     "#9ca3af"))
 
-(defn update-item-label
-  "Update the display label of an item."
-  [item]
-  (let [base-text (py/call-attr item "data" (py/get-attr Qt "UserRole") 3)
-        priority (or (py/call-attr item "data" (py/get-attr Qt "UserRole") 1) "Medium")
-        tag (or (py/call-attr item "data" (py/get-attr Qt "UserRole") 2) "")
-        base (or base-text "")
-        suffix (str " [" priority "]" (if (seq tag) (str " #" tag) ""))]
-    (py/call-attr item "setText" (str base suffix))
-    (py/call-attr item "setForeground"
-                  (py/call-attr QtGui "QColor" (priority-color priority)))))
+;; Bulk bridge: the whole task table crosses JVM <-> Python in one call
+;; (call these on the UI thread, e.g. inside ui-dispatch!).
+
+(defn- buffer-longs
+  "Decode a Python int64 buffer (bytes in the given byte order) to a long array."
+  [^bytes data byteorder]
+  (let [buffer (-> (java.nio.ByteBuffer/wrap data)
+                   (.order (if (= byteorder "big")
+                             java.nio.ByteOrder/BIG_ENDIAN
+                             java.nio.ByteOrder/LITTLE_ENDIAN))
+                   (.asLongBuffer))
+        result (long-array (.remaining buffer))]
+    (.get buffer result)
+    result))
+
+(defn snapshot-tasks
+  "Read all tasks as columns with one bridge call.
+  Returns {:count n :ids long-array :done byte-array :priority byte-array
+  (indexes into :priorities) :text :tag :createdAt vectors}; the arrays
+  can be used directly as dtype-next buffers."
+  []
+  (let [payload (py/->jvm (py/call-attr py-embedded "snapshot_tasks"))
+        column (fn [k] (get payload k))]
+    {:count (column "count")
+     :ids (buffer-longs (column "ids") (column "byteorder"))
+     :done (column "done")
+     :priority (column "priority")
+     :priorities (vec (column "priorities"))
+     :text (vec (column "text"))
+     :tag (vec (column "tag"))
+     :createdAt (vec (column "createdAt"))}))
+
+(defn apply-ops!
+  "Apply a batch of edits with one bridge call, one repaint and one save.
+  Ops: {:op \"add\" :text .. :priority .. :tag ..}, {:op \"set\" :id .. <fields>},
+  {:op \"toggle\" :id ..}, {:op \"remove\" :id ..}, {:op \"clear_done\"}.
+  Returns {:added [ids] :changed n :removed n}."
+  [ops]
+  (let [result (py/->jvm (py/call-attr py-embedded "apply_ops"
+                                       (py/->python (mapv #(update-keys % name) ops))))]
+    {:added (vec (get result "added"))
+     :changed (get result "changed")
+     :removed (get result "removed")}))
 
 (defn save-tasks
-  "Save tasks to JSON file."
-  [list-widget]
-  (let [tasks (atom [])
-        count (py/call-attr list-widget "count")]
-    (doseq [i (range count)]
-      (let [item (py/call-attr list-widget "item" i)
-            task {:text (py/call-attr item "text")
-                  :done (= (py/call-attr item "checkState") (py/get-attr Qt "Checked"))
-                  :createdAt (or (py/call-attr item "data" (py/get-attr Qt "UserRole")) "")
-                  :priority (or (py/call-attr item "data" (py/get-attr Qt "UserRole") 1) "Medium")
-                  :tag (or (py/call-attr item "data" (py/get-attr Qt "UserRole") 2) "")}]
-        (swap! tasks conj task)))
-    (try
-      (spit (data-file-path) (json/write-str @tasks))
-      (catch Exception e
-        (println "Error saving tasks:" e)))))
-
-(defn load-tasks
-  "Load tasks from JSON file."
-  [list-widget loading-atom]
-  (let [QListWidgetItem (py/get-attr QtWidgets "QListWidgetItem")]
-    (try
-      (let [tasks (json/read-str (slurp (data-file-path)) :key-fn keyword)]
-        (doseq [task tasks]
-          (let [raw-text (:text task)
-                done (:done task false)
-                created-at (:createdAt task "")
-                priority (:priority task "Medium")
-                tag (:tag task "")
-                base-text (if (clojure.string/includes? raw-text " [")
-                            (first (clojure.string/split raw-text #" \["))
-                            raw-text)
-                item (QListWidgetItem)]
-            (py/call-attr item "setFlags"
-                          (bit-or (py/call-attr item "flags")
-                                  (py/get-attr Qt "ItemIsUserCheckable")
-                                  (py/get-attr Qt "ItemIsEditable")))
-            (py/call-attr item "setCheckState" (if done (py/get-attr Qt "Checked") (py/get-attr Qt "Unchecked")))
-            (py/call-attr item "setData" (py/get-attr Qt "UserRole") created-at)
-            (py/call-attr item "setData" (py/get-attr Qt "UserRole") priority 1)
-            (py/call-attr item "setData" (py/get-attr Qt "UserRole") tag 2)
-            (py/call-attr item "setData" (py/get-attr Qt "UserRole") base-text 3)
-            (update-item-label item)
-            (py/call-attr list-widget "addItem" item))))
-      (catch java.io.FileNotFoundException _
-        nil)
-      (catch Exception e
-        (println "Error loading tasks:" e)))))
+  "Save tasks to the JSON file (locking, merging and the atomic write happen in Python).
+  The list-widget argument of the old per-item version is accepted and ignored:
+  the Python window saves its own model."
+  ([] (py/call-attr (window) "save_tasks"))
+  ([_list-widget] (save-tasks)))
+
+(defn add-tasks!
+  "Add many tasks (maps with :text, :done, :priority, :tag) in one batch; returns their ids."
+  [tasks]
+  (:added (apply-ops! (map #(assoc % :op "add") tasks))))
 
 (defn run-todo-app
   "Call the embedded Python entry point (`run_block_1`) that spins up the shared PySide6 UI."
@@ -10,18 +10,11 @@
 (py/initialize!)
 
 (require-python '[PySide6.QtCore :as QtCore :bind-ns])
-(require-python '[PySide6.QtWidgets :as QtWidgets :bind-ns])
-(require-python '[PySide6.QtGui :as QtGui :bind-ns])
+(require-python :from "13_reagent"
+                '[hiccup_patch :as py-patch :bind-ns])
 
 (def QTimer (py/get-attr QtCore "QTimer"))
 
-(defonce ^:private tag-registry (clojure.core/atom {}))
-
-(defn register-tag!
-  "Register a tag keyword to a Python class."
-  [tag py-class]
-  (swap! tag-registry assoc tag py-class))
-
 (defn- tag-key [tag]
   (cond
     (keyword? tag) tag
@@ -32,20 +25,6 @@
 (defn- tag-name [tag]
   (name (tag-key tag)))
 
-(defn- try-get-attr [module name]
-  (try
-    (py/get-attr module name)
-    (catch Exception _ nil)))
-
-(defn- resolve-class [tag]
-  (let [k (tag-key tag)
-        name (tag-name k)]
-    (or (get @tag-registry k)
-        (try-get-attr QtWidgets name)
-        (try-get-attr QtGui name)
-        (try-get-attr QtCore name)
-        (throw (ex-info (str "Unknown Qt class tag: " name) {:tag tag})))))
-
 (defn- layout-tag? [tag]
   (str/ends-with? (tag-name tag) "Layout"))
 
@@ -55,10 +34,6 @@
         tail (map str/capitalize (rest parts))]
     (apply str head tail)))
 
-(defn- setter-name [k]
-  (let [camel (kebab->camel (name k))]
-    (str "set" (str (str/upper-case (subs camel 0 1)) (subs camel 1)))))
-
 (defn- style->str [v]
   (cond
     (string? v) v
@@ -241,90 +216,90 @@
                                nil))]
     (py/call-attr QTimer "singleShot" 0 cb)))
 
-(defn- set-prop! [widget k v]
-  (cond
-    (= k :items)
-    (try
-      (py/call-attr widget "clear")
-      (py/call-attr widget "addItems" (py/->py-list (or v [])))
-      (catch Exception _ nil))
-    (= k :contents-margins)
-    (when (sequential? v)
-      (let [vals (vec v)]
-        (when (= 4 (count vals))
-          (apply py/call-attr widget "setContentsMargins" vals))))
-    (= k :widget-resizable)
-    (try
-      (py/call-attr widget "setWidgetResizable" (boolean v))
-      (catch Exception _ nil))
-    (= k :fixed-height)
-    (try
-      (py/call-attr widget "setFixedHeight" (int v))
-      (catch Exception _ nil))
-    (= k :fixed-width)
-    (try
-      (py/call-attr widget "setFixedWidth" (int v))
-      (catch Exception _ nil))
-    (= k :style) (py/call-attr widget "setStyleSheet" (style->str v))
-    (= k :qss) (py/call-attr widget "setStyleSheet" (style->str v))
-    (= k :ref) nil
-    :else (let [setter (setter-name k)]
-            (try
-              (py/call-attr widget setter v)
-              (catch Exception _
-                (try
-                  (py/call-attr widget "setProperty" (name k) v)
-                  (catch Exception _ nil)))))))
-
-(defn- apply-props! [widget old-props new-props]
+;; Rendering only diffs vnodes and collects patches; hiccup_patch.py
+;; applies the whole list with one bridge call per render. Nodes are
+;; identified by integer ids, and event handlers stay on the Clojure side
+;; (keyed by node id), so signals are connected once per widget.
+
+(defonce ^:private node-counter (clojure.core/atom 0))
+(defonce ^:private handlers (clojure.core/atom {}))
+
+(def ^:dynamic ^:private *patches* nil)
+(def ^:dynamic ^:private *refs* nil)
+
+(defn- dispatch-event [node-id event & args]
+  (when-let [handler (get-in @handlers [node-id event])]
+    (apply handler args))
+  nil)
+
+(defonce ^:private applier
+  (py/call-attr py-patch "PatchApplier"
+                (py/make-callable (fn [& args] (apply dispatch-event args)))
+                ;; props the widgets couldn't take (wrong type, unknown name)
+                (py/make-callable (fn [node-id message]
+                                    (println "render error: node" node-id "-" message)
+                                    nil))))
+
+(defn register-tag!
+  "Register a tag keyword to a Python class."
+  [tag py-class]
+  (py/call-attr applier "register_tag" (tag-name tag) py-class))
+
+(defn- next-id []
+  (swap! node-counter inc))
+
+(defn- emit! [& patch]
+  (swap! *patches* conj (vec patch)))
+
+(defn- collect-patches
+  "Run f while collecting patches; returns {:result :patches :refs}."
+  [f]
+  (binding [*patches* (clojure.core/atom [])
+            *refs* (clojure.core/atom [])]
+    (let [result (f)]
+      {:result result :patches @*patches* :refs @*refs*})))
+
+(defn- apply-patches! [root {:keys [patches refs]}]
+  (when (seq patches)
+    (py/call-attr applier "apply" root (py/->python patches)))
+  (doseq [[id ref-fn] refs]
+    (ref-fn (py/call-attr applier "node" id))))
+
+(defn- prop-value [k v]
+  (case k
+    (:style :qss) (style->str v)
+    (:items :contents-margins) (vec (or v []))
+    v))
+
+(defn- normal-props [props]
+  (into {} (remove (fn [[k _]] (or (event-key? k) (= k :ref))) props)))
+
+(defn- diff-props! [id old-props new-props]
   (when (contains? new-props :items)
     (let [v (get new-props :items)]
       (when (not= (get old-props :items) v)
-        (set-prop! widget :items v))))
+        (emit! "set" id "items" (prop-value :items v)))))
   (doseq [[k v] new-props]
     (when (and (not= k :items)
                (not= (get old-props k) v))
-      (set-prop! widget k v))))
+      (emit! "set" id (name k) (prop-value k v)))))
 
-(defn- connect-event! [widget k handler]
-  (let [signal-name (event-signal-name k)
-        signal (py/get-attr widget signal-name)
-        cb (py/make-callable (fn [& args]
-                               (apply handler args)
-                               nil))]
-    (py/call-attr signal "connect" cb)
-    {:signal signal :callback cb :handler handler}))
-
-(defn- update-events! [widget old-events new-props]
-  (let [new-handlers (into {} (filter (fn [[k _]] (event-key? k)) new-props))
-        kept (clojure.core/atom {})]
-    (doseq [[k {:keys [signal callback handler] :as entry}] old-events]
-      (let [new-handler (get new-handlers k)]
-        (if (identical? handler new-handler)
-          (swap! kept assoc k entry)
-          (try
-            (py/call-attr signal "disconnect" callback)
-            (catch Exception _ nil)))))
-    (doseq [[k handler] new-handlers]
-      (when-not (get @kept k)
-        (swap! kept assoc k (connect-event! widget k handler))))
-    @kept))
-
-(defn- create-instance [tag parent]
-  (let [klass (resolve-class tag)]
-    (try
-      (if parent
-        (klass parent)
-        (klass))
-      (catch Exception _
-        (klass)))))
+(defn- event-props [props]
+  (into {} (filter (fn [[k _]] (event-key? k)) props)))
 
-(defn- layout-add-child! [layout child]
-  (if (= (:kind child) :layout)
-    (py/call-attr layout "addLayout" (:instance child))
-    (py/call-attr layout "addWidget" (:instance child))))
+(defn- diff-events! [id old-props new-props]
+  (let [old-events (event-props old-props)
+        new-events (event-props new-props)]
+    (doseq [k (keys old-events)]
+      (when-not (contains? new-events k)
+        (emit! "disconnect" id (event-signal-name k))
+        (swap! handlers update id dissoc (name k))))
+    (doseq [[k handler] new-events]
+      (when-not (contains? old-events k)
+        (emit! "connect" id (event-signal-name k) (name k)))
+      (swap! handlers assoc-in [id (name k)] handler))))
 
-(declare mount-vnode)
+(declare mount-vnode reconcile-children)
 
 (defn- wrap-layout-vnode [layout-vnode]
   (element->vnode (into [:QWidget {:layout (:tag layout-vnode)}]
@@ -337,220 +312,191 @@
     (= (:kind content-vnode) :fragment) (first (flatten-fragments (:children content-vnode)))
     :else content-vnode))
 
-(defn- mount-layout-in-layout [parent-layout vnode]
-  (let [layout (create-instance (:tag vnode) nil)
-        _ (apply-props! layout {} (:props vnode))
-        child-nodes (->> (:children vnode)
-                         flatten-fragments
-                         (map #(mount-vnode layout %))
-                         (remove nil?)
-                         vec)]
-    (layout-add-child! parent-layout {:kind :layout :instance layout})
-    {:kind :layout
-     :tag (:tag vnode)
-     :props (:props vnode)
-     :instance layout
-     :children child-nodes}))
-
-(defn- mount-layout-on-widget [widget vnode]
-  (let [layout (create-instance (:tag vnode) nil)
-        _ (apply-props! layout {} (:props vnode))
-        _ (py/call-attr widget "setLayout" layout)
-        child-nodes (->> (:children vnode)
-                         flatten-fragments
-                         (map #(mount-vnode layout %))
-                         (remove nil?)
-                         vec)]
+(defn- mount-layout [vnode]
+  (let [id (next-id)]
+    (emit! "create" id (tag-name (:tag vnode)) "layout")
+    (diff-props! id {} (:props vnode))
     {:kind :layout
+     :id id
      :tag (:tag vnode)
+     :key (:key vnode)
      :props (:props vnode)
-     :instance layout
-     :children child-nodes}))
+     :children (reconcile-children id [] (:children vnode))}))
 
-(defn- mount-widget [parent-layout vnode]
-  (let [widget (create-instance (:tag vnode) nil)
+(defn- mount-layout-on-widget [widget-id vnode]
+  (let [node (mount-layout vnode)]
+    (emit! "set-layout" widget-id (:id node))
+    node))
+
+(defn- mount-widget [layout-id vnode]
+  (let [id (next-id)
         props (:props vnode)
-        event-props (into {} (filter (fn [[k _]] (event-key? k)) props))
-        normal-props (into {} (remove (fn [[k _]] (event-key? k)) props))
-        _ (apply-props! widget {} normal-props)
-        events (reduce-kv (fn [m k v] (assoc m k (connect-event! widget k v)))
-                          {}
-                          event-props)
-        _ (when parent-layout
-            (layout-add-child! parent-layout {:kind :widget :instance widget}))
+        _ (emit! "create" id (tag-name (:tag vnode)) "widget")
+        _ (diff-props! id {} (normal-props props))
+        _ (diff-events! id {} props)
+        _ (when layout-id
+            (emit! "insert" layout-id id))
         layout-child (first (filter #(= (:kind %) :layout) (:children vnode)))
         layout-node (when layout-child
-                      (mount-layout-on-widget widget layout-child))
+                      (mount-layout-on-widget id layout-child))
         content-vnode (normalize-content-vnode (:content vnode))
         content-node (when content-vnode
                        (mount-vnode nil content-vnode))]
     (when content-node
-      (py/call-attr widget "setWidget" (:instance content-node)))
+      (emit! "set-content" id (:id content-node)))
     (when-let [ref-fn (:ref props)]
       (when (fn? ref-fn)
-        (ref-fn widget)))
+        (swap! *refs* conj [id ref-fn])))
     {:kind :widget
+     :id id
      :tag (:tag vnode)
+     :key (:key vnode)
      :props props
-     :instance widget
-     :events events
      :layout layout-node
      :content content-node}))
 
-(defn- mount-vnode [parent-layout vnode]
+(defn- mount-vnode
+  "Mount a vnode and append it to a layout (when layout-id is given)."
+  [layout-id vnode]
   (when vnode
     (case (:kind vnode)
-      :layout (mount-layout-in-layout parent-layout vnode)
-      :widget (mount-widget parent-layout vnode)
-      :stretch (do
-                 (when parent-layout
-                   (py/call-attr parent-layout "addStretch" (:value vnode)))
-                 vnode)
-      :fragment (->> (:children vnode)
-                     flatten-fragments
-                     (map #(mount-vnode parent-layout %))
-                     (remove nil?)
-                     vec)
+      :layout (let [node (mount-layout vnode)]
+                (when layout-id
+                  (emit! "insert" layout-id (:id node)))
+                node)
+      :widget (mount-widget layout-id vnode)
+      :stretch (let [id (next-id)]
+                 (when layout-id
+                   (emit! "stretch" id layout-id (:value vnode)))
+                 (assoc vnode :id id))
       nil)))
 
-(defn- clear-layout! [layout]
-  (loop []
-    (let [count (py/call-attr layout "count")]
-      (when (pos? count)
-        (py/call-attr layout "takeAt" 0)
-        (recur)))))
+(defn- node-ids [node]
+  (if (nil? node)
+    []
+    (concat [(:id node)]
+            (mapcat node-ids (:children node))
+            (node-ids (:layout node))
+            (node-ids (:content node)))))
 
 (defn- unmount-node [node]
   (when node
-    (cond
-      (vector? node) (doseq [n node] (unmount-node n))
-      (= (:kind node) :widget)
-      (do
-        (when-let [layout (:layout node)]
-          (unmount-node layout))
-        (when-let [content (:content node)]
-          (unmount-node content))
-        (doseq [[_ {:keys [signal callback]}] (:events node)]
-          (try
-            (py/call-attr signal "disconnect" callback)
-            (catch Exception _ nil)))
-        (py/call-attr (:instance node) "deleteLater"))
-      (= (:kind node) :layout)
+    (if (vector? node)
+      (doseq [n node] (unmount-node n))
       (do
-        (doseq [child (:children node)]
-          (unmount-node child))
-        (clear-layout! (:instance node))
-        (py/call-attr (:instance node) "deleteLater"))
-      (= (:kind node) :stretch) nil
-      :else nil)))
-
-(declare reconcile)
-
-(defn- reconcile-children [parent-layout old-children new-children]
-  (let [new-children (vec (flatten-fragments new-children))
-        old-children (vec (or old-children []))
-        old-count (count old-children)
-        new-count (count new-children)
-        keep-count (min old-count new-count)
-        updated (transient [])]
-    (dotimes [i keep-count]
-      (conj! updated (reconcile parent-layout
-                                (nth old-children i)
-                                (nth new-children i))))
-    (when (> old-count new-count)
-      (doseq [i (range (dec old-count) (dec new-count) -1)]
-        (when parent-layout
-          (try
-            (py/call-attr parent-layout "takeAt" i)
-            (catch Exception _ nil)))
-        (unmount-node (nth old-children i))))
-    (when (> new-count old-count)
-      (doseq [i (range old-count new-count)]
-        (conj! updated (mount-vnode parent-layout (nth new-children i)))))
-    (persistent! updated)))
-
-(defn- update-layout [_ old-node new-vnode]
-  (let [layout (:instance old-node)]
-    (apply-props! layout (:props old-node) (:props new-vnode))
-    (let [new-children (reconcile-children layout
-                                           (:children old-node)
-                                           (:children new-vnode))]
-      (assoc old-node :props (:props new-vnode) :children new-children))))
-
-(defn- update-widget [parent-layout old-node new-vnode]
-  (let [widget (:instance old-node)
+        (emit! "remove" (:id node))
+        (apply swap! handlers dissoc (node-ids node))))))
+
+(defn- same-type? [node vnode]
+  (and (= (:kind node) (:kind vnode))
+       (= (:tag node) (:tag vnode))))
+
+(declare update-node)
+
+(defn- child-key [node index]
+  (if (some? (:key node))
+    [::key (:key node)]
+    [::index index]))
+
+(defn- reconcile-children
+  "Diff the children of a layout by :key (by position when unkeyed).
+  Matching nodes are updated in place, new ones are appended, stale
+  ones removed, and one reorder patch fixes the order if it changed."
+  [layout-id old-children new-vnodes]
+  (let [new-vnodes (->> new-vnodes flatten-fragments (remove nil?) vec)
+        old-children (vec old-children)
+        old-by-key (into {} (map-indexed (fn [i node] [(child-key node i) node]) old-children))
+        [children _] (reduce
+                      (fn [[children used] [i vnode]]
+                        (let [old (get old-by-key (child-key vnode i))]
+                          (if (and old (not (used (:id old))) (same-type? old vnode))
+                            [(conj children (update-node old vnode)) (conj used (:id old))]
+                            [(conj children (mount-vnode layout-id vnode)) used])))
+                      [[] #{}]
+                      (map-indexed vector new-vnodes))
+        children (vec (remove nil? children))
+        kept (set (map :id children))]
+    (doseq [old old-children]
+      (when-not (contains? kept (:id old))
+        (unmount-node old)))
+    (let [new-order (mapv :id children)
+          survivors (filterv kept (map :id old-children))
+          appended (into survivors (remove (set survivors)) new-order)]
+      (when (and layout-id (not= appended new-order))
+        (emit! "reorder" layout-id new-order)))
+    children))
+
+(defn- update-layout [old-node new-vnode]
+  (let [id (:id old-node)]
+    (diff-props! id (:props old-node) (:props new-vnode))
+    (assoc old-node
+           :props (:props new-vnode)
+           :key (:key new-vnode)
+           :children (reconcile-children id (:children old-node) (:children new-vnode)))))
+
+(defn- update-widget [old-node new-vnode]
+  (let [id (:id old-node)
         props (:props new-vnode)
-        event-props (into {} (filter (fn [[k _]] (event-key? k)) props))
-        normal-props (into {} (remove (fn [[k _]] (event-key? k)) props))
-        old-normal-props (into {} (remove (fn [[k _]] (event-key? k)) (:props old-node)))]
-    (apply-props! widget old-normal-props normal-props)
-    (let [updated-events (update-events! widget (:events old-node) props)
-          new-layout (first (filter #(= (:kind %) :layout) (:children new-vnode)))
+        old-props (:props old-node)]
+    (diff-props! id (normal-props old-props) (normal-props props))
+    (diff-events! id old-props props)
+    (let [new-layout (first (filter #(= (:kind %) :layout) (:children new-vnode)))
           old-layout (:layout old-node)
           layout-node (cond
                         (and old-layout new-layout
                              (= (:tag old-layout) (:tag new-layout)))
-                        (update-layout widget old-layout new-layout)
+                        (update-layout old-layout new-layout)
 
                         new-layout
                         (do
-                          (when old-layout
-                            (unmount-node old-layout))
-                          (mount-layout-on-widget widget new-layout))
+                          (unmount-node old-layout)
+                          (mount-layout-on-widget id new-layout))
 
                         :else
                         (do
-                          (when old-layout
-                            (unmount-node old-layout))
-                          nil))]
-      (let [new-content-vnode (normalize-content-vnode (:content new-vnode))
-            old-content (:content old-node)
-            content-node (cond
-                           (and old-content new-content-vnode)
-                           (reconcile nil old-content new-content-vnode)
-
-                           (and new-content-vnode (nil? old-content))
-                           (mount-vnode nil new-content-vnode)
-
-                           (and old-content (nil? new-content-vnode))
-                           (do
-                             (unmount-node old-content)
-                             nil)
-
-                           :else old-content)]
-        (when content-node
-          (try
-            (py/call-attr widget "setWidget" (:instance content-node))
-            (catch Exception _ nil)))
-        (assoc old-node
-               :props props
-               :events updated-events
-               :layout layout-node
-               :content content-node)))))
-
-(defn- reconcile [parent-layout old-node new-vnode]
-  (cond
-    (nil? new-vnode) (do (unmount-node old-node) nil)
-    (nil? old-node) (mount-vnode parent-layout new-vnode)
-    (vector? old-node) (do (unmount-node old-node)
-                           (mount-vnode parent-layout new-vnode))
-    (not= (:kind old-node) (:kind new-vnode)) (do (unmount-node old-node)
-                                                  (mount-vnode parent-layout new-vnode))
-    (not= (:tag old-node) (:tag new-vnode)) (do (unmount-node old-node)
-                                                (mount-vnode parent-layout new-vnode))
-    (= (:kind old-node) :layout) (update-layout parent-layout old-node new-vnode)
-    (= (:kind old-node) :widget) (update-widget parent-layout old-node new-vnode)
-    :else old-node))
+                          (unmount-node old-layout)
+                          nil))
+          new-content-vnode (normalize-content-vnode (:content new-vnode))
+          old-content (:content old-node)
+          content-node (cond
+                         (nil? new-content-vnode)
+                         (do
+                           (unmount-node old-content)
+                           nil)
+
+                         (and old-content (same-type? old-content new-content-vnode))
+                         (update-node old-content new-content-vnode)
+
+                         :else
+                         (do
+                           (unmount-node old-content)
+                           (mount-vnode nil new-content-vnode)))]
+      (when (and content-node (not= (:id content-node) (:id old-content)))
+        (emit! "set-content" id (:id content-node)))
+      (assoc old-node
+             :props props
+             :key (:key new-vnode)
+             :layout layout-node
+             :content content-node))))
+
+(defn- update-node [old-node new-vnode]
+  (case (:kind old-node)
+    :layout (update-layout old-node new-vnode)
+    :widget (update-widget old-node new-vnode)
+    old-node))
 
 (defn mount!
   "Mount a Hiccup element into a root QWidget. Returns a mount map."
   [root element]
-  (let [root-layout (create-instance :QVBoxLayout nil)
-        _ (py/call-attr root "setLayout" root-layout)
+  (let [root-id (next-id)
+        layout-id (next-id)
+        _ (py/call-attr applier "register" root-id root)
+        _ (apply-patches! root {:patches [["create" layout-id "QVBoxLayout" "layout"]
+                                          ["set-layout" root-id layout-id]]})
         mount (clojure.core/atom {:root root
-                     :layout root-layout
+                     :layout-id layout-id
                      :element element
-                     :tree (clojure.core/atom nil)
+                     :tree (clojure.core/atom [])
                      :deps (clojure.core/atom #{})
                      :pending? (clojure.core/atom false)
                      :watch-key (gensym "qt-hiccup")})
@@ -566,15 +512,17 @@
                                               (fn []
                                                 (element->vnode
                                                  (if (vector? element) element [element]))))
-                        old-deps @(:deps @mount)]
+                        old-deps @(:deps @mount)
+                        tree (:tree @mount)]
                     (doseq [dep (set/difference old-deps deps)]
                       (remove-watch dep (:watch-key @mount)))
                     (doseq [dep (set/difference deps old-deps)]
                       (add-watch dep (:watch-key @mount) (fn [& _] (schedule!))))
                     (reset! (:deps @mount) deps)
-                    (swap! (:tree @mount)
-                           (fn [old]
-                             (reconcile root-layout old value)))))]
+                    (let [batch (collect-patches
+                                 #(reconcile-children layout-id @tree [value]))]
+                      (reset! tree (:result batch))
+                      (apply-patches! root batch))))]
     (swap! mount assoc :render! render!)
     (render!)
     @mount))
@@ -585,7 +533,8 @@
   (when mount
     (doseq [dep @(:deps mount)]
       (remove-watch dep (:watch-key mount)))
-    (unmount-node @(:tree mount))
+    (apply-patches! (:root mount)
+                    (collect-patches #(unmount-node @(:tree mount))))
     (reset! (:tree mount) nil)))
 
 (defn flush!
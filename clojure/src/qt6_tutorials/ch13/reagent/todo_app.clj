@@ -236,7 +236,8 @@
                (when (seq tag)
                  [:span {:style "color:#6b7280;"} (str " #" tag)]))]
     [:QWidget
-     {:style {:background "#ffffff"
+     {:key id
+      :style {:background "#ffffff"
               :border "1px solid #e5e7eb"
               :border-radius "6px"}
       :fixed-height 48}
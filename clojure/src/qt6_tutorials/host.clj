@@ -0,0 +1,200 @@
+;; Client for the warm Python/Qt host (qt_host.py)
+;; The host keeps one interpreter and one QApplication alive; chapters'
+;; embedded.py blocks are loaded on demand over a local socket, so this
+;; namespace needs no py/initialize! and switching chapters is cheap.
+;;
+;;   clj -M:qt-host serve                      ; start the host and wait
+;;   clj -M:qt-host run ch10-concurrent-basics ; all blocks of a chapter
+;;   clj -M:qt-host run 07_sql/02_queries 3    ; one block
+;;
+;; From a REPL: (host/ensure-host!), (host/run-chapter! "ch01-core-timer"), ...
+
+(ns qt6_tutorials.host
+  (:require [clojure.data.json :as json]
+            [clojure.edn :as edn]
+            [clojure.java.io :as io]
+            [clojure.pprint :refer [pprint]]
+            [clojure.string :as str])
+  (:import (java.io BufferedReader IOException RandomAccessFile)
+           (java.net StandardProtocolFamily UnixDomainSocketAddress)
+           (java.nio.channels Channels SocketChannel)))
+
+(def default-name "qt6-tutorials-host")
+
+(defn- windows? []
+  (str/starts-with? (System/getProperty "os.name") "Windows"))
+
+(defn server-name
+  "Socket path (pipe name on Windows); must match qt_host.py's server_name()."
+  []
+  (or (System/getenv "QT6_HOST_SOCKET")
+      (if (windows?)
+        default-name
+        (.getPath (io/file (or (System/getenv "TMPDIR") "/tmp")
+                           (str default-name ".sock"))))))
+
+;; ========== 连接 ==========
+
+(defonce ^:private connection (atom nil))
+(defonce ^:private request-id (atom 0))
+
+(defn- open-connection []
+  (if (windows?)
+    (let [pipe (RandomAccessFile. (str "\\\\.\\pipe\\" (server-name)) "rw")
+          channel (.getChannel pipe)]
+      {:reader (io/reader (Channels/newInputStream channel) :encoding "UTF-8")
+       :writer (io/writer (Channels/newOutputStream channel) :encoding "UTF-8")
+       :close #(.close pipe)})
+    (let [channel (SocketChannel/open StandardProtocolFamily/UNIX)]
+      (.connect channel (UnixDomainSocketAddress/of ^String (server-name)))
+      {:reader (io/reader (Channels/newInputStream channel) :encoding "UTF-8")
+       :writer (io/writer (Channels/newOutputStream channel) :encoding "UTF-8")
+       :close #(.close channel)})))
+
+(defn disconnect!
+  "Close the connection to the host (the host keeps running)."
+  []
+  (locking connection
+    (when-let [{:keys [close]} @connection]
+      (try (close) (catch Exception _ nil))
+      (reset! connection nil))))
+
+(defn request!
+  "Send one request map, e.g. {:op \"run\" :chapter .. :block 2}; returns the
+  response map. Output printed by the block is echoed here."
+  [payload]
+  (locking connection
+    (let [conn (or @connection (reset! connection (open-connection)))
+          id (swap! request-id inc)
+          response (try
+                     (doto ^java.io.Writer (:writer conn)
+                       (.write (str (json/write-str (assoc payload :id id)) "\n"))
+                       (.flush))
+                     (or (.readLine ^BufferedReader (:reader conn))
+                         (throw (IOException. "Qt host closed the connection")))
+                     (catch IOException e
+                       (disconnect!)
+                       (throw e)))
+          response (json/read-str response :key-fn keyword)]
+      (when (seq (:output response))
+        (print (:output response))
+        (flush))
+      (if (:ok response)
+        response
+        (throw (ex-info (str "Qt host: " (:error response))
+                        {:traceback (:traceback response) :request payload}))))))
+
+;; ========== 启动 ==========
+
+(defn- python-executable []
+  (let [config (io/file "python.edn")]
+    (or (when (.exists config)
+          (:python-executable (edn/read-string (slurp config))))
+        "python3")))
+
+(defn running?
+  "True if a host answers on the socket."
+  []
+  (try
+    (request! {:op "ping"})
+    true
+    (catch Exception _
+      false)))
+
+(defonce ^:private host-process (atom nil))
+
+(defn start-host!
+  "Start qt_host.py in the background (output goes to this process' console)
+  and wait until it answers. Returns the Process."
+  ([] (start-host! 20000))
+  ([timeout-ms]
+   (let [process (-> (ProcessBuilder. [(python-executable) "qt_host.py" "serve"])
+                     (.inheritIO)
+                     (.start))
+         deadline (+ (System/currentTimeMillis) timeout-ms)]
+     (reset! host-process process)
+     (loop []
+       (cond
+         (running?) process
+         (not (.isAlive process)) (throw (ex-info "Qt host exited" {:exit (.exitValue process)}))
+         (> (System/currentTimeMillis) deadline) (throw (ex-info "Qt host did not start" {}))
+         :else (do (Thread/sleep 100) (recur)))))))
+
+(defn ensure-host!
+  "Connect to a running host, starting one if needed."
+  []
+  (when-not (running?)
+    (start-host!))
+  :ok)
+
+;; ========== 章节 ==========
+
+(defn- example-dirs []
+  (for [section (.listFiles (io/file "."))
+        :when (and (.isDirectory section) (re-find #"^\d\d_" (.getName section)))
+        example (.listFiles section)
+        :when (.exists (io/file example "embedded.py"))]
+    [(.getName section) (.getName example)]))
+
+(defn chapter-dir
+  "Chapter directory of an alias name (\"ch10-concurrent-basics\") or a path
+  (\"10_concurrent/01_basics\")."
+  [chapter]
+  (let [chapter (name chapter)]
+    (if (str/includes? chapter "/")
+      chapter
+      (let [[_ number rest] (re-matches #"ch(\d\d)-(.+)" chapter)
+            slug (fn [dir] (-> dir (str/replace #"^\d+_" "") (str/replace "_" "-")))
+            matches (for [[section example] (example-dirs)
+                          :when (and number (str/starts-with? section (str number "_"))
+                                     (str/ends-with? (str "-" rest) (str "-" (slug example))))]
+                      [(count (slug example)) (str section "/" example)])]
+        (or (second (last (sort matches)))
+            (throw (ex-info (str "Unknown chapter: " chapter) {:chapter chapter})))))))
+
+(defn load-chapter!
+  "Import a chapter's embedded.py in the host (again with :reload true)."
+  [chapter & {:keys [reload]}]
+  (:result (request! {:op "load" :chapter (chapter-dir chapter) :reload (boolean reload)})))
+
+(defn run-block!
+  "Run block n of a chapter in the host; returns the block's result."
+  [chapter n & args]
+  (:result (request! {:op "run" :chapter (chapter-dir chapter) :block n :args (vec args)})))
+
+(defn run-chapter!
+  "Run all argument-free blocks of a chapter in order."
+  [chapter & {:keys [reload]}]
+  (let [response (request! {:op "run" :chapter (chapter-dir chapter) :reload (boolean reload)})]
+    (println (str "[" (chapter-dir chapter) ": " (:ms response) " ms]"))
+    (:result response)))
+
+(defn stats
+  "Block timings, PySide6 import profile and loaded Qt modules of the host."
+  []
+  (:result (request! {:op "stats"})))
+
+(defn shutdown!
+  "Stop the host process."
+  []
+  (try
+    (request! {:op "shutdown"})
+    (finally
+      (disconnect!))))
+
+(defn -main
+  [& [command & args]]
+  (case command
+    "serve" (if (running?)
+              (println (str "Qt host already running on " (server-name)))
+              (let [process (start-host!)]
+                (println (str "Qt host ready on " (server-name)))
+                (.waitFor ^Process process)))
+    "run" (let [[chapter block & block-args] args]
+            (if block
+              (apply run-block! chapter (Integer/parseInt block) block-args)
+              (run-chapter! chapter)))
+    "stats" (pprint (stats))
+    "stop" (shutdown!)
+    (println "Usage: clj -M:qt-host serve | run <chapter> [block args...] | stats | stop"))
+  (shutdown-agents))
@@ -0,0 +1,52 @@
+;; Lazy PySide6 modules for the Clojure chapters (Clojure + libpython-clj)
+;; PySide6.* submodules are imported on first use instead of at namespace
+;; load, and the import profile shows what startup actually paid for.
+
+(ns qt6_tutorials.lazy_qt
+  (:require [libpython-clj2.python :as py]
+            [libpython-clj2.require :refer [require-python]]))
+
+(py/initialize!)
+
+(require-python :from "."
+                '[lazy_qt :as py-lazy :bind-ns])
+
+(defn start-import-profile!
+  "Time every Python import from now on (QT6_IMPORT_PROFILE=1 starts it at load)."
+  []
+  (py/call-attr py-lazy "start_profile")
+  nil)
+
+(defn qt-module
+  "PySide6 submodule by name (\"QtWidgets\"); imported on first attribute access."
+  [module-name]
+  (py/call-attr py-lazy "module" (str "PySide6." (name module-name))))
+
+(defn qt-class
+  "Delay of a PySide6 class, e.g. @(qt-class :QtWidgets \"QApplication\")."
+  [module-name class-name]
+  (delay (py/get-attr (qt-module module-name) class-name)))
+
+(defn loaded-qt-modules
+  "PySide6 submodules imported so far."
+  []
+  (vec (py/->jvm (py/call-attr py-lazy "loaded_qt_modules"))))
+
+(defn import-profile
+  "Import timings, most expensive first: [{:module :self-ms :total-ms :depth :lazy}].
+  prefix limits the result, e.g. \"PySide6\"."
+  ([] (import-profile ""))
+  ([prefix]
+   (mapv (fn [row]
+           {:module (get row "module")
+            :self-ms (get row "self_ms")
+            :total-ms (get row "total_ms")
+            :depth (get row "depth")
+            :lazy (get row "lazy")})
+         (py/->jvm (py/call-attr py-lazy "summary" prefix)))))
+
+(defn print-import-profile!
+  "Print the import profile as a table."
+  ([] (print-import-profile! ""))
+  ([prefix]
+   (println (py/call-attr py-lazy "report" prefix))))
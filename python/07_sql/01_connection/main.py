@@ -13,16 +13,25 @@ PySide6 SQL 数据库连接示例
 - QSQLITE (内置)
 - QMYSQL, QPSQL, QODBC 等
 
+多线程: 连接只能在创建它的线程中使用, 线程池任务通过
+ConnectionPool 获取本线程的命名连接 (见 demonstrate_connection_pool)
+
 官方文档: https://doc.qt.io/qtforpython/PySide6/QtSql/index.html
 """
 
 import sys
 import os
-from PySide6.QtCore import QCoreApplication
+import threading
+import time
+from PySide6.QtCore import QCoreApplication, QRunnable, QThreadPool
 from PySide6.QtSql import (
     QSqlDatabase, QSqlQuery, QSqlError, QSqlRecord
 )
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from bulk_loader import BulkLoader  # noqa: E402
+from connection_pool import ConnectionPool, READ_PRAGMAS  # noqa: E402
+
 
 def show_available_drivers():
     """显示可用数据库驱动"""
@@ -240,6 +249,81 @@ def show_record_info():
         print(f"  字段{i}: {record.fieldName(i)} ({field.typeID()})")
 
 
+class ReportTask(QRunnable):
+    """线程池中的只读统计任务, 使用本线程的连接"""
+
+    def __init__(self, pool, low, high, results):
+        super().__init__()
+        self.pool = pool
+        self.low = low
+        self.high = high
+        self.results = results
+
+    def run(self):
+        with self.pool.connection() as db:
+            query = QSqlQuery(db)
+            query.setForwardOnly(True)
+            query.prepare("SELECT COUNT(*), SUM(amount) FROM orders WHERE user_id BETWEEN ? AND ?")
+            query.addBindValue(self.low)
+            query.addBindValue(self.high)
+            if query.exec() and query.next():
+                self.results.append((self.low, query.value(0), query.value(1),
+                                     db.connectionName(), threading.get_ident()))
+            else:
+                print(f"查询失败: {query.lastError().text()}")
+
+
+def create_pool_orders(writer):
+    """通过连接池的写连接准备订单数据"""
+    with writer.connection() as db:
+        query = QSqlQuery(db)
+        query.exec("DROP TABLE IF EXISTS orders")
+        query.exec("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, amount REAL)")
+        query.exec("CREATE INDEX orders_user ON orders(user_id)")
+        stats = BulkLoader(db, "orders", ["user_id", "amount"]).load_rows(
+            (i % 1000, float(i % 997)) for i in range(200_000))
+        print(f"写入订单: {stats}")
+
+
+def demonstrate_connection_pool():
+    """多线程连接池"""
+    print("\n=== 多线程连接池 (ConnectionPool) ===\n")
+
+    path = "pool_demo.db"
+
+    # 写连接: WAL 模式, 读者与写者互不阻塞
+    writer = ConnectionPool(path, name="writer")
+    create_pool_orders(writer)
+
+    # 读连接: 每个工作线程一个命名连接, 线程执行后续任务时复用
+    readers = ConnectionPool(path, pragmas=READ_PRAGMAS, name="reader")
+    thread_pool = QThreadPool()
+    thread_pool.setMaxThreadCount(4)
+    results = []
+    start = time.perf_counter()
+    for low in range(0, 1000, 50):
+        thread_pool.start(ReportTask(readers, low, low + 49, results))
+    thread_pool.waitForDone()
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(results)} 个统计任务, {elapsed * 1000:.1f} 毫秒")
+    for low, count, total, name, thread_id in sorted(results)[:4]:
+        print(f"  用户 {low}-{low + 49}: {count} 单, ¥{total:.2f} (连接 {name}, 线程 {thread_id})")
+    connections = {name for _, _, _, name, _ in results}
+    print(f"  ... 共用了 {len(connections)} 个连接: {', '.join(sorted(connections))}")
+    print(f"连接池统计: {readers.stats()}")
+
+    # 连接只由所属线程关闭: 工作线程在 waitForDone() 结束时已关闭各自的连接,
+    # 主线程的写连接由 close_all() 关闭 (空闲清理通常由连接池按 idle_timeout 自动进行)
+    print(f"工作线程结束后: 已关闭 {readers.stats()['closed']} 个读连接")
+    print(f"关闭空闲连接: 写 {writer.close_all()} 个")
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
 def main():
     app = QCoreApplication(sys.argv)
     
@@ -256,6 +340,7 @@ def main():
     update_and_delete()
     demonstrate_transactions()
     show_record_info()
+    demonstrate_connection_pool()
     
     # 清理
     QSqlDatabase.database().close()
@@ -14,15 +14,25 @@ Qt6 SQL 查询示例 - QSqlQuery (Python)
 - SELECT 查询数据
 - 批量操作
 - 事务处理
+- 大批量导入 (BulkLoader: 多行 INSERT + 分块事务 + WAL)
+- 异步查询 (AsyncQueryExecutor: 工作线程执行, 分块送回主线程)
+- 预编译语句缓存 (StatementCache: 按 SQL 文本缓存 prepare 结果)
 
 官方文档: https://doc.qt.io/qtforpython/PySide6/QtSql/index.html
 """
 
 import sys
 import os
-from PySide6.QtCore import QCoreApplication
+import time
+from PySide6.QtCore import QCoreApplication, QTimer
 from PySide6.QtSql import QSqlDatabase, QSqlQuery, QSqlError
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from async_query import AsyncQueryExecutor  # noqa: E402
+from bulk_loader import BulkLoader  # noqa: E402
+from connection_pool import ConnectionPool, READ_PRAGMAS  # noqa: E402
+from statement_cache import statement_cache  # noqa: E402
+
 
 def create_connection():
     """创建数据库连接"""
@@ -81,6 +91,8 @@ def demonstrate_insert():
     print(f"命名参数绑定: 插入王五, ID: {query.lastInsertId()}")
 
     # 方式4: 批量插入 - 使用 bindValue 设置参数值
+    # 注意: QSQLITE 没有原生批量接口, execBatch 逐行模拟且行数越多越慢,
+    # 大量数据请用 BulkLoader (见 demonstrate_bulk_load)
     query.prepare("INSERT INTO employees (name, department, salary, hire_date) VALUES (?, ?, ?, ?)")
 
     names = ["赵六", "孙七", "周八"]
@@ -293,6 +305,154 @@ def demonstrate_error_handling():
         print(f"\n插入失败 (name 为 NULL): {query.lastError().text()}")
 
 
+def demonstrate_bulk_load(count):
+    """演示大批量导入"""
+    print(f"\n=== 大批量导入 ({count} 条) ===\n")
+
+    query = QSqlQuery()
+    query.exec("DROP TABLE IF EXISTS employees_bulk")
+    query.exec("""
+        CREATE TABLE employees_bulk (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            department TEXT,
+            salary REAL,
+            hire_date DATE
+        )
+    """)
+
+    departments = ["技术部", "市场部", "财务部", "人事部", "产品部"]
+    rows = ((f"员工{i}", departments[i % len(departments)], 8000.0 + i % 10000,
+             f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+            for i in range(count))
+
+    # 对比: execBatch 逐行模拟 (只取 2000 条, 且放在事务中)
+    sample = 2000
+    db = QSqlDatabase.database()
+    query.prepare("INSERT INTO employees_bulk (name, department, salary, hire_date) VALUES (?, ?, ?, ?)")
+    for column in zip(*[(f"样本{i}", "测试部", 1.0, "2023-01-01") for i in range(sample)]):
+        query.addBindValue(list(column))
+    start = time.perf_counter()
+    db.transaction()
+    query.execBatch()
+    db.commit()
+    elapsed = time.perf_counter() - start
+    print(f"execBatch: {sample} 条, {elapsed:.2f} 秒 ({sample / elapsed:.0f} 条/秒)")
+    query.exec("DELETE FROM employees_bulk")
+
+    # BulkLoader: 一个预编译的多行 INSERT, 每 50000 条一个事务, 导入期间 WAL + synchronous=NORMAL
+    loader = BulkLoader(db, "employees_bulk", ["name", "department", "salary", "hire_date"])
+    stats = loader.load_rows(rows, progress=lambda done: print(f"  已导入 {done} 条", end="\r"))
+    print()
+    if not stats.ok:
+        print(f"批量导入失败: {stats.error}")
+    print(f"BulkLoader: {stats.rows} 条, {stats.chunks} 个事务, {stats.seconds:.2f} 秒 "
+          f"({stats.rows_per_second:.0f} 条/秒)")
+
+    query.exec("SELECT COUNT(*), AVG(salary) FROM employees_bulk")
+    if query.next():
+        print(f"表中记录数: {query.value(0)}, 平均薪资 ¥{query.value(1):.2f}")
+
+
+def create_sample_table(table, count):
+    """创建一张有 count 条示例员工记录的表, 让后面的演示可以单独运行"""
+    query = QSqlQuery()
+    query.exec(f"DROP TABLE IF EXISTS {table}")
+    query.exec(f"""
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            department TEXT,
+            salary REAL
+        )
+    """)
+
+    departments = ["技术部", "市场部", "财务部", "人事部", "产品部"]
+    rows = ((f"员工{i}", departments[i % len(departments)], 8000.0 + i % 10000) for i in range(count))
+    stats = BulkLoader(QSqlDatabase.database(), table, ["name", "department", "salary"]).load_rows(rows)
+    if not stats.ok:
+        print(f"创建 {table} 失败: {stats.error}")
+    return stats.ok
+
+
+def demonstrate_async_select():
+    """演示异步查询"""
+    print("\n=== 异步查询 (AsyncQueryExecutor) ===\n")
+
+    if not create_sample_table("employees_async", 50_000):
+        return
+
+    # 查询在线程池中用各线程自己的连接执行, 结果按块通过信号送回主线程
+    executor = AsyncQueryExecutor(ConnectionPool("queries_demo.db", pragmas=READ_PRAGMAS, name="async"))
+
+    # 主线程计时器: 查询期间事件循环照常运行 (界面不会卡住)
+    ticks = [0]
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.__setitem__(0, ticks[0] + 1))
+    timer.start(10)
+
+    report = executor.submit("SELECT department, name, salary FROM employees_async "
+                             "WHERE salary > ? ORDER BY salary DESC", [15000.0], chunk_size=5000)
+    chunks = []
+    report.columns.connect(lambda names: print(f"结果列: {names}"))
+    report.rows.connect(lambda rows: chunks.append(len(rows)))
+    report.failed.connect(lambda error: print(f"查询失败: {error}"))
+    report.wait()
+    timer.stop()
+    print(f"收到 {len(chunks)} 块, 共 {report.delivered} 行, 耗时 {report.seconds:.2f} 秒, "
+          f"期间主线程计时器触发 {ticks[0]} 次")
+
+    # 取消: 收到第一块后取消, 工作线程在下一块前停止
+    scan = executor.submit("SELECT * FROM employees_async", chunk_size=1000)
+    scan.rows.connect(lambda rows: scan.cancel())
+    scan.wait()
+    print(f"取消的查询: 状态 {scan.state}, 已收到 {scan.delivered} 行")
+
+    executor.shutdown()
+
+
+def demonstrate_statement_cache():
+    """演示预编译语句缓存"""
+    print("\n=== 预编译语句缓存 (StatementCache) ===\n")
+
+    count, lookups = 1000, 20000
+    if not create_sample_table("employees_cache", count):
+        return
+    sql = "SELECT name, salary FROM employees_cache WHERE id = ?"
+
+    # 每次都 prepare: SQLite 每次重新解析 SQL
+    start = time.perf_counter()
+    for i in range(lookups):
+        query = QSqlQuery()
+        query.prepare(sql)
+        query.addBindValue(1 + i % count)
+        query.exec()
+        query.next()
+    elapsed = time.perf_counter() - start
+    print(f"每次 prepare: {lookups} 次查找, {elapsed:.2f} 秒 ({elapsed / lookups * 1e6:.1f} 微秒/次)")
+
+    # 语句缓存: 只在第一次 prepare, 之后直接绑定执行
+    statements = statement_cache()
+    start = time.perf_counter()
+    for i in range(lookups):
+        query = statements.prepare(sql)
+        query.bindValue(0, 1 + i % count)
+        query.exec()
+        query.next()
+    elapsed = time.perf_counter() - start
+    print(f"语句缓存:    {lookups} 次查找, {elapsed:.2f} 秒 ({elapsed / lookups * 1e6:.1f} 微秒/次)")
+    print(f"缓存统计: {statements.stats()}")
+
+    # 表结构变化 (DDL) 会使缓存的语句失效
+    alter = statements.exec("ALTER TABLE employees_cache ADD COLUMN email TEXT")
+    if alter.lastError().isValid():
+        print(f"ALTER TABLE 失败: {alter.lastError().text()}")
+        return
+    query = statements.exec(sql, [1])
+    if query.next():
+        print(f"ALTER TABLE 后重新 prepare: {query.value('name')}, 缓存统计: {statements.stats()}")
+
+
 def main():
     app = QCoreApplication(sys.argv)
 
@@ -308,6 +468,10 @@ def main():
     demonstrate_delete()
     demonstrate_transaction()
     demonstrate_error_handling()
+    # 导入条数可由命令行指定, 例如: python main.py 1000000
+    demonstrate_bulk_load(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    demonstrate_async_select()
+    demonstrate_statement_cache()
 
     # 清理
     QSqlDatabase.database().close()
@@ -316,6 +480,9 @@ def main():
         print("\n测试数据库已删除")
     except:
         pass
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists("queries_demo.db" + suffix):
+            os.remove("queries_demo.db" + suffix)
 
     return 0
 
@@ -13,6 +13,7 @@ Qt6 SQL 模型示例 - QSqlTableModel, QSqlQueryModel
 - QSqlTableModel 的基本 CRUD 操作
 - 排序、过滤、数据修改
 - 提交和回滚修改
+- 大表分页模型 KeysetTableModel (键集分页 + LRU 页缓存)
 
 注意: 虽然不需要显示 GUI，但模型类属于 Qt::Widgets 模块
 
@@ -23,12 +24,17 @@ Qt6 SQL 模型示例 - QSqlTableModel, QSqlQueryModel
 
 import sys
 import os
+import time
 from PySide6.QtCore import QCoreApplication, Qt, QModelIndex
 from PySide6.QtSql import (
     QSqlDatabase, QSqlQuery, QSqlQueryModel, QSqlTableModel,
     QSqlRecord, QSqlError
 )
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from bulk_loader import BulkLoader  # noqa: E402
+from paging_model import KeysetTableModel  # noqa: E402
+
 
 def create_connection():
     """创建数据库连接"""
@@ -421,6 +427,60 @@ def demonstrate_header_customization():
         print(f"  列{col}: '{header}' (原字段: {original})")
 
 
+def demonstrate_paging_model(count):
+    """大表分页模型"""
+    print(f"\n=== 大表分页模型 KeysetTableModel ({count} 行) ===\n")
+
+    query = QSqlQuery()
+    query.exec("DROP TABLE IF EXISTS big_products")
+    query.exec("""
+        CREATE TABLE big_products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category TEXT,
+            price REAL,
+            stock INTEGER
+        )
+    """)
+    categories = ["手机", "电脑", "平板", "耳机", "穿戴设备"]
+    loader = BulkLoader(QSqlDatabase.database(), "big_products", ["name", "category", "price", "stock"])
+    print(f"生成数据: {loader.load_rows((f'产品{i}', categories[i % 5], 99.0 + i % 9000, i % 500) for i in range(count))}")
+
+    # 每页 500 行, 页缓存最多 2MB; 列按 array('q') / array('d') / list 紧凑存储
+    model = KeysetTableModel(QSqlDatabase.database(), "big_products",
+                             ["name", "category", "price", "stock"], max_bytes=2 * 1024 * 1024)
+    model.headers = ["名称", "分类", "价格", "库存"]
+    print(f"记录数: {model.rowCount()} 列数: {model.columnCount()}")
+
+    # 视图滚动时调用 set_viewport(首行, 末行): 加载可见页并预取前后各一页
+    for first in (0, model.rowCount() // 2, model.rowCount() - 20):
+        start = time.perf_counter()
+        model.set_viewport(first, first + 19)
+        row = [model.data(model.index(first, col)) for col in range(model.columnCount())]
+        print(f"  跳到第 {first} 行: {row} ({(time.perf_counter() - start) * 1000:.1f} 毫秒)")
+
+    # 从头到尾滚动一遍, 内存占用受 max_bytes 限制
+    start = time.perf_counter()
+    for first in range(0, model.rowCount(), 1000):
+        model.set_viewport(first, first + 39)
+        for row in range(first, min(first + 40, model.rowCount())):
+            for col in range(model.columnCount()):
+                model.data(model.index(row, col))
+    stats = model.cache_stats()
+    print(f"滚动整表: {time.perf_counter() - start:.2f} 秒, 缓存 {stats['pages']} 页 / "
+          f"{stats['bytes'] / 1024:.0f} KB, 读取 {stats['misses']} 页, 淘汰 {stats['evictions']} 页")
+
+    # 对比: QSqlQueryModel 要显示最后一行, 必须先把前面所有行都取出并保留
+    query_model = QSqlQueryModel()
+    start = time.perf_counter()
+    query_model.setQuery("SELECT name, category, price, stock FROM big_products ORDER BY id")
+    while query_model.canFetchMore():
+        query_model.fetchMore()
+    print(f"QSqlQueryModel 取到最后一行: {time.perf_counter() - start:.2f} 秒, "
+          f"保留 {query_model.rowCount()} 条 QSqlRecord")
+    query_model.clear()
+
+
 def main():
     app = QCoreApplication(sys.argv)
 
@@ -436,6 +496,8 @@ def main():
     demonstrate_filtering_and_sorting()
     demonstrate_batch_operations()
     demonstrate_header_customization()
+    # 行数可由命令行指定, 例如: python main.py 10000000
+    demonstrate_paging_model(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
 
     # 清理
     QSqlDatabase.database().close()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asynchronous queries streamed to the GUI thread
+
+A large SELECT run with QSqlQuery on the main thread blocks the event loop
+until the last row has been fetched. AsyncQueryExecutor runs each query
+on a QThreadPool worker, with that worker's connection from a
+ConnectionPool, and delivers the rows in chunks through queued signals,
+so the submitting thread only ever handles one chunk at a time:
+
+    executor = AsyncQueryExecutor(ConnectionPool("big.db", pragmas=READ_PRAGMAS))
+    handle = executor.submit("SELECT name, salary FROM employees WHERE salary > ?",
+                             [10000], chunk_size=2000)
+    handle.rows.connect(model.append_rows)       # list of tuples, in the GUI thread
+    handle.finished.connect(lambda total: ...)
+    handle.failed.connect(lambda error: ...)
+    ...
+    handle.cancel()
+
+Backpressure: a worker keeps at most max_pending chunks in flight; it
+waits until the receiving thread has handled one before fetching more
+rows, so a slow consumer never piles up a whole result set in queued
+events.
+
+Cancellation takes effect at the next chunk (or before the query starts,
+if it is still waiting for a thread). QtSql has no way to interrupt a
+statement that has not returned its first row yet.
+
+Signals are delivered by the submitting thread's event loop; console
+code without app.exec() can use handle.wait().
+"""
+
+import threading
+import time
+
+from PySide6.QtCore import QEventLoop, QObject, QRunnable, QThreadPool, QTimer, Qt, Signal, Slot
+from PySide6.QtSql import QSqlQuery
+
+
+CHUNK_SIZE = 1000
+MAX_PENDING = 4
+
+PENDING, RUNNING, FINISHED, FAILED, CANCELLED = "pending", "running", "finished", "failed", "cancelled"
+
+
+class QueryHandle(QObject):
+    """One submitted query: its signals, state and cancellation."""
+
+    columns = Signal(list)      # field names, before the first chunk
+    rows = Signal(list)         # chunk of row tuples
+    finished = Signal(int)      # total rows delivered
+    failed = Signal(str)        # error text
+    cancelled = Signal()
+
+    # worker thread -> handle's thread
+    _columns_ready = Signal(list)
+    _chunk_ready = Signal(list)
+    _ended = Signal(str, object)
+
+    def __init__(self, sql, bindings, chunk_size, max_pending, parent=None):
+        super().__init__(parent)
+        self.sql = sql
+        self.bindings = bindings
+        self.chunk_size = chunk_size
+        self.state = PENDING
+        self.delivered = 0
+        self.seconds = 0.0
+        self.error = ""
+        self._cancel = threading.Event()
+        self._slots = threading.Semaphore(max_pending)
+        self._started = time.perf_counter()
+        self._task = None
+        self._thread_pool = None
+        self._columns_ready.connect(self.columns, Qt.QueuedConnection)
+        self._chunk_ready.connect(self._deliver, Qt.QueuedConnection)
+        self._ended.connect(self._end, Qt.QueuedConnection)
+
+    def is_done(self) -> bool:
+        return self.state in (FINISHED, FAILED, CANCELLED)
+
+    def cancel(self):
+        """Stop the query; emits cancelled unless it has already ended."""
+        if self.is_done():
+            return
+        self._cancel.set()
+        if self._thread_pool is not None and self._thread_pool.tryTake(self._task):
+            self._end(CANCELLED, None)  # never started
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Run a local event loop until the query has ended; False on timeout."""
+        if self.is_done():
+            return True
+        loop = QEventLoop()
+        for signal in (self.finished, self.failed, self.cancelled):
+            signal.connect(loop.quit)
+        if timeout_ms >= 0:
+            QTimer.singleShot(timeout_ms, loop.quit)
+        loop.exec()
+        return self.is_done()
+
+    # === Called by the worker ===
+
+    def _send(self, chunk) -> bool:
+        """Queue a chunk once a slot is free; False if cancelled meanwhile."""
+        while not self._slots.acquire(timeout=0.05):
+            if self._cancel.is_set():
+                return False
+        if self._cancel.is_set():
+            return False
+        self._chunk_ready.emit(chunk)
+        return True
+
+    # === In the handle's thread ===
+
+    @Slot(list)
+    def _deliver(self, chunk):
+        self._slots.release()
+        if self.is_done() or self._cancel.is_set():
+            return
+        self.delivered += len(chunk)
+        self.rows.emit(chunk)
+
+    @Slot(str, object)
+    def _end(self, state, error):
+        if self.is_done():
+            return
+        self.state = CANCELLED if self._cancel.is_set() else state
+        self.seconds = time.perf_counter() - self._started
+        if self.state == FINISHED:
+            self.finished.emit(self.delivered)
+        elif self.state == FAILED:
+            self.error = error
+            self.failed.emit(error)
+        else:
+            self.cancelled.emit()
+
+
+class _QueryTask(QRunnable):
+    """Runs one query on a pool thread and streams its rows."""
+
+    def __init__(self, pool, handle: QueryHandle):
+        super().__init__()
+        self.setAutoDelete(False)  # the handle keeps it for tryTake()
+        self.pool = pool
+        self.handle = handle
+
+    def run(self):
+        handle = self.handle
+        if handle._cancel.is_set():
+            handle._ended.emit(CANCELLED, None)
+            return
+        handle.state = RUNNING
+        try:
+            error = self._stream(handle)
+        except Exception as e:  # e.g. the pool cannot open a connection
+            error = str(e)
+        handle._ended.emit(FAILED if error else FINISHED, error)
+
+    def _stream(self, handle) -> str:
+        with self.pool.connection() as db:
+            query = QSqlQuery(db)
+            query.setForwardOnly(True)
+            if not query.prepare(handle.sql):
+                return query.lastError().text()
+            bindings = handle.bindings
+            if isinstance(bindings, dict):
+                for name, value in bindings.items():
+                    query.bindValue(name if name.startswith(":") else ":" + name, value)
+            else:
+                for i, value in enumerate(bindings):
+                    query.bindValue(i, value)
+            if not query.exec():
+                return query.lastError().text()
+
+            record = query.record()
+            fields = range(record.count())
+            handle._columns_ready.emit([record.fieldName(i) for i in fields])
+            value = query.value
+            size = handle.chunk_size
+            chunk = []
+            while query.next():
+                chunk.append(tuple([value(i) for i in fields]))
+                if len(chunk) >= size:
+                    if not handle._send(chunk):
+                        break
+                    chunk = []
+            else:
+                # next() also returns False when fetching a row fails
+                error = query.lastError()
+                if error.isValid():
+                    query.finish()
+                    return error.text()
+                if chunk:
+                    handle._send(chunk)
+            query.finish()
+        return ""
+
+
+class AsyncQueryExecutor(QObject):
+    """Runs queries on pooled worker connections."""
+
+    def __init__(self, pool, max_threads: int = 2, chunk_size: int = CHUNK_SIZE,
+                 max_pending: int = MAX_PENDING, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self._handles = set()
+
+    def submit(self, sql: str, bindings=(), chunk_size: int = None) -> QueryHandle:
+        """Queue a query; bindings are positional values or a dict of :names."""
+        handle = QueryHandle(sql, bindings, chunk_size or self.chunk_size, self.max_pending)
+        task = _QueryTask(self.pool, handle)
+        handle._task = task
+        handle._thread_pool = self.thread_pool
+        for signal in (handle.finished, handle.failed, handle.cancelled):
+            signal.connect(lambda *args, h=handle: self._handles.discard(h))
+        self._handles.add(handle)
+        self.thread_pool.start(task)
+        return handle
+
+    def active(self):
+        """Handles that have not ended yet."""
+        return list(self._handles)
+
+    def cancel_all(self):
+        for handle in list(self._handles):
+            handle.cancel()
+
+    def shutdown(self):
+        """Cancel everything, wait for the workers and close their connections."""
+        self.cancel_all()
+        self.thread_pool.waitForDone()
+        self.pool.close_all()
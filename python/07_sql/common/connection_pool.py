@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-thread QSqlDatabase connections
+
+A QSqlDatabase connection may only be used by the thread that opened it,
+so the default connection of QSqlDatabase.addDatabase("QSQLITE") is of no
+use to QThreadPool workers. ConnectionPool gives every thread its own
+named connection (addDatabase(driver, name)), kept per thread id and
+reused for every later task the thread runs. (PySide6 has no
+QThreadStorage, and threading.local does not work here: PySide gives each
+QRunnable.run() call on a pool thread a fresh Python thread state, so the
+local data would be gone by the next task.)
+
+    pool = ConnectionPool("big.db", pragmas=READ_PRAGMAS)
+
+    class Report(QRunnable):
+        def run(self):
+            with pool.connection() as db:       # this thread's connection
+                query = QSqlQuery(db)
+                ...
+
+Every new connection runs the pool's PRAGMA profile. With WAL (see
+DEFAULT_PRAGMAS) readers don't block each other or the writer, so workers
+can read in parallel.
+
+A connection is only ever closed by the thread that owns it:
+- when that thread finishes (QThreadPool lets idle threads expire after
+  30 s and waitForDone() ends them), from its QThread.finished signal
+- by cleanup_idle(), which the pool also calls on its own every
+  idle_timeout seconds: it closes the caller's own connection if it has
+  been unused for idle_timeout seconds, and marks idle connections of
+  other threads stale; the owner closes a stale connection and opens a
+  new one on its next connection()
+close_all() is cleanup_idle(0), e.g. for the main thread's connection
+at the end. Statement caches of pooled connections (statement_cache(db))
+go with them.
+
+Thread ids are reused after a thread exits, so every entry is also
+checked against a tag on the owning QThread: a new thread never picks up
+a dead thread's connection.
+"""
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from PySide6.QtCore import QObject, QThread, Qt, SIGNAL, SLOT, Slot
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+from statement_cache import discard_cache
+
+
+DEFAULT_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-16000"),       # 16 MB page cache per connection
+)
+READ_PRAGMAS = DEFAULT_PRAGMAS + (
+    ("query_only", "ON"),
+    ("mmap_size", "268435456"),     # 256 MB memory-mapped reads
+)
+IDLE_TIMEOUT = 60.0
+
+_pool_ids = itertools.count(1)
+
+
+class _Entry:
+    """One named connection and the thread it belongs to."""
+
+    __slots__ = ("name", "thread_id", "db", "in_use", "last_used", "stale", "exit_watch")
+
+    def __init__(self, name, db):
+        self.name = name
+        self.thread_id = threading.get_ident()
+        self.db = db
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        self.stale = False
+        self.exit_watch = None
+
+
+class _ThreadExit(QObject):
+    """Retires a connection from its own thread when that thread finishes."""
+
+    def __init__(self, pool, entry):
+        super().__init__()
+        self.pool = pool
+        self.entry = entry
+        # String-based: connecting a Python callable from a worker thread
+        # makes PySide create its receiver as a child of the application
+        QObject.connect(QThread.currentThread(), SIGNAL("finished()"),
+                        self, SLOT("thread_finished()"), Qt.DirectConnection)
+
+    @Slot()
+    def thread_finished(self):
+        self.pool._retire(self.entry)
+
+
+class ConnectionPool:
+    """Thread-affine named connections to one database."""
+
+    def __init__(self, database_name: str, driver: str = "QSQLITE",
+                 pragmas=DEFAULT_PRAGMAS, connect_options: str = "",
+                 idle_timeout: float = IDLE_TIMEOUT, name: str = ""):
+        self.database_name = database_name
+        self.driver = driver
+        self.pragmas = tuple(pragmas)
+        self.connect_options = connect_options
+        self.idle_timeout = idle_timeout
+        self.name = name or f"pool{next(_pool_ids)}"
+        self._lock = threading.Lock()
+        self._entries = {}  # thread id -> _Entry
+        self._tag = f"connectionPool.{self.name}"  # QThread property: name of its entry
+        self._serial = itertools.count(1)
+        self._last_cleanup = time.monotonic()
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+
+    # === Connections ===
+
+    @contextmanager
+    def connection(self):
+        """The calling thread's connection, opened on first use."""
+        entry = self._acquire()
+        try:
+            yield entry.db
+        finally:
+            self._release(entry)
+
+    def _acquire(self) -> _Entry:
+        retired = None
+        with self._lock:
+            entry = self._entries.get(threading.get_ident())
+            if entry is not None:
+                if self._owns(entry) and not entry.stale:
+                    entry.in_use += 1
+                    self.reused += 1
+                    return entry
+                # Marked stale by another thread, or left by a dead thread
+                # whose id this thread inherited: nobody else can use it
+                del self._entries[entry.thread_id]
+                retired = entry
+        if retired is not None:
+            self._close(retired)
+        return self._open()
+
+    def _owns(self, entry: _Entry) -> bool:
+        """True if entry was opened by the calling thread."""
+        return (entry.thread_id == threading.get_ident()
+                and QThread.currentThread().property(self._tag) == entry.name)
+
+    def _release(self, entry: _Entry):
+        now = time.monotonic()
+        with self._lock:
+            entry.in_use -= 1
+            entry.last_used = now
+        if now - self._last_cleanup > self.idle_timeout:
+            self.cleanup_idle()
+
+    def _open(self) -> _Entry:
+        name = f"{self.name}-{next(self._serial)}"
+        db = QSqlDatabase.addDatabase(self.driver, name)
+        db.setDatabaseName(self.database_name)
+        if self.connect_options:
+            db.setConnectOptions(self.connect_options)
+        if not db.open():
+            error = db.lastError().text()
+            del db
+            QSqlDatabase.removeDatabase(name)
+            raise RuntimeError(f"Cannot open {self.database_name}: {error}")
+        query = QSqlQuery(db)
+        for pragma, value in self.pragmas:
+            query.exec(f"PRAGMA {pragma}={value}")
+        query.finish()
+
+        entry = _Entry(name, db)
+        entry.in_use = 1
+        QThread.currentThread().setProperty(self._tag, name)
+        entry.exit_watch = _ThreadExit(self, entry)
+        with self._lock:
+            self._entries[entry.thread_id] = entry
+            self.opened += 1
+        return entry
+
+    # === Cleanup ===
+
+    def cleanup_idle(self, max_idle: float = None) -> int:
+        """Retire connections unused for max_idle (default idle_timeout) seconds.
+
+        The caller's own connection is closed right away; those of other
+        threads are marked stale and closed by their owners. Returns the
+        number of connections closed or marked.
+        """
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        now = time.monotonic()
+        own = None
+        with self._lock:
+            self._last_cleanup = now
+            idle = [entry for entry in self._entries.values()
+                    if entry.in_use == 0 and now - entry.last_used >= max_idle]
+            for entry in idle:
+                if self._owns(entry):
+                    own = self._entries.pop(entry.thread_id)
+                else:
+                    entry.stale = True
+        if own is not None:
+            self._close(own)
+        return len(idle)
+
+    def close_all(self) -> int:
+        """Close the caller's connection and mark all other idle ones stale.
+
+        Worker connections are closed by their threads, at the latest when
+        they finish (e.g. in QThreadPool.waitForDone()).
+        """
+        return self.cleanup_idle(0.0)
+
+    def _retire(self, entry: _Entry):
+        """The owning thread finished: close its connection (in that thread)."""
+        with self._lock:
+            if self._entries.get(entry.thread_id) is entry:
+                del self._entries[entry.thread_id]
+        self._close(entry)
+
+    def _close(self, entry: _Entry):
+        if entry.db is None:
+            return  # already closed
+        discard_cache(entry.name)  # its cached queries hold the connection
+        db, entry.db = entry.db, None
+        db.close()
+        del db  # removeDatabase() warns while a QSqlDatabase handle is alive
+        QSqlDatabase.removeDatabase(entry.name)
+        with self._lock:
+            self.closed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "open": len(self._entries),
+                "in_use": sum(1 for entry in self._entries.values() if entry.in_use),
+                "stale": sum(1 for entry in self._entries.values() if entry.stale),
+                "opened": self.opened,
+                "reused": self.reused,
+                "closed": self.closed,
+            }
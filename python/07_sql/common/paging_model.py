@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Read-only table model that pages through huge tables
+
+QSqlQueryModel fetches rows in order (fetchMore) and keeps every fetched
+row as a QSqlRecord, so looking at row 5,000,000 first loads and keeps
+the 4,999,999 rows before it. KeysetTableModel instead loads fixed-size
+pages on demand and forgets them again:
+
+    model = KeysetTableModel(db, "employees", ["name", "department", "salary"])
+    view.setModel(model)
+    view.verticalScrollBar().valueChanged.connect(
+        lambda: model.set_viewport(view.rowAt(0), view.rowAt(view.viewport().height())))
+
+- Keyset pagination: a page is read with
+  `WHERE key > <last key of the previous page> ORDER BY key LIMIT n`,
+  which SQLite answers from the key's index no matter how deep the page
+  is. The last key of each page is remembered, so scrolling on is always
+  a keyset query; a jump to an unvisited page first locates its start
+  with one OFFSET count from the nearest page already known.
+- LRU page cache bounded by max_bytes (and max_pages); evicted pages are
+  simply read again when needed.
+- Compact pages: each column is stored as one array("q") / array("d")
+  when its values allow it, otherwise as a plain list.
+- set_viewport(first, last) loads the visible pages plus prefetch_pages
+  on either side, so the next scroll step rarely waits for SQL.
+
+rowCount() comes from one COUNT(*) at reset; call refresh() after the
+table changes. key must be a unique, indexed column (e.g. the INTEGER
+PRIMARY KEY).
+"""
+
+import sys
+from array import array
+from collections import OrderedDict
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+
+PAGE_SIZE = 500
+MAX_BYTES = 32 * 1024 * 1024
+MAX_PAGES = 1000
+PREFETCH_PAGES = 1
+
+
+class _Page:
+    """Rows of one page, stored column by column."""
+
+    __slots__ = ("columns", "count", "last_key", "nbytes")
+
+    def __init__(self, columns, count, last_key):
+        self.columns = columns
+        self.count = count
+        self.last_key = last_key
+        self.nbytes = sum(_column_bytes(column) for column in columns)
+
+
+def _column_bytes(column) -> int:
+    if isinstance(column, array):
+        return sys.getsizeof(column)
+    return sys.getsizeof(column) + sum(sys.getsizeof(value) for value in column)
+
+
+def _compact(values, typecode):
+    """values as array(typecode) if they all fit, else the list itself."""
+    if typecode is None:
+        return values
+    try:
+        return array(typecode, values)
+    except (TypeError, OverflowError):
+        return values
+
+
+class KeysetTableModel(QAbstractTableModel):
+    """Read-only model over one table, loaded page by page."""
+
+    def __init__(self, db: QSqlDatabase, table: str, columns, key: str = "id",
+                 where: str = "", bindings=(), page_size: int = PAGE_SIZE,
+                 max_bytes: int = MAX_BYTES, max_pages: int = MAX_PAGES,
+                 prefetch_pages: int = PREFETCH_PAGES, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.table = table
+        self.key = key
+        self.columns = list(columns)
+        self.where = where
+        self.bindings = list(bindings)
+        self.page_size = page_size
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.prefetch_pages = prefetch_pages
+        self.headers = list(self.columns)
+
+        self._rows = 0
+        self._pages = OrderedDict()   # page number -> _Page, least recently used first
+        self._after = {0: None}       # page number -> last key of the previous page
+        self._typecodes = None        # per column: "q", "d" or None (list)
+        self._bytes = 0
+        self._current = (-1, None)    # last page used by data()
+        self._queries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.locates = 0
+        self.refresh()
+
+    # === SQL ===
+
+    def _condition(self, keyset: bool) -> str:
+        clauses = [f"{self.key} > ?"] if keyset else []
+        if self.where:
+            clauses.append(f"({self.where})")
+        return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+    def _query(self, name: str, sql: str) -> QSqlQuery:
+        query = self._queries.get(name)
+        if query is None:
+            query = QSqlQuery(self.db)
+            query.setForwardOnly(True)
+            if not query.prepare(sql):
+                raise ValueError(f"Cannot prepare page query: {query.lastError().text()}")
+            self._queries[name] = query
+        return query
+
+    def _exec(self, query: QSqlQuery, leading=(), trailing=()) -> bool:
+        """Bind leading values, the where bindings, then trailing values."""
+        for i, value in enumerate([*leading, *self.bindings, *trailing]):
+            query.bindValue(i, value)
+        if not query.exec():
+            print(f"Error reading {self.table}: {query.lastError().text()}")
+            return False
+        return True
+
+    def refresh(self):
+        """Re-count the rows and drop every cached page."""
+        self.beginResetModel()
+        for query in self._queries.values():
+            query.finish()
+        self._queries.clear()
+        self._pages.clear()
+        self._after = {0: None}
+        self._bytes = 0
+        self._current = (-1, None)
+        query = QSqlQuery(self.db)
+        query.prepare(f"SELECT COUNT(*) FROM {self.table}{self._condition(False)}")
+        self._rows = query.value(0) if self._exec(query) and query.next() else 0
+        query.finish()
+        self.endResetModel()
+
+    # === Pages ===
+
+    def _page(self, number: int) -> _Page:
+        page = self._pages.get(number)
+        if page is not None:
+            self.hits += 1
+            self._pages.move_to_end(number)
+            return page
+        self.misses += 1
+        page = self._load(number)
+        self._pages[number] = page
+        self._bytes += page.nbytes
+        self._evict(keep=number)
+        return page
+
+    def _load(self, number: int) -> _Page:
+        after = self._locate(number)
+        if number == 0:
+            query = self._query("first", f"SELECT {self.key}, {', '.join(self.columns)} "
+                                         f"FROM {self.table}{self._condition(False)} "
+                                         f"ORDER BY {self.key} LIMIT {self.page_size}")
+            ok = self._exec(query)
+        else:
+            query = self._query("next", f"SELECT {self.key}, {', '.join(self.columns)} "
+                                        f"FROM {self.table}{self._condition(True)} "
+                                        f"ORDER BY {self.key} LIMIT {self.page_size}")
+            ok = after is not None and self._exec(query, (after,))
+
+        width = len(self.columns) + 1
+        values = [[] for _ in range(width)]
+        appends = [column.append for column in values]
+        fields = list(zip(range(width), appends))
+        value = query.value
+        while ok and query.next():
+            for i, append in fields:
+                append(value(i))
+        query.finish()
+
+        count = len(values[0])
+        last_key = values[0][-1] if count else after
+        if count == self.page_size:
+            self._after[number + 1] = last_key
+        if self._typecodes is None and count:
+            self._typecodes = [_typecode(column) for column in values]
+        typecodes = self._typecodes or [None] * width
+        columns = [_compact(column, typecode) for column, typecode in zip(values, typecodes)]
+        return _Page(columns, count, last_key)
+
+    def _locate(self, number: int):
+        """Last key before page number (None for the first page)."""
+        if number in self._after:
+            return self._after[number]
+        # Nearest known page before it, then skip the rows in between in SQL
+        known = max(n for n in self._after if n < number)
+        skip = (number - known) * self.page_size - 1
+        start = self._after[known]
+        self.locates += 1
+        if start is None:
+            query = self._query("locate-first", f"SELECT {self.key} FROM {self.table}"
+                                                f"{self._condition(False)} ORDER BY {self.key} "
+                                                f"LIMIT 1 OFFSET ?")
+            ok = self._exec(query, trailing=(skip,))
+        else:
+            query = self._query("locate-next", f"SELECT {self.key} FROM {self.table}"
+                                               f"{self._condition(True)} ORDER BY {self.key} "
+                                               f"LIMIT 1 OFFSET ?")
+            ok = self._exec(query, (start,), (skip,))
+        after = query.value(0) if ok and query.next() else None
+        query.finish()
+        self._after[number] = after
+        return after
+
+    def _evict(self, keep: int):
+        while self._pages and (self._bytes > self.max_bytes or len(self._pages) > self.max_pages):
+            number = next(iter(self._pages))
+            if number == keep:
+                break
+            page = self._pages.pop(number)
+            self._bytes -= page.nbytes
+            self.evictions += 1
+            if self._current[1] is page:
+                self._current = (-1, None)
+
+    def set_viewport(self, first_row: int, last_row: int):
+        """Load the pages of the visible rows plus prefetch_pages around them."""
+        if self._rows == 0:
+            return
+        first_row = max(0, first_row)
+        last_row = min(self._rows - 1, max(first_row, last_row))
+        last_page = (self._rows - 1) // self.page_size
+        first = max(0, first_row // self.page_size - self.prefetch_pages)
+        last = min(last_page, last_row // self.page_size + self.prefetch_pages)
+        # Visible pages last, so they are the most recently used
+        visible = range(first_row // self.page_size, last_row // self.page_size + 1)
+        for number in [n for n in range(first, last + 1) if n not in visible] + list(visible):
+            self._page(number)
+
+    def cache_stats(self) -> dict:
+        return {
+            "rows": self._rows,
+            "pages": len(self._pages),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "locates": self.locates,
+        }
+
+    # === QAbstractTableModel ===
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole) or not index.isValid():
+            return None
+        row = index.row()
+        number = row // self.page_size
+        current_number, page = self._current
+        if number != current_number:
+            page = self._page(number)
+            self._current = (number, page)
+        offset = row - number * self.page_size
+        if offset >= page.count:
+            return None
+        return page.columns[index.column() + 1][offset]
+
+    def row_key(self, row: int):
+        """Key value of a row."""
+        page = self._page(row // self.page_size)
+        return page.columns[0][row % self.page_size]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal and 0 <= section < len(self.headers):
+            return self.headers[section]
+        if orientation == Qt.Vertical:
+            return section + 1
+        return None
+
+
+def _typecode(values):
+    if all(type(value) is int for value in values):
+        return "q"
+    if all(type(value) in (int, float) for value in values):
+        return "d"
+    return None
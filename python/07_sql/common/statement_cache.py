@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prepared statement cache
+
+Every query.prepare(sql) makes SQLite parse and plan the statement again,
+even when the same parameterized lookup runs thousands of times.
+StatementCache keeps the prepared QSqlQuery objects of one connection in
+an LRU keyed by SQL text, so a hot lookup only binds and executes:
+
+    statements = statement_cache(db)              # one cache per connection
+    query = statements.prepare("SELECT name FROM employees WHERE id = ?")
+    query.bindValue(0, employee_id)
+    query.exec()
+
+    query = statements.exec("UPDATE employees SET salary = ? WHERE id = ?", [15000, 2])
+
+A cached query is shared: read its rows before preparing the same SQL
+again (prepare() finishes a query that is still active).
+
+Schema changes make prepared statements stale, so the cache is dropped
+- when DDL (CREATE / DROP / ALTER ...) goes through prepare() or exec()
+- when PRAGMA schema_version has changed; it is checked at most every
+  schema_check_interval seconds, which also catches changes made by other
+  connections or processes
+
+stats() reports hits, misses, evictions and invalidations.
+"""
+
+import time
+from collections import OrderedDict
+
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+
+CAPACITY = 64
+SCHEMA_CHECK_INTERVAL = 1.0
+DDL_KEYWORDS = ("CREATE", "DROP", "ALTER", "REINDEX", "VACUUM", "ATTACH", "DETACH")
+
+
+class StatementCache:
+    """LRU of prepared QSqlQuery objects for one connection."""
+
+    def __init__(self, db: QSqlDatabase, capacity: int = CAPACITY,
+                 schema_check_interval: float = SCHEMA_CHECK_INTERVAL):
+        self.db = db
+        self.capacity = capacity
+        self.schema_check_interval = schema_check_interval
+        self._queries = OrderedDict()  # sql -> QSqlQuery, least recently used first
+        self._schema_query = None
+        self._schema_version = None
+        self._checked = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def prepare(self, sql: str) -> QSqlQuery:
+        """Prepared query for sql, from the cache when possible.
+
+        Returns a query whose lastError() is set if prepare failed; such a
+        query is not cached.
+        """
+        if _is_ddl(sql):
+            self.invalidate()
+            query = QSqlQuery(self.db)
+            query.prepare(sql)
+            return query
+        self._check_schema()
+        query = self._queries.get(sql)
+        if query is not None:
+            self.hits += 1
+            self._queries.move_to_end(sql)
+            if query.isActive():
+                query.finish()
+            return query
+
+        self.misses += 1
+        query = QSqlQuery(self.db)
+        if not query.prepare(sql):
+            return query
+        self._queries[sql] = query
+        if len(self._queries) > self.capacity:
+            self._queries.popitem(last=False)
+            self.evictions += 1
+        return query
+
+    def exec(self, sql: str, bindings=()) -> QSqlQuery:
+        """Prepare (cached), bind positional values or a dict of :names, and execute.
+
+        Check the returned query's lastError() / isActive() for failures.
+        """
+        query = self.prepare(sql)
+        if query.lastError().isValid():
+            return query
+        if isinstance(bindings, dict):
+            for name, value in bindings.items():
+                query.bindValue(name if name.startswith(":") else ":" + name, value)
+        else:
+            for i, value in enumerate(bindings):
+                query.bindValue(i, value)
+        query.exec()
+        return query
+
+    # === Invalidation ===
+
+    def invalidate(self):
+        """Drop every cached statement (the next prepare() re-parses)."""
+        if self._queries:
+            self.invalidations += 1
+        for query in self._queries.values():
+            query.finish()
+        self._queries.clear()
+        self._schema_version = None
+
+    def _check_schema(self):
+        now = time.monotonic()
+        if now - self._checked < self.schema_check_interval:
+            return
+        self._checked = now
+        if self._schema_query is None:
+            self._schema_query = QSqlQuery(self.db)
+            self._schema_query.prepare("PRAGMA schema_version")
+        query = self._schema_query
+        version = query.value(0) if query.exec() and query.next() else None
+        query.finish()
+        if self._schema_version is not None and version != self._schema_version:
+            self.invalidate()
+        self._schema_version = version
+
+    def clear(self):
+        """Release all queries, e.g. before the connection is removed."""
+        self.invalidate()
+        self._schema_query = None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._queries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def _is_ddl(sql: str) -> bool:
+    words = sql.split(None, 1)
+    return bool(words) and words[0].upper() in DDL_KEYWORDS
+
+
+_caches = {}  # connection name -> StatementCache
+
+
+def statement_cache(db: QSqlDatabase = None, **options) -> StatementCache:
+    """The cache of a connection (default: the default connection)."""
+    db = db if db is not None else QSqlDatabase.database()
+    name = db.connectionName()
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches[name] = StatementCache(db, **options)
+    return cache
+
+
+def discard_cache(connection_name: str):
+    """Forget a connection's cache; call before QSqlDatabase.removeDatabase()."""
+    cache = _caches.pop(connection_name, None)
+    if cache is not None:
+        cache.clear()
+        cache.db = None
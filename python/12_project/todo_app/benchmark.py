@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Todo core benchmark suite
+
+Runs the headless TodoCore (no display needed) against every storage
+backend at several list sizes and prints one JSON document:
+
+    python3 benchmark.py                          # 1k, 100k, 1M x all backends
+    python3 benchmark.py --sizes 1000,100000 --backends json,sqlite -o bench.json
+
+Each (backend, size) pair runs in two fresh processes, so peak RSS is
+per scenario and loading starts cold:
+- "work": fill the store with size tasks (bulk append + save), then
+  measure single adds, toggles and filter switches
+- "load": open the saved data and load every task
+
+Metrics:
+- populate_s / save_s:   bulk append of size tasks / flushing them to disk
+- add_per_s:             TodoCore.add_task() calls per second (undoable adds)
+- toggle_us:             latency of single toggles (median, p95, max)
+- filter_ms:             time of each filter switch (mode, priority, tag,
+                         first search incl. index build, warm search)
+- load_s:                TodoCore.load() of the whole list in a new process
+- peak_rss_mb:           peak resident set size of the process
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from PySide6.QtCore import QCoreApplication, qVersion
+from PySide6.QtCore import __version__ as pyside_version
+
+from core import TodoCore
+from filtering import FilterMode
+from model import Task
+from storage import STORAGE_BACKENDS, create_store
+
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+BENCHMARK_FORMAT_VERSION = 1
+ADD_COUNT = 1000
+TOGGLE_COUNT = 1000
+SEED = 1234
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (-1 if unknown)."""
+    if resource is None:
+        return -1.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024  # kilobytes on Linux
+    return round(peak / (1 << 20), 1)
+
+
+def generate_tasks(count: int):
+    """Deterministic tasks with a mix of states, priorities and tags."""
+    words = ("report", "review", "email", "invoice", "meeting", "deploy", "design", "call")
+    for i in range(count):
+        yield Task(f"{words[i % len(words)]} {i}", i % 3 == 0, i % 3,
+                   f"tag{i % 20}" if i % 4 else "", "2024-01-01T00:00:00")
+
+
+def _elapsed(start: float) -> float:
+    return round(time.perf_counter() - start, 4)
+
+
+def _percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _open_core(backend: str, data_dir: str):
+    return TodoCore(create_store(backend, data_dir, save_delay_ms=0))
+
+
+def run_work(backend: str, size: int, data_dir: str) -> dict:
+    """Fill a store, then time adds, toggles and filter switches."""
+    core = _open_core(backend, data_dir)
+    core.load()
+    result = {}
+
+    start = time.perf_counter()
+    core.model.append_tasks(generate_tasks(size))
+    result["populate_s"] = _elapsed(start)
+    start = time.perf_counter()
+    core.flush()
+    result["save_s"] = _elapsed(start)
+
+    adds = min(ADD_COUNT, size)
+    start = time.perf_counter()
+    for i in range(adds):
+        core.add_task(f"added {i}", "High", "bench")
+    result["add_per_s"] = round(adds / max(time.perf_counter() - start, 1e-9))
+
+    rng = random.Random(SEED)
+    rows = core.model.rowCount()
+    latencies = []
+    for _ in range(min(TOGGLE_COUNT, rows)):
+        row = rng.randrange(rows)
+        start = time.perf_counter_ns()
+        core.toggle(row)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+    result["toggle_us"] = {
+        "median": round(_percentile(latencies, 0.5), 1),
+        "p95": round(_percentile(latencies, 0.95), 1),
+        "max": round(max(latencies), 1)
+    }
+
+    tag_id = core.model.tags().index("tag7") if "tag7" in core.model.tags() else None
+    switches = (
+        ("active", {"mode": FilterMode.ACTIVE}),
+        ("done", {"mode": FilterMode.DONE}),
+        ("all", {"mode": FilterMode.ALL}),
+        ("priority_high", {"priority": 0}),
+        ("tag", {"priority": None, "tag_id": tag_id}),
+        ("search", {"tag_id": None, "search_text": "report 1"}),  # builds the index
+        ("search_warm", {"search_text": "review 2"}),
+        ("clear", {"search_text": ""}),
+    )
+    filter_ms = {}
+    for name, kwargs in switches:
+        start = time.perf_counter()
+        core.set_filter(**kwargs)
+        filter_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+        filter_ms[name + "_rows"] = core.proxy.rowCount()
+    result["filter_ms"] = filter_ms
+
+    stats = core.stats
+    result["tasks"] = {"total": stats.total, "active": stats.active, "done": stats.done}
+    start = time.perf_counter()
+    core.close()
+    result["close_s"] = _elapsed(start)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run_load(backend: str, data_dir: str) -> dict:
+    """Load the data written by run_work() in a new process."""
+    core = _open_core(backend, data_dir)
+    start = time.perf_counter()
+    core.load()
+    result = {"load_s": _elapsed(start), "loaded": core.model.rowCount()}
+    core.close()
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def _run_child(phase: str, backend: str, size: int, data_dir: str) -> dict:
+    """Run one phase in a fresh interpreter and parse its JSON output."""
+    command = [sys.executable, os.path.abspath(__file__), "--phase", phase,
+               "--backends", backend, "--sizes", str(size), "--data-dir", data_dir]
+    proc = subprocess.run(command, capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1:] or [f"exit {proc.returncode}"]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_suite(backends, sizes, log=None) -> dict:
+    """Run every (backend, size) scenario; returns the report document."""
+    results = []
+    for size in sizes:
+        for backend in backends:
+            if log:
+                log(f"{backend} {size} tasks...")
+            data_dir = tempfile.mkdtemp(prefix=f"todo-bench-{backend}-")
+            try:
+                work = _run_child("work", backend, size, data_dir)
+                load = _run_child("load", backend, size, data_dir) if "error" not in work else {}
+            finally:
+                shutil.rmtree(data_dir, ignore_errors=True)
+            results.append({
+                "backend": backend,
+                "size": size,
+                "work": work,
+                "load": load
+            })
+    return {
+        "version": BENCHMARK_FORMAT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "pyside": pyside_version,
+            "qt": qVersion(),
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+
+
+def _parse_list(text: str):
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the todo core.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated task counts")
+    parser.add_argument("--backends", default=",".join(STORAGE_BACKENDS),
+                        help="comma separated storage backends")
+    parser.add_argument("-o", "--output", help="write the JSON report to a file")
+    parser.add_argument("--phase", choices=("work", "load"), help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in _parse_list(args.sizes)]
+    backends = _parse_list(args.backends)
+    for backend in backends:
+        if backend not in STORAGE_BACKENDS:
+            parser.error(f"unknown backend: {backend}")
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    if args.phase == "work":
+        print(json.dumps(run_work(backends[0], sizes[0], args.data_dir)))
+        return 0
+    if args.phase == "load":
+        print(json.dumps(run_load(backends[0], args.data_dir)))
+        return 0
+
+    report = run_suite(backends, sizes, log=lambda text: print(text, file=sys.stderr))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless todo logic
+
+TodoCore owns everything the todo app does except drawing it: the
+TodoModel, the TodoFilterModel proxy, the undo history and the storage
+backend. It only needs a QCoreApplication, so the same code runs behind
+the window (main.py), in scripts and in the benchmark suite
+(benchmark.py) without a display.
+
+Rows are source-model rows; views map proxy rows with
+proxy.mapToSource() before calling in.
+"""
+
+from datetime import datetime
+
+from PySide6.QtCore import QObject, Signal
+
+from filtering import FilterMode, TodoFilterModel
+from history import TaskHistory
+from loader import ChunkedLoader
+from model import TodoModel
+import transfer
+
+
+class TodoCore(QObject):
+    """Todo operations on a model, a filter proxy, a history and a store."""
+
+    loadProgress = Signal(int, float)  # rows loaded, fraction (-1 if unknown)
+    loadFinished = Signal(int)         # total rows loaded
+    externalChange = Signal(int)       # tasks merged from another process
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.model = TodoModel(self)
+        self.history = TaskHistory(self.model, parent=self)
+        self.proxy = TodoFilterModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.loader = None
+        self.loading = False
+
+    @property
+    def stats(self):
+        """Live TaskStats counters of the model."""
+        return self.model.stats
+
+    # === Loading ===
+
+    def load(self, first_rows: int = None) -> bool:
+        """Load the stored tasks.
+
+        The first first_rows records (all if None) are appended right away,
+        the rest is streamed in from the event loop. The model is read-only
+        and the store detached until loadFinished. Returns True if every
+        task is loaded.
+        """
+        self.loading = True
+        self.model.read_only = True
+        self.loader = ChunkedLoader(self.model, self.store.load_iter(),
+                                    self.store.load_progress, parent=self)
+        self.loader.progress.connect(self.loadProgress)
+        self.loader.finished.connect(self._on_load_finished)
+        try:
+            exhausted = self.loader.load_now(first_rows)
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+            exhausted = True
+
+        if exhausted:
+            self._on_load_finished(self.loader.loaded)
+        else:
+            self.loader.start()
+        return exhausted
+
+    def finish_loading(self):
+        """Load all remaining tasks synchronously."""
+        if self.loading and self.loader is not None:
+            self.loader.stop()
+            self.loader.load_now()
+            self._on_load_finished(self.loader.loaded)
+
+    def _on_load_finished(self, loaded: int):
+        if not self.loading:
+            return
+        self.store.attach(self.model)
+        watcher = getattr(self.store, "watcher", None)
+        if watcher is not None:
+            watcher.merged.connect(self.externalChange)
+        self.loading = False
+        self.model.read_only = False
+        self.loadFinished.emit(loaded)
+
+    # === Operations ===
+
+    def add_task(self, text: str, priority: str = "Medium", tag: str = "",
+                 created_at: str = None) -> int:
+        """Add a task; returns its row, or -1 if the text is empty."""
+        self.finish_loading()
+        text = text.strip()
+        if not text:
+            return -1
+        if created_at is None:
+            created_at = datetime.now().isoformat()
+        return self.history.add_task(text, priority, tag.strip(), created_at)
+
+    def edit_task(self, row: int, text: str) -> bool:
+        """Replace the text of a task; empty texts are ignored."""
+        self.finish_loading()
+        text = text.strip()
+        return bool(text) and self.history.set_text(row, text)
+
+    def set_done(self, row: int, done: bool) -> bool:
+        self.finish_loading()
+        return self.history.set_done(row, done)
+
+    def toggle(self, row: int) -> bool:
+        """Flip the done state of a task."""
+        return self.set_done(row, not self.model.is_done(row))
+
+    def remove_task(self, row: int):
+        self.finish_loading()
+        self.history.remove_task(row)
+
+    def clear_completed(self) -> int:
+        """Remove all completed tasks; returns how many were removed."""
+        self.finish_loading()
+        return self.history.clear_done()
+
+    def undo(self):
+        self.finish_loading()
+        self.history.stack.undo()
+
+    def redo(self):
+        self.finish_loading()
+        self.history.stack.redo()
+
+    def set_filter(self, mode: FilterMode = None, **kwargs):
+        """Change the proxy filter (see TodoFilterModel.set_filter)."""
+        self.proxy.set_filter(mode=mode, **kwargs)
+
+    def import_file(self, path: str) -> int:
+        """Append all tasks from a JSON, NDJSON or CSV file.
+
+        The tasks are inserted in one batch and written to storage with a
+        single flush. Returns the number of imported tasks.
+        """
+        self.finish_loading()
+        count = transfer.import_tasks(self.model, path)
+        if count:
+            self.store.flush()
+        return count
+
+    def export_file(self, path: str) -> int:
+        """Write all tasks to a JSON, NDJSON or CSV file."""
+        self.finish_loading()
+        return transfer.export_tasks(self.model.snapshot(), path)
+
+    # === Persistence ===
+
+    def flush(self):
+        """Write every change so far to the store."""
+        self.store.flush()
+
+    def close(self):
+        """Flush and release the store (called on aboutToQuit)."""
+        if self.loader is not None:
+            self.loader.stop()
+        self.store.close()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Task list delegate
+
+TaskDelegate paints a row directly with QPainter instead of going through
+the style sheet item rules:
+
+    [x] Task text .......................... [High] [#tag]
+
+- text layouts are QStaticText objects kept in a small LRU cache keyed by
+  (text, available width, done), so scrolling back over rows that were
+  painted recently does no text layout at all
+- colors, pens and chip labels are created once per priority
+- rows have a fixed height (use with QListView.setUniformItemSizes)
+- clicking the check box toggles the task through the model
+"""
+
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QEvent, QPointF, QRect, QRectF, QSize
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPen, QStaticText
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from model import PRIORITY_LABELS, Priority, TodoModel, priority_color
+
+
+TEXT_CACHE_SIZE = 2048
+PADDING = 8
+CHIP_PADDING = 6
+SPACING = 6
+
+
+def _static_text(text: str) -> QStaticText:
+    static = QStaticText(text)
+    static.setTextFormat(Qt.PlainText)
+    static.setPerformanceHint(QStaticText.AggressiveCaching)
+    return static
+
+
+class TaskDelegate(QStyledItemDelegate):
+    """Paint task rows with cached text layouts."""
+
+    def __init__(self, parent=None, cache_size: int = TEXT_CACHE_SIZE):
+        super().__init__(parent)
+        self.cache_size = cache_size
+        self._texts = OrderedDict()  # (text, width, done) -> QStaticText
+        self._tag_texts = OrderedDict()  # tag -> QStaticText
+        self._font = None
+        self._done_font = None
+        self._metrics = None
+
+        self._text_pen = QPen(QColor("#111827"))
+        self._done_pen = QPen(QColor("#9ca3af"))
+        self._selected_brush = QColor("#e5edff")
+        self._tag_brush = QColor("#eef2f6")
+        self._tag_pen = QPen(QColor("#4b5563"))
+        self._chip_pens = []
+        self._chip_brushes = []
+        for label in PRIORITY_LABELS:
+            color = QColor(priority_color(label))
+            fill = QColor(color)
+            fill.setAlpha(40)
+            self._chip_pens.append(QPen(color))
+            self._chip_brushes.append(fill)
+        self._chip_texts = [_static_text(label) for label in PRIORITY_LABELS]
+
+    # === Fonts and caches ===
+
+    def _prepare_fonts(self, font):
+        """Reset the caches when the view font changes."""
+        if self._font == font:
+            return
+        self._font = QFont(font)  # option.font is only valid during the call
+        self._done_font = QFont(font)
+        self._done_font.setStrikeOut(True)
+        self._metrics = QFontMetrics(font)
+        self._texts.clear()
+        self._tag_texts.clear()
+        for static in self._chip_texts:
+            static.prepare(font=font)
+
+    def _cached(self, cache: OrderedDict, key, make):
+        static = cache.get(key)
+        if static is not None:
+            cache.move_to_end(key)
+            return static
+        static = make()
+        cache[key] = static
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return static
+
+    def _text_layout(self, text: str, width: int, done: bool) -> QStaticText:
+        def make():
+            elided = self._metrics.elidedText(text, Qt.ElideRight, width)
+            static = _static_text(elided)
+            static.prepare(font=self._done_font if done else self._font)
+            return static
+        return self._cached(self._texts, (text, width, done), make)
+
+    def _tag_layout(self, tag: str) -> QStaticText:
+        def make():
+            static = _static_text(f"#{tag}")
+            static.prepare(font=self._font)
+            return static
+        return self._cached(self._tag_texts, tag, make)
+
+    def clear_cache(self):
+        self._texts.clear()
+        self._tag_texts.clear()
+
+    # === Geometry ===
+
+    def sizeHint(self, option, index):
+        self._prepare_fonts(option.font)
+        return QSize(option.rect.width(), self._metrics.height() + 2 * PADDING)
+
+    def _check_rect(self, rect: QRect) -> QRect:
+        size = self._metrics.height()
+        return QRect(rect.left() + PADDING, rect.top() + (rect.height() - size) // 2,
+                     size, size)
+
+    # === Painting ===
+
+    def paint(self, painter, option, index):
+        self._prepare_fonts(option.font)
+        rect = option.rect
+        text = index.data(TodoModel.TextRole) or ""
+        done = bool(index.data(TodoModel.DoneRole))
+        priority = index.data(TodoModel.PriorityCodeRole)
+        if priority is None:
+            priority = Priority.MEDIUM
+        tag = index.data(TodoModel.TagRole) or ""
+
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, self._selected_brush)
+
+        # Check box
+        check = QStyleOptionButton()
+        check.rect = self._check_rect(rect)
+        check.state = QStyle.State_Enabled | (QStyle.State_On if done else QStyle.State_Off)
+        style = option.widget.style() if option.widget else None
+        if style is not None:
+            style.drawPrimitive(QStyle.PE_IndicatorCheckBox, check, painter, option.widget)
+
+        # Chips are laid out from the right edge
+        painter.setFont(self._font)
+        metrics_height = self._metrics.height()
+        chip_height = metrics_height + 4
+        chip_top = rect.top() + (rect.height() - chip_height) / 2
+        right = rect.right() - PADDING
+        if tag:
+            right = self._paint_chip(painter, self._tag_layout(tag), right, chip_top,
+                                     chip_height, self._tag_brush, self._tag_pen)
+        right = self._paint_chip(painter, self._chip_texts[priority], right, chip_top,
+                                 chip_height, self._chip_brushes[priority],
+                                 self._chip_pens[priority])
+
+        # Text, elided to the space left of the chips
+        left = check.rect.right() + SPACING + 2
+        width = max(0, int(right - SPACING - left))
+        layout = self._text_layout(text, width, done)
+        painter.setFont(self._done_font if done else self._font)
+        painter.setPen(self._done_pen if done else self._text_pen)
+        painter.drawStaticText(QPointF(left, rect.top() + (rect.height() - metrics_height) / 2),
+                               layout)
+        painter.restore()
+
+    def _paint_chip(self, painter, static: QStaticText, right: float, top: float,
+                    height: float, brush: QColor, pen: QPen) -> float:
+        """Draw a rounded label ending at right; returns its left edge."""
+        width = static.size().width() + 2 * CHIP_PADDING
+        chip = QRectF(right - width, top, width, height)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(brush)
+        painter.drawRoundedRect(chip, height / 2, height / 2)
+        painter.setPen(pen)
+        painter.drawStaticText(QPointF(chip.left() + CHIP_PADDING, top + 2), static)
+        return chip.left() - SPACING
+
+    # === Interaction ===
+
+    def editorEvent(self, event, model, option, index):
+        """Toggle the task when its check box is clicked."""
+        if not (index.flags() & Qt.ItemIsUserCheckable):
+            return False
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            self._prepare_fonts(option.font)
+            if self._check_rect(option.rect).contains(event.position().toPoint()):
+                done = bool(index.data(TodoModel.DoneRole))
+                return model.setData(index, Qt.Unchecked if done else Qt.Checked,
+                                     Qt.CheckStateRole)
+        elif event.type() == QEvent.KeyPress and event.key() == Qt.Key_Space:
+            done = bool(index.data(TodoModel.DoneRole))
+            return model.setData(index, Qt.Unchecked if done else Qt.Checked,
+                                 Qt.CheckStateRole)
+        return False
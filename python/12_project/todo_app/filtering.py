@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filter index and filtering proxy model
+
+FilterIndex keeps sorted task-id lists for every filter criterion:
+- status:   active ids, done ids
+- priority: ids per priority code
+- tag:      ids per interned tag id
+Full-text search results (see search.py) are combined with these lists.
+
+TodoModel updates the index on every mutation (toggling a task moves one
+id between the active and done lists). Ids are used instead of rows
+because rows shift when tasks are removed, while ids don't.
+
+TodoFilterModel is a proxy that shows the ids matching the current filter.
+Switching filters replaces the visible id list in one go instead of
+hiding rows one by one. A single change inserts or removes one proxy row.
+"""
+
+from array import array
+from bisect import bisect_left
+from enum import IntEnum
+
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex
+
+import search
+
+
+class FilterMode(IntEnum):
+    ALL = 0
+    ACTIVE = 1
+    DONE = 2
+
+
+def _insert_sorted(ids: array, task_id: int):
+    if not ids or ids[-1] < task_id:
+        ids.append(task_id)  # the common case: new ids are the largest
+    else:
+        ids.insert(bisect_left(ids, task_id), task_id)
+
+
+def _remove_sorted(ids: array, task_id: int):
+    pos = bisect_left(ids, task_id)
+    if pos < len(ids) and ids[pos] == task_id:
+        del ids[pos]
+
+
+def _contains(ids: array, task_id: int) -> bool:
+    pos = bisect_left(ids, task_id)
+    return pos < len(ids) and ids[pos] == task_id
+
+
+class FilterIndex:
+    """Sorted id lists per status, priority and tag."""
+
+    def __init__(self, priority_count: int = 3):
+        self.priority_count = priority_count
+        self.clear()
+
+    def clear(self):
+        self.active = array("Q")
+        self.done = array("Q")
+        self.by_priority = [array("Q") for _ in range(self.priority_count)]
+        self.by_tag = {}
+
+    def add(self, task_id: int, done: bool, priority: int, tag_id: int):
+        _insert_sorted(self.done if done else self.active, task_id)
+        _insert_sorted(self.by_priority[priority], task_id)
+        tag_ids = self.by_tag.get(tag_id)
+        if tag_ids is None:
+            tag_ids = self.by_tag[tag_id] = array("Q")
+        _insert_sorted(tag_ids, task_id)
+
+    def remove(self, task_id: int, done: bool, priority: int, tag_id: int):
+        _remove_sorted(self.done if done else self.active, task_id)
+        _remove_sorted(self.by_priority[priority], task_id)
+        tag_ids = self.by_tag.get(tag_id)
+        if tag_ids is not None:
+            _remove_sorted(tag_ids, task_id)
+
+    def set_done(self, task_id: int, done: bool):
+        """Move one id between the active and done lists."""
+        if done:
+            _remove_sorted(self.active, task_id)
+            _insert_sorted(self.done, task_id)
+        else:
+            _remove_sorted(self.done, task_id)
+            _insert_sorted(self.active, task_id)
+
+    def rebuild(self, ids, done_flags, priorities, tag_ids):
+        """Recreate all lists from the model columns (ids already sorted)."""
+        self.clear()
+        self.extend(ids, done_flags, priorities, tag_ids)
+
+    def extend(self, ids, done_flags, priorities, tag_ids):
+        """Add a sorted batch of ids larger than every indexed id."""
+        done, active = self.done.append, self.active.append
+        by_priority = [ids_.append for ids_ in self.by_priority]
+        by_tag = self.by_tag
+        for task_id, flag, priority, tag_id in zip(ids, done_flags, priorities, tag_ids):
+            (done if flag else active)(task_id)
+            by_priority[priority](task_id)
+            tag_list = by_tag.get(tag_id)
+            if tag_list is None:
+                tag_list = by_tag[tag_id] = array("Q")
+            tag_list.append(task_id)
+
+    # === Queries ===
+
+    def _lists(self, mode: FilterMode, priority: int = None, tag_id: int = None):
+        lists = []
+        if mode == FilterMode.ACTIVE:
+            lists.append(self.active)
+        elif mode == FilterMode.DONE:
+            lists.append(self.done)
+        if priority is not None:
+            lists.append(self.by_priority[priority])
+        if tag_id is not None:
+            lists.append(self.by_tag.get(tag_id, array("Q")))
+        return lists
+
+    def query(self, mode: FilterMode, priority: int = None, tag_id: int = None,
+              all_ids: array = None, extra: array = None) -> array:
+        """Sorted ids matching all given criteria.
+
+        extra is an additional sorted id list to intersect with (e.g.
+        search results). With no criteria a copy of all_ids is returned.
+        Otherwise the smallest list is scanned and checked against the others.
+        """
+        lists = self._lists(mode, priority, tag_id)
+        if extra is not None:
+            lists.append(extra)
+        if not lists:
+            return array("Q", all_ids if all_ids is not None else ())
+        lists.sort(key=len)
+        smallest, others = lists[0], lists[1:]
+        if not others:
+            return array("Q", smallest)
+        return array("Q", (task_id for task_id in smallest
+                           if all(_contains(ids, task_id) for ids in others)))
+
+    @staticmethod
+    def matches(task_id: int, done: bool, priority: int, tag_id: int,
+                mode: FilterMode, want_priority: int = None,
+                want_tag: int = None) -> bool:
+        """Check one task's fields against a filter (no lookups needed)."""
+        if mode == FilterMode.ACTIVE and done:
+            return False
+        if mode == FilterMode.DONE and not done:
+            return False
+        if want_priority is not None and priority != want_priority:
+            return False
+        if want_tag is not None and tag_id != want_tag:
+            return False
+        return True
+
+
+class TodoFilterModel(QAbstractProxyModel):
+    """Proxy showing the tasks of a TodoModel that match a filter."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mode = FilterMode.ALL
+        self.priority = None  # priority code or None
+        self.tag_id = None    # interned tag id or None
+        self.search = ""      # full-text query
+        self._terms = []
+        self._ids = array("Q")
+
+    # === Filter ===
+
+    def set_filter(self, mode: FilterMode = None, priority=..., tag_id=...,
+                   search_text: str = None):
+        """Change any of the criteria; omitted ones are kept."""
+        if mode is not None:
+            self.mode = FilterMode(mode)
+        if priority is not ...:
+            self.priority = priority
+        if tag_id is not ...:
+            self.tag_id = tag_id
+        if search_text is not None:
+            self.search = search_text
+            self._terms = search.query_terms(search_text)
+        self._rebuild()
+
+    def is_filtered(self) -> bool:
+        return (self.mode != FilterMode.ALL or self.priority is not None
+                or self.tag_id is not None or bool(self._terms))
+
+    def _rebuild(self):
+        model = self.sourceModel()
+        self.beginResetModel()
+        if model is None:
+            self._ids = array("Q")
+        else:
+            found = model.search_index().search(self.search) if self._terms else None
+            self._ids = model.filter_index.query(
+                self.mode, self.priority, self.tag_id, model.task_ids(), found)
+        self.endResetModel()
+
+    def _accepts(self, row: int) -> bool:
+        model = self.sourceModel()
+        if not model.filter_index.matches(
+                model.task_id(row), model.is_done(row), model.priority_code(row),
+                model.tag_code(row), self.mode, self.priority, self.tag_id):
+            return False
+        return search.matches(self._terms, model.text(row), model.tag(row))
+
+    # === Proxy interface ===
+
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            old.rowsInserted.disconnect(self._on_rows_inserted)
+            old.rowsAboutToBeRemoved.disconnect(self._on_rows_about_to_be_removed)
+            old.dataChanged.disconnect(self._on_data_changed)
+            old.modelReset.disconnect(self._rebuild)
+        super().setSourceModel(model)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(self._rebuild)
+        self._rebuild()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._ids)) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        model = self.sourceModel()
+        row = model.row_for_id(self._ids[proxy_index.row()])
+        return model.index(row, 0) if row >= 0 else QModelIndex()
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        pos = self._position(self.sourceModel().task_id(source_index.row()))
+        return self.createIndex(pos, 0) if pos >= 0 else QModelIndex()
+
+    def source_row(self, proxy_row: int) -> int:
+        return self.sourceModel().row_for_id(self._ids[proxy_row])
+
+    def _position(self, task_id: int) -> int:
+        pos = bisect_left(self._ids, task_id)
+        if pos < len(self._ids) and self._ids[pos] == task_id:
+            return pos
+        return -1
+
+    # === Incremental updates ===
+
+    def _insert_id(self, task_id: int):
+        pos = bisect_left(self._ids, task_id)
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._ids.insert(pos, task_id)
+        self.endInsertRows()
+
+    def _remove_at(self, pos: int):
+        self.beginRemoveRows(QModelIndex(), pos, pos)
+        del self._ids[pos]
+        self.endRemoveRows()
+
+    def _on_rows_inserted(self, parent, first: int, last: int):
+        model = self.sourceModel()
+        if not self.is_filtered():
+            accepted = model.task_ids()[first:last + 1]
+        else:
+            accepted = array("Q", (model.task_id(row) for row in range(first, last + 1)
+                                   if self._accepts(row)))
+        if not accepted:
+            return
+        if not self._ids or self._ids[-1] < accepted[0]:
+            # Appended ids are the largest: one contiguous insert at the end
+            pos = len(self._ids)
+            self.beginInsertRows(QModelIndex(), pos, pos + len(accepted) - 1)
+            self._ids.extend(accepted)
+            self.endInsertRows()
+        else:
+            for task_id in accepted:
+                self._insert_id(task_id)
+
+    def _on_rows_about_to_be_removed(self, parent, first: int, last: int):
+        model = self.sourceModel()
+        for row in range(last, first - 1, -1):
+            pos = self._position(model.task_id(row))
+            if pos >= 0:
+                self._remove_at(pos)
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        model = self.sourceModel()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            task_id = model.task_id(row)
+            pos = self._position(task_id)
+            accepted = self._accepts(row)
+            if pos >= 0 and not accepted:
+                self._remove_at(pos)
+            elif pos < 0 and accepted:
+                self._insert_id(task_id)
+            elif pos >= 0:
+                index = self.createIndex(pos, 0)
+                self.dataChanged.emit(index, index, roles)
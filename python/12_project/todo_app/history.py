@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Undo/redo history
+
+TaskHistory wraps a QUndoStack whose commands store small diffs keyed by
+task id instead of copies of the list:
+- add:    the new Task (needed to restore it on redo)
+- toggle: id and the new done flag
+- edit:   id, old text and new text
+- remove: the removed Task records (a "Clear Completed" of 20k rows is one
+          command, undone with a single TodoModel.insert_tasks() call)
+
+Ids stay valid while rows shift, so commands never hold row numbers.
+Consecutive toggles of the same task merge into one command (and drop out
+entirely when they cancel each other).
+
+The history has a memory budget: every command estimates its size, and
+when the total exceeds max_bytes the oldest commands are evicted.
+QUndoStack can only drop commands through its count limit, so eviction
+rebuilds the stack from copies of the newest commands without re-running
+them.
+"""
+
+import sys
+
+from PySide6.QtCore import QObject
+from PySide6.QtGui import QUndoCommand, QUndoStack
+
+from model import Priority, Task
+
+
+MAX_HISTORY_BYTES = 16 << 20
+MAX_COMMANDS = 10000
+TOGGLE_MERGE_ID = 1
+
+_TASK_BYTES = 120  # Task object, list slot and ints
+
+
+def _task_cost(task: Task) -> int:
+    return _TASK_BYTES + sys.getsizeof(task.text) + sys.getsizeof(task.created_at)
+
+
+class TaskCommand(QUndoCommand):
+    """Base for commands that change a TodoModel.
+
+    Subclasses must override apply() and copy().
+    """
+
+    def __init__(self, model, text: str):
+        super().__init__(text)
+        self.model = model
+        self.applied = False  # set on copies made while evicting
+
+    @property
+    def cost(self) -> int:
+        """Approximate memory held by the command, in bytes."""
+        return _TASK_BYTES
+
+    def redo(self):
+        if self.applied:
+            self.applied = False  # already reflected in the model
+            return
+        self.apply()
+
+    def apply(self):
+        """Change the model (redo)."""
+        raise NotImplementedError(f"{type(self).__name__} must override apply()")
+
+    def copy(self) -> "TaskCommand":
+        """An equal command, for rebuilding the stack when evicting."""
+        raise NotImplementedError(f"{type(self).__name__} must override copy()")
+
+    def _row(self, task_id: int) -> int:
+        return self.model.row_for_id(task_id)
+
+
+class AddCommand(TaskCommand):
+    def __init__(self, model, task: Task):
+        super().__init__(model, f"Add \"{task.text}\"")
+        self.task = task
+
+    @property
+    def cost(self) -> int:
+        return _task_cost(self.task)
+
+    def apply(self):
+        task = self.task
+        if task.id is None:
+            row = self.model.append_task(task.text, task.done, task.priority.label,
+                                         task.tag, task.created_at)
+            task.id = self.model.task_id(row)
+        elif self._row(task.id) < 0:
+            self.model.insert_tasks([task])
+
+    def undo(self):
+        row = self._row(self.task.id)
+        if row >= 0:
+            self.model.remove_task(row)
+
+    def copy(self):
+        return AddCommand(self.model, self.task)
+
+
+class ToggleCommand(TaskCommand):
+    def __init__(self, model, task_id: int, done: bool):
+        super().__init__(model, "Complete task" if done else "Reopen task")
+        self.task_id = task_id
+        self.done = done
+        self.toggles = 1
+
+    def id(self):
+        return TOGGLE_MERGE_ID
+
+    def mergeWith(self, other):
+        if not isinstance(other, ToggleCommand) or other.task_id != self.task_id:
+            return False
+        self.done = other.done
+        self.toggles += other.toggles
+        self.setText(other.text())
+        # An even number of toggles leaves the task unchanged
+        self.setObsolete(self.toggles % 2 == 0)
+        return True
+
+    def apply(self):
+        row = self._row(self.task_id)
+        if row >= 0:
+            self.model.set_done(row, self.done)
+
+    def undo(self):
+        row = self._row(self.task_id)
+        if row >= 0:
+            self.model.set_done(row, not self.done)
+
+    def copy(self):
+        command = ToggleCommand(self.model, self.task_id, self.done)
+        command.toggles = self.toggles
+        return command
+
+
+class EditCommand(TaskCommand):
+    def __init__(self, model, task_id: int, old_text: str, new_text: str):
+        super().__init__(model, "Edit task")
+        self.task_id = task_id
+        self.old_text = old_text
+        self.new_text = new_text
+
+    @property
+    def cost(self) -> int:
+        return _TASK_BYTES + sys.getsizeof(self.old_text) + sys.getsizeof(self.new_text)
+
+    def _set_text(self, text: str):
+        row = self._row(self.task_id)
+        if row >= 0:
+            self.model.set_text(row, text)
+
+    def apply(self):
+        self._set_text(self.new_text)
+
+    def undo(self):
+        self._set_text(self.old_text)
+
+    def copy(self):
+        return EditCommand(self.model, self.task_id, self.old_text, self.new_text)
+
+
+class RemoveCommand(TaskCommand):
+    """Remove tasks by id; undo puts them back in one batch."""
+
+    def __init__(self, model, tasks, text: str):
+        super().__init__(model, text)
+        self.tasks = tasks
+        self._cost = sum(_task_cost(task) for task in tasks)
+
+    @property
+    def cost(self) -> int:
+        return self._cost
+
+    def apply(self):
+        self.model.remove_ids([task.id for task in self.tasks])
+
+    def undo(self):
+        # Another process may have re-created some of the ids meanwhile
+        self.model.insert_tasks([task for task in self.tasks if self._row(task.id) < 0])
+
+    def copy(self):
+        command = RemoveCommand(self.model, self.tasks, self.text())
+        command._cost = self._cost
+        return command
+
+
+class TaskHistory(QObject):
+    """Undoable task operations on a TodoModel."""
+
+    def __init__(self, model, max_bytes: int = MAX_HISTORY_BYTES,
+                 max_commands: int = MAX_COMMANDS, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.max_bytes = max_bytes
+        self.stack = QUndoStack(self)
+        self.stack.setUndoLimit(max_commands)
+        self._cost = 0  # upper bound; recounted when over budget
+        model.history = self
+
+    # === Operations ===
+
+    def add_task(self, text: str, priority: str, tag: str, created_at: str) -> int:
+        """Add a task and return its row."""
+        task = Task(text, False, Priority.from_label(priority), tag, created_at)
+        self.push(AddCommand(self.model, task))
+        return self.model.row_for_id(task.id)
+
+    def set_done(self, row: int, done: bool) -> bool:
+        if self.model.is_done(row) == done:
+            return False
+        self.push(ToggleCommand(self.model, self.model.task_id(row), done))
+        return True
+
+    def set_text(self, row: int, text: str) -> bool:
+        old_text = self.model.text(row)
+        if old_text == text:
+            return False
+        self.push(EditCommand(self.model, self.model.task_id(row), old_text, text))
+        return True
+
+    def remove_task(self, row: int):
+        task = self.model.task(row)
+        self.push(RemoveCommand(self.model, [task], f"Remove \"{task.text}\""))
+
+    def clear_done(self) -> int:
+        tasks = self.model.done_tasks()
+        if tasks:
+            self.push(RemoveCommand(self.model, tasks, f"Clear {len(tasks)} completed"))
+        return len(tasks)
+
+    # === Stack management ===
+
+    def push(self, command: TaskCommand):
+        cost = command.cost  # the stack may delete a merged command
+        self.stack.push(command)
+        self._cost += cost
+        if self._cost > self.max_bytes:
+            self._cost = self.memory_usage()
+            if self._cost > self.max_bytes:
+                self._evict()
+
+    def commands(self):
+        return [self.stack.command(i) for i in range(self.stack.count())]
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by all commands."""
+        return sum(command.cost for command in self.commands())
+
+    def _evict(self):
+        """Keep the newest commands that fit in 3/4 of the budget (at least one)."""
+        index = self.stack.index()
+        commands = self.commands()[:index]  # drop the redo tail
+        budget = self.max_bytes * 3 // 4
+        kept, total = [], 0
+        for command in reversed(commands):
+            if kept and total + command.cost > budget:
+                break
+            kept.append(command.copy())
+            total += command.cost
+        self.stack.clear()
+        for command in reversed(kept):
+            command.applied = True
+            self.stack.push(command)
+        self._cost = total
+
+    def clear(self):
+        self.stack.clear()
+        self._cost = 0
+
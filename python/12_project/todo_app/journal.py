@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Append-only journal storage
+
+Instead of rewriting todos.json on every change, JournalStore appends one
+NDJSON record per operation to a journal segment:
+
+    {"s": 12, "op": "add", "id": 7, "text": "...", "done": false, ...}
+    {"s": 13, "op": "toggle", "id": 7, "done": true}
+    {"s": 14, "op": "edit", "id": 7, "text": "..."}
+    {"s": 15, "op": "remove", "ids": [3, 7]}
+
+Every record carries a sequence number "s". Once enough operations have
+accumulated, the store compacts:
+1. a new segment todos-<seq>.journal is started on the GUI thread
+2. a snapshot of the model is written to todos.snapshot.json (atomically,
+   on a worker thread) together with the last sequence number it contains
+3. segments that are fully covered by the snapshot are deleted
+
+load() reads the snapshot and replays only the records newer than it, so
+startup cost is bounded by the snapshot size plus the compaction threshold.
+"""
+
+import glob
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from model import Task, TaskSnapshot
+from persistence import snapshot_records, write_atomic
+from storage import TodoStore
+
+
+SNAPSHOT_VERSION = 1
+COMPACT_MIN_OPS = 1000
+
+_SEGMENT_RE = re.compile(r"todos-(\d+)\.journal$")
+
+
+def encode_snapshot(snapshot: TaskSnapshot, seq: int) -> bytes:
+    """Serialize a model snapshot with raw (undecorated) fields."""
+    return json.dumps({"version": SNAPSHOT_VERSION, "seq": seq,
+                       "tasks": snapshot_records(snapshot)}).encode("utf-8")
+
+
+class JournalStore(TodoStore):
+    """Operation log plus periodic snapshot."""
+
+    name = "journal"
+
+    def __init__(self, data_dir: str, compact_min_ops: int = COMPACT_MIN_OPS):
+        super().__init__(data_dir)
+        self.snapshot_path = os.path.join(data_dir, "todos.snapshot.json")
+        self.compact_min_ops = compact_min_ops
+        self._seq = 0
+        self._ops_since_snapshot = 0
+        self._segment = None
+        self._segment_path = ""
+        self._segment_start = 0
+        self._pending = None
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="todo-compact")
+
+    @property
+    def location(self) -> str:
+        return self.snapshot_path
+
+    # === Loading ===
+
+    def load(self):
+        tasks = {}
+        snapshot_seq = 0
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+            snapshot_seq = data.get("seq", 0)
+            for task in data.get("tasks", []):
+                tasks[task["id"]] = Task.from_dict(task)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading snapshot: {e}")
+
+        self._seq = snapshot_seq
+        for _, path in self._segments():
+            self._replay(path, snapshot_seq, tasks)
+
+        self._ops_since_snapshot = self._seq - snapshot_seq
+        # Ids only grow, so id order is also insertion order
+        return [tasks[task_id] for task_id in sorted(tasks)]
+
+    def _replay(self, path: str, after_seq: int, tasks: dict):
+        """Apply records newer than after_seq from one segment."""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write at the end of a segment after a crash
+                    break
+                seq = record.get("s", 0)
+                if seq <= after_seq:
+                    continue
+                self._seq = max(self._seq, seq)
+                self._apply(record, tasks)
+
+    @staticmethod
+    def _apply(record: dict, tasks: dict):
+        op = record.get("op")
+        if op == "add":
+            tasks[record["id"]] = Task.from_dict(record)
+        elif op == "toggle":
+            task = tasks.get(record["id"])
+            if task is not None:
+                task.done = record["done"]
+        elif op == "edit":
+            task = tasks.get(record["id"])
+            if task is not None:
+                task.text = record["text"]
+        elif op == "remove":
+            for task_id in record["ids"]:
+                tasks.pop(task_id, None)
+
+    def _segments(self):
+        """Existing journal segments as (start_seq, path), oldest first."""
+        segments = []
+        for path in glob.glob(os.path.join(self.data_dir, "todos-*.journal")):
+            match = _SEGMENT_RE.search(path)
+            if match:
+                segments.append((int(match.group(1)), path))
+        return sorted(segments)
+
+    # === Recording ===
+
+    def attach(self, model):
+        super().attach(model)
+        self._open_segment()
+
+    def task_added(self, row: int):
+        record = self.model.task(row).to_dict()
+        record["op"] = "add"
+        self._append(record)
+
+    def tasks_appended(self, first: int, last: int):
+        """Record a bulk insert with a single write."""
+        records = []
+        for row in range(first, last + 1):
+            record = self.model.task(row).to_dict()
+            record["op"] = "add"
+            records.append(record)
+        self._append_many(records)
+
+    def tasks_inserted(self, ids):
+        """Replay keys tasks by id, so restored tasks are plain adds."""
+        records = []
+        for task_id in ids:
+            record = self.model.task(self.model.row_for_id(task_id)).to_dict()
+            record["op"] = "add"
+            records.append(record)
+        self._append_many(records)
+
+    def task_changed(self, row: int, field: str):
+        task_id = self.model.task_id(row)
+        if field == "done":
+            self._append({"op": "toggle", "id": task_id,
+                          "done": self.model.is_done(row)})
+        elif field == "text":
+            self._append({"op": "edit", "id": task_id,
+                          "text": self.model.text(row)})
+
+    def tasks_removed(self, ids):
+        if ids:
+            self._append({"op": "remove", "ids": list(ids)})
+
+    def _append(self, record: dict):
+        self._append_many([record])
+
+    def _append_many(self, records):
+        lines = []
+        for record in records:
+            self._seq += 1
+            record["s"] = self._seq
+            lines.append(json.dumps(record) + "\n")
+        self._segment.write("".join(lines))
+        self._segment.flush()
+        self._ops_since_snapshot += len(lines)
+        if self._should_compact():
+            self.compact()
+
+    def _open_segment(self):
+        self._segment_start = self._seq + 1
+        self._segment_path = os.path.join(
+            self.data_dir, f"todos-{self._segment_start:012d}.journal")
+        self._segment = open(self._segment_path, 'a', encoding='utf-8')
+
+    # === Compaction ===
+
+    def _should_compact(self) -> bool:
+        threshold = max(self.compact_min_ops, self.model.rowCount() // 2)
+        return self._ops_since_snapshot >= threshold
+
+    def compact(self):
+        """Snapshot the model and drop the journal segments it covers."""
+        if self._pending is not None and not self._pending.done():
+            return  # previous compaction still running
+        seq = self._seq
+        snapshot = self.model.snapshot()
+        self._segment.close()
+        self._open_segment()
+        self._ops_since_snapshot = 0
+        self._pending = self._executor.submit(
+            self._write_snapshot, snapshot, seq, self._segment_start)
+
+    def _write_snapshot(self, snapshot: TaskSnapshot, seq: int, keep_from: int):
+        """Runs on the worker thread."""
+        try:
+            write_atomic(self.snapshot_path, encode_snapshot(snapshot, seq))
+            for start, path in self._segments():
+                if start < keep_from:
+                    os.unlink(path)
+        except Exception as e:
+            print(f"Error compacting journal: {e}")
+
+    def flush(self):
+        if self._segment is not None:
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+        if self._pending is not None:
+            self._pending.result()
+
+    def close(self):
+        if self._segment is None:
+            return
+        if self._ops_since_snapshot >= self.compact_min_ops:
+            self.compact()
+        self.flush()
+        self._segment.close()
+        self._segment = None
+        self._executor.shutdown(wait=True)
+        if self._seq < self._segment_start and os.path.getsize(self._segment_path) == 0:
+            os.unlink(self._segment_path)  # nothing was recorded this session
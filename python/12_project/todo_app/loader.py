@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming task loading
+
+- JsonArrayReader iterates the elements of a top-level JSON array (or of
+  the array under one key of a top-level object, e.g. {"version": 2,
+  "tasks": [...]}, whose other members may come before or after the
+  array) while reading the file in fixed-size chunks
+  (json.JSONDecoder.raw_decode on a sliding buffer), so nothing ever holds
+  the whole document
+- ChunkedLoader feeds records into the model from the event loop: each
+  timer tick appends as many records as fit in a small time budget with a
+  single bulk insert, keeping the UI responsive while a large file loads
+"""
+
+import codecs
+import json
+import os
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+CHUNK_SIZE = 1 << 16
+TICK_BUDGET_MS = 12
+MAX_BATCH = 5000
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+class JsonArrayReader:
+    """Iterate the elements of a top-level JSON array incrementally.
+
+    If the document is an object instead, the array under array_key is
+    iterated and the other members are collected in header: those before
+    the array right away, those after it once the last element is read.
+    is_object tells the two layouts apart as soon as iteration starts.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE,
+                 array_key: str = "tasks"):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.array_key = array_key
+        self.header = {}
+        self.is_object = None  # None until the document has been opened
+        self.bytes_read = 0
+        try:
+            self.size = os.path.getsize(path)
+        except OSError:
+            self.size = 0
+
+    def progress(self) -> float:
+        """Fraction of the file read so far (0.0 - 1.0)."""
+        if self.size == 0:
+            return 1.0
+        return min(1.0, self.bytes_read / self.size)
+
+    def __iter__(self):
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            yield from self._elements(f)
+
+    def _elements(self, f):
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        buf, pos, eof = "", 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(self.chunk_size)
+            self.bytes_read += len(chunk)
+            eof = not chunk
+            buf = buf[pos:] + text_decoder.decode(chunk, final=eof)
+            pos = 0
+
+        def skip(chars):
+            """Skip characters in chars, reading more input as needed."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        def value():
+            """Decode the value at pos, reading more input as needed."""
+            nonlocal pos
+            while True:
+                try:
+                    result, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    fill()
+                    continue
+                if not eof and (end == len(buf) or buf[end] not in _DELIMITERS):
+                    # A scalar cut at the chunk boundary ("1.5e" of "1.5e10"):
+                    # read more and decode again
+                    fill()
+                    continue
+                pos = end
+                return result
+
+        def expect(char):
+            nonlocal pos
+            skip(_WHITESPACE)
+            if pos >= len(buf) or buf[pos] != char:
+                raise ValueError(f"expected {char!r} in JSON document")
+            pos += 1
+
+        skip(_WHITESPACE)
+        if pos >= len(buf):
+            return  # empty file
+
+        def members():
+            """Collect object members into header until the array key or "}"."""
+            while True:
+                skip(_WHITESPACE + ",")
+                if pos >= len(buf) or buf[pos] == "}":
+                    return False
+                key = value()
+                expect(":")
+                skip(_WHITESPACE)
+                if key == self.array_key:
+                    return True
+                self.header[key] = value()
+
+        self.is_object = buf[pos] == "{"
+        if self.is_object:
+            pos += 1
+            if not members():
+                return  # no array in the document
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError("expected a JSON array")
+        pos += 1
+
+        while True:
+            skip(_WHITESPACE + ",")
+            if pos >= len(buf):
+                raise ValueError("unterminated JSON array")
+            if buf[pos] == "]":
+                pos += 1
+                break
+            yield value()
+        if self.is_object:
+            members()  # members after the array (e.g. "version")
+
+
+class ChunkedLoader(QObject):
+    """Append records to a model in time-boxed batches from the event loop."""
+
+    progress = Signal(int, float)  # rows loaded, fraction (-1 if unknown)
+    finished = Signal(int)         # total rows loaded
+
+    def __init__(self, model, records, progress_fn=None,
+                 budget_ms: int = TICK_BUDGET_MS, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.records = records
+        self.progress_fn = progress_fn
+        self.budget_ms = budget_ms
+        self.loaded = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._tick)
+
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def load_now(self, limit: int = None) -> bool:
+        """Synchronously append up to limit records (all if None).
+
+        Returns True if the records are exhausted.
+        """
+        batch = []
+        exhausted = False
+        try:
+            while limit is None or len(batch) < limit:
+                batch.append(next(self.records))
+        except StopIteration:
+            exhausted = True
+        self._append(batch)
+        return exhausted
+
+    def _tick(self):
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        batch = []
+        exhausted = False
+        try:
+            while len(batch) < MAX_BATCH:
+                batch.append(next(self.records))
+                if len(batch) % 64 == 0 and time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            exhausted = True
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+            exhausted = True
+
+        self._append(batch)
+        if exhausted:
+            self._timer.stop()
+            self.finished.emit(self.loaded)
+        else:
+            fraction = self.progress_fn() if self.progress_fn else -1.0
+            self.progress.emit(self.loaded, fraction)
+
+    def _append(self, batch):
+        if batch:
+            self.loaded += self.model.append_tasks(batch)
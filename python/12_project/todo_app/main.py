@@ -7,84 +7,81 @@ A feature-rich TODO application with:
 - Task management with priorities (High, Medium, Low)
 - Tags for categorization
 - Data persistence using JSON
-- Filtering (All, Active, Done)
+- Bulk import/export (JSON, NDJSON, CSV)
+- Filtering (All, Active, Done, by priority and by tag)
+- Full-text search over task text and tags
 - Statistics tracking
+- Undo/redo of every change (Ctrl+Z / Ctrl+Shift+Z)
+
+The window is a thin view over a TodoCore (see core.py), which holds the
+todo logic without any widgets. Tasks live in a TodoModel (see model.py)
+shown through a QListView via a TodoFilterModel proxy (see filtering.py);
+rows are painted by a TaskDelegate (see delegate.py).
+Changes reach the disk through a storage backend (see storage.py):
+debounced whole-file JSON writes, an append-only journal or SQLite.
+The JSON file may be shared by several running instances: writes are
+locked and changes made elsewhere are merged in by task id (see sync.py).
+Large task files are streamed in (see loader.py): the first screenful is
+shown immediately and the rest is appended from the event loop.
 """
 
 import sys
-import json
-import os
-from datetime import datetime
-from enum import IntEnum
 from pathlib import Path
 
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLineEdit, QPushButton, QListWidget, QListWidgetItem, QLabel,
-    QFrame, QComboBox, QInputDialog, QButtonGroup
+    QLineEdit, QPushButton, QListView, QLabel,
+    QFrame, QComboBox, QInputDialog, QButtonGroup, QAbstractItemView,
+    QProgressBar, QFileDialog, QMessageBox
 )
 from PySide6.QtCore import Qt, QStandardPaths
-from PySide6.QtGui import QColor
+from PySide6.QtGui import QKeySequence, QShortcut
+
+from model import PRIORITY_LABELS
+from stats import debug_stats_enabled
+from storage import create_store, storage_from_env
+from filtering import FilterMode
+from core import TodoCore
+from delegate import TaskDelegate
+import transfer
 
 
-class FilterMode(IntEnum):
-    ALL = 0
-    ACTIVE = 1
-    DONE = 2
+# Rows loaded synchronously before the window is shown
+FIRST_SCREEN_ROWS = 200
 
 
-def data_file_path() -> str:
-    """Get the path for storing todo data."""
+def data_dir_path() -> str:
+    """Get the directory for storing todo data."""
     data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
     Path(data_dir).mkdir(parents=True, exist_ok=True)
-    return os.path.join(data_dir, "todos.json")
-
-
-def priority_color(priority: str) -> str:
-    """Get color for a given priority."""
-    colors = {
-        "High": "#ef4444",
-        "Medium": "#f59e0b",
-        "Low": "#10b981"
-    }
-    return colors.get(priority, "#9ca3af")
-
-
-def update_item_label(item: QListWidgetItem):
-    """Update the display label of an item."""
-    base_text = item.data(Qt.UserRole + 3) or ""
-    priority = item.data(Qt.UserRole + 1) or "Medium"
-    tag = item.data(Qt.UserRole + 2) or ""
-    
-    suffix = f" [{priority}]"
-    if tag:
-        suffix += f" #{tag}"
-    
-    item.setText(base_text + suffix)
-    item.setForeground(QColor(priority_color(priority)))
+    return data_dir
 
 
 class TodoApp(QWidget):
     """Main Todo Application window."""
     
-    def __init__(self):
+    def __init__(self, storage: str = None, save_delay_ms: int = None):
         super().__init__()
         self.setWindowTitle("Todo App")
         self.resize(560, 680)
         
-        self.loading = True
-        self.current_filter = FilterMode.ALL
+        self._known_tag_count = 0
+        
+        self.core = TodoCore(create_store(storage or storage_from_env(),
+                                          data_dir_path(), save_delay_ms), self)
+        self.store = self.core.store
+        self.model = self.core.model
+        self.history = self.core.history
+        self.proxy = self.core.proxy
         
         self._setup_ui()
         self._setup_styles()
         self._connect_signals()
-        
         self.load_tasks()
-        self.loading = False
         
-        self.update_stats()
-        self.update_empty_state()
-        self.apply_filter()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.core.close)
     
     def _setup_ui(self):
         """Setup the user interface."""
@@ -111,7 +108,7 @@ class TodoApp(QWidget):
         self.input_field.setPlaceholderText("Add a task...")
         
         self.priority_box = QComboBox()
-        self.priority_box.addItems(["High", "Medium", "Low"])
+        self.priority_box.addItems(list(PRIORITY_LABELS))
         self.priority_box.setCurrentText("Medium")
         
         self.tag_input = QLineEdit()
@@ -128,9 +125,12 @@ class TodoApp(QWidget):
         input_layout.addWidget(self.edit_button, 2, 2)
         
         # Task list
-        self.list_widget = QListWidget()
-        self.list_widget.setSelectionMode(QListWidget.SingleSelection)
-        self.list_widget.setObjectName("TaskList")
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy)
+        self.list_view.setItemDelegate(TaskDelegate(self.list_view))
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setObjectName("TaskList")
         
         # Filter row
         self.filter_row = QFrame()
@@ -155,18 +155,48 @@ class TodoApp(QWidget):
         
         filter_layout.addWidget(self.all_button)
         filter_layout.addWidget(self.active_button)
+        self.priority_filter = QComboBox()
+        self.priority_filter.addItem("All priorities", None)
+        for code, label in enumerate(PRIORITY_LABELS):
+            self.priority_filter.addItem(label, code)
+        
+        self.tag_filter = QComboBox()
+        self.tag_filter.addItem("All tags", None)
+        
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Search tasks...")
+        self.search_field.setClearButtonEnabled(True)
+        
         filter_layout.addWidget(self.done_button)
         filter_layout.addStretch()
+        filter_layout.addWidget(self.priority_filter)
+        filter_layout.addWidget(self.tag_filter)
         
         # Status row
         status_row = QHBoxLayout()
         self.stats_label = QLabel("0 total, 0 active, 0 done")
         self.remove_button = QPushButton("Remove Selected")
         self.clear_button = QPushButton("Clear Completed")
+        self.undo_button = QPushButton("Undo")
+        self.redo_button = QPushButton("Redo")
+        self.undo_button.setEnabled(False)
+        self.redo_button.setEnabled(False)
+        self.import_button = QPushButton("Import...")
+        self.export_button = QPushButton("Export...")
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 1000)
+        self.load_progress.setTextVisible(False)
+        self.load_progress.setMaximumWidth(120)
+        self.load_progress.hide()
         status_row.addWidget(self.stats_label)
+        status_row.addWidget(self.load_progress)
         status_row.addStretch()
+        status_row.addWidget(self.undo_button)
+        status_row.addWidget(self.redo_button)
         status_row.addWidget(self.remove_button)
         status_row.addWidget(self.clear_button)
+        status_row.addWidget(self.import_button)
+        status_row.addWidget(self.export_button)
         
         # Empty state
         self.empty_state = QLabel("No tasks yet. Add one above.")
@@ -178,7 +208,8 @@ class TodoApp(QWidget):
         layout.addWidget(self.subtitle)
         layout.addWidget(self.input_card)
         layout.addWidget(self.filter_row)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.search_field)
+        layout.addWidget(self.list_view)
         layout.addWidget(self.empty_state)
         layout.addLayout(status_row)
     
@@ -197,9 +228,7 @@ class TodoApp(QWidget):
             QPushButton#Primary { background: #2f6fed; color: white; border: none; }
             QPushButton#Primary:hover { background: #255ad0; }
             QPushButton:checked { background: #2f6fed; color: white; border: none; }
-            QListWidget#TaskList { background: white; border: 1px solid #e5e7eb; border-radius: 10px; padding: 6px; }
-            QListWidget::item { padding: 6px; }
-            QListWidget::item:selected { background: #e5edff; color: #111827; }
+            QListView#TaskList { background: white; border: 1px solid #e5e7eb; border-radius: 10px; padding: 6px; }
         """)
     
     def _connect_signals(self):
@@ -209,166 +238,220 @@ class TodoApp(QWidget):
         self.edit_button.clicked.connect(self.edit_task)
         self.remove_button.clicked.connect(self.remove_selected)
         self.clear_button.clicked.connect(self.clear_completed)
-        self.list_widget.itemChanged.connect(self.on_item_changed)
+        self.undo_button.clicked.connect(self.undo)
+        self.redo_button.clicked.connect(self.redo)
+        self.history.stack.canUndoChanged.connect(self.undo_button.setEnabled)
+        self.history.stack.canRedoChanged.connect(self.redo_button.setEnabled)
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+        self.import_button.clicked.connect(self.on_import_clicked)
+        self.export_button.clicked.connect(self.on_export_clicked)
+        self.model.dataChanged.connect(self.on_item_changed)
+        self.model.rowsInserted.connect(self.on_rows_inserted)
+        self.model.rowsRemoved.connect(self.on_rows_removed)
+        self.model.modelReset.connect(self.on_model_reset)
         self.filters.idClicked.connect(self.on_filter_changed)
-    
-    def save_tasks(self):
-        """Save tasks to JSON file."""
-        tasks = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            tasks.append({
-                "text": item.text(),
-                "done": item.checkState() == Qt.Checked,
-                "createdAt": item.data(Qt.UserRole) or "",
-                "priority": item.data(Qt.UserRole + 1) or "Medium",
-                "tag": item.data(Qt.UserRole + 2) or ""
-            })
-        
-        try:
-            with open(data_file_path(), 'w') as f:
-                json.dump(tasks, f)
-        except Exception as e:
-            print(f"Error saving tasks: {e}")
+        self.priority_filter.currentIndexChanged.connect(self.on_priority_filter_changed)
+        self.tag_filter.currentIndexChanged.connect(self.on_tag_filter_changed)
+        self.search_field.textChanged.connect(self.on_search_changed)
+        self.core.loadProgress.connect(self.on_load_progress)
+        self.core.loadFinished.connect(self.on_load_finished)
+        self.core.externalChange.connect(self.on_external_change)
     
     def load_tasks(self):
-        """Load tasks from JSON file."""
-        try:
-            with open(data_file_path(), 'r') as f:
-                tasks = json.load(f)
-            
-            for task in tasks:
-                raw_text = task.get("text", "")
-                done = task.get("done", False)
-                created_at = task.get("createdAt", "")
-                priority = task.get("priority", "Medium")
-                tag = task.get("tag", "")
-                
-                # Extract base text (remove priority suffix if present)
-                if " [" in raw_text:
-                    base_text = raw_text.split(" [")[0]
-                else:
-                    base_text = raw_text
-                
-                item = QListWidgetItem()
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
-                item.setCheckState(Qt.Checked if done else Qt.Unchecked)
-                item.setData(Qt.UserRole, created_at)
-                item.setData(Qt.UserRole + 1, priority)
-                item.setData(Qt.UserRole + 2, tag)
-                item.setData(Qt.UserRole + 3, base_text)
-                update_item_label(item)
-                self.list_widget.addItem(item)
-        except FileNotFoundError:
-            pass
-        except Exception as e:
-            print(f"Error loading tasks: {e}")
+        """Load the first screenful now and stream the rest in the background."""
+        self.set_editing_enabled(False)
+        if not self.core.load(FIRST_SCREEN_ROWS):
+            self.update_empty_state()
+            self.load_progress.show()
+            self.on_load_progress(self.core.loader.loaded, self.store.load_progress())
+    
+    @property
+    def loading(self) -> bool:
+        return self.core.loading
+    
+    def finish_loading(self):
+        """Load all remaining tasks synchronously."""
+        self.core.finish_loading()
+    
+    def on_load_progress(self, loaded: int, fraction: float):
+        """Show background loading progress."""
+        if fraction < 0:
+            self.load_progress.setRange(0, 0)  # busy indicator
+        else:
+            self.load_progress.setValue(int(fraction * 1000))
+        self.stats_label.setText(f"Loading... {loaded} tasks")
+    
+    def on_load_finished(self, loaded: int):
+        """Enable editing once every task is in the model."""
+        self.set_editing_enabled(True)
+        self.load_progress.hide()
+        self.update_stats()
+        self.update_empty_state()
+        self.refresh_tag_filter()
+    
+    def on_external_change(self, changes: int):
+        """Another process changed the task file; its changes are merged."""
+        print(f"Merged {changes} external task changes")
+        self.refresh_tag_filter()
+    
+    def set_editing_enabled(self, enabled: bool):
+        """Allow or block changes (blocked while tasks are still loading)."""
+        for widget in (self.input_card, self.remove_button, self.clear_button,
+                       self.import_button):
+            widget.setEnabled(enabled)
     
     def update_empty_state(self):
         """Update the visibility of empty state label."""
-        is_empty = self.list_widget.count() == 0
+        is_empty = self.model.rowCount() == 0
         self.empty_state.setVisible(is_empty)
-        self.list_widget.setVisible(not is_empty)
+        self.list_view.setVisible(not is_empty)
     
     def update_stats(self):
         """Update statistics display."""
-        total = self.list_widget.count()
-        done = sum(1 for i in range(total) 
-                   if self.list_widget.item(i).checkState() == Qt.Checked)
-        active = total - done
-        self.stats_label.setText(f"{total} total, {active} active, {done} done")
-    
-    def apply_filter(self):
-        """Apply current filter to task list."""
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            done = item.checkState() == Qt.Checked
-            
-            if self.current_filter == FilterMode.ACTIVE and done:
-                item.setHidden(True)
-            elif self.current_filter == FilterMode.DONE and not done:
-                item.setHidden(True)
-            else:
-                item.setHidden(False)
+        stats = self.model.stats
+        self.stats_label.setText(
+            f"{stats.total} total, {stats.active} active, {stats.done} done")
+        self.stats_label.setToolTip(", ".join(
+            f"{label}: {stats.priority_total[code] - stats.priority_done[code]} active"
+            for code, label in enumerate(PRIORITY_LABELS)))
+    
+    def refresh_tag_filter(self):
+        """Add newly seen tags to the tag filter box."""
+        tags = self.model.tags()
+        for tag_id in range(max(self._known_tag_count, 1), len(tags)):
+            self.tag_filter.addItem(f"#{tags[tag_id]}", tag_id)
+        self._known_tag_count = len(tags)
+    
+    def selected_row(self) -> int:
+        """Return the selected source row, or -1 if nothing is selected."""
+        index = self.proxy.mapToSource(self.list_view.currentIndex())
+        return index.row() if index.isValid() else -1
     
     def add_task(self):
         """Add a new task."""
-        raw_text = self.input_field.text().strip()
-        if not raw_text:
+        row = self.core.add_task(
+            self.input_field.text(),
+            self.priority_box.currentText(),
+            self.tag_input.text()
+        )
+        if row < 0:
             return
         
-        item = QListWidgetItem()
-        item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
-        item.setCheckState(Qt.Unchecked)
-        item.setData(Qt.UserRole, datetime.now().isoformat())
-        item.setData(Qt.UserRole + 1, self.priority_box.currentText())
-        item.setData(Qt.UserRole + 2, self.tag_input.text().strip())
-        item.setData(Qt.UserRole + 3, raw_text)
-        update_item_label(item)
-        
-        self.list_widget.addItem(item)
         self.input_field.clear()
         self.tag_input.clear()
         self.input_field.setFocus()
-        
-        self.update_stats()
-        self.update_empty_state()
-        self.apply_filter()
-        self.save_tasks()
+        proxy_index = self.proxy.mapFromSource(self.model.index(row, 0))
+        if proxy_index.isValid():
+            self.list_view.scrollTo(proxy_index)
     
     def edit_task(self):
         """Edit the selected task."""
-        item = self.list_widget.currentItem()
-        if not item:
+        self.finish_loading()
+        row = self.selected_row()
+        if row < 0:
             return
         
-        current_text = item.data(Qt.UserRole + 3) or ""
+        current_text = self.model.text(row)
         text, ok = QInputDialog.getText(
             self, "Edit Task", "Task:", 
             QLineEdit.Normal, current_text
         )
         
-        if ok and text.strip():
-            item.setData(Qt.UserRole + 3, text.strip())
-            update_item_label(item)
-            self.save_tasks()
+        if ok:
+            self.core.edit_task(row, text)
     
     def remove_selected(self):
         """Remove the selected task."""
-        row = self.list_widget.currentRow()
+        self.finish_loading()
+        row = self.selected_row()
         if row < 0:
             return
         
-        self.list_widget.takeItem(row)
-        self.update_stats()
-        self.update_empty_state()
-        self.save_tasks()
+        self.core.remove_task(row)
     
     def clear_completed(self):
         """Remove all completed tasks."""
-        for i in range(self.list_widget.count() - 1, -1, -1):
-            item = self.list_widget.item(i)
-            if item.checkState() == Qt.Checked:
-                self.list_widget.takeItem(i)
-        
-        self.update_stats()
-        self.update_empty_state()
-        self.save_tasks()
+        self.core.clear_completed()
+    
+    def undo(self):
+        """Undo the last change."""
+        self.core.undo()
+    
+    def redo(self):
+        """Redo the last undone change."""
+        self.core.redo()
+    
+    def import_file(self, path: str) -> int:
+        """Append all tasks from a JSON, NDJSON or CSV file."""
+        return self.core.import_file(path)
+    
+    def export_file(self, path: str) -> int:
+        """Write all tasks to a JSON, NDJSON or CSV file."""
+        return self.core.export_file(path)
+    
+    def on_import_clicked(self):
+        """Ask for a file and import it."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Tasks", "", transfer.FILE_FILTER)
+        if not path:
+            return
+        try:
+            count = self.import_file(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Import Tasks", f"Error importing tasks: {e}")
+            return
+        print(f"Imported {count} tasks from {path}")
+    
+    def on_export_clicked(self):
+        """Ask for a file name and export all tasks."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Tasks", "todos.json", transfer.FILE_FILTER)
+        if not path:
+            return
+        try:
+            self.export_file(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Export Tasks", f"Error exporting tasks: {e}")
     
-    def on_item_changed(self, item: QListWidgetItem):
-        """Handle item changes (check state, edit)."""
+    def on_item_changed(self, top_left, bottom_right, roles=()):
+        """Handle model changes (check state, edit); the proxy refilters the row."""
         if self.loading:
             return
-        if item:
-            update_item_label(item)
         self.update_stats()
-        self.apply_filter()
-        self.save_tasks()
+    
+    def on_rows_inserted(self, parent, first: int, last: int):
+        """Refresh the counters and tag list after inserts."""
+        if not self.loading:
+            self.update_stats()
+            self.update_empty_state()
+            self.refresh_tag_filter()
+    
+    def on_rows_removed(self, parent, first: int, last: int):
+        """Refresh counters after removals."""
+        self.update_stats()
+        self.update_empty_state()
+    
+    def on_model_reset(self):
+        """Refresh the counters after bulk changes."""
+        self.update_stats()
+        self.update_empty_state()
     
     def on_filter_changed(self, filter_id: int):
         """Handle filter button clicks."""
-        self.current_filter = FilterMode(filter_id)
-        self.apply_filter()
+        self.core.set_filter(mode=FilterMode(filter_id))
+    
+    def on_priority_filter_changed(self, index: int):
+        """Filter by priority (None shows all)."""
+        self.core.set_filter(priority=self.priority_filter.itemData(index))
+    
+    def on_tag_filter_changed(self, index: int):
+        """Filter by tag (None shows all)."""
+        self.core.set_filter(tag_id=self.tag_filter.itemData(index))
+    
+    def on_search_changed(self, text: str):
+        """Show only tasks matching every search term."""
+        self.core.set_filter(search_text=text)
 
 
 def main():
@@ -385,9 +468,12 @@ def main():
     app.setPalette(palette)
     
     print("=== PySide6 Todo App ===")
-    print("Data is saved to:", data_file_path())
+    print("Data is saved to:", data_dir_path())
+    if debug_stats_enabled():
+        print("Stats debug mode: counters are verified after every change")
     
     window = TodoApp()
+    print(f"Storage backend: {window.store.name} ({window.store.location})")
     window.show()
     
     return app.exec()
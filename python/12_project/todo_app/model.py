@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Todo list model
+
+A QAbstractListModel that stores tasks column by column (parallel arrays)
+instead of one QListWidgetItem per task:
+- text:      list of str
+- done:      bytearray of 0/1 flags
+- priority:  array of priority codes (see Priority)
+- tag:       array of interned tag ids
+- createdAt: list of ISO timestamps
+- id:        array of stable task ids (rows are always sorted by id)
+
+Task is the record type for a single task (loading, import, storage):
+raw fields only, with the priority as a Priority and the tag interned.
+The "text [Priority] #tag" label is derived when a row is painted and is
+never stored. Display data is computed on demand in data(), so changing
+one task only emits dataChanged for that row. Counters in TaskStats (see stats.py) are
+updated by every mutation, so statistics never need a rescan. The same
+goes for the FilterIndex (see filtering.py) used by the filter proxy and,
+once the first search has built it, the SearchIndex (see search.py).
+
+Storage backends follow changes through the taskAdded, tasksAppended,
+tasksInserted, taskFieldChanged and tasksRemoved signals instead of
+rescanning the model. Edits made in views go through the undo history
+(see history.py) when one is installed.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+from enum import IntEnum
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, Signal
+from PySide6.QtGui import QColor
+
+from stats import TaskStats, debug_stats_enabled
+from filtering import FilterIndex
+from search import SearchIndex
+
+
+class Priority(IntEnum):
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+
+    @property
+    def label(self) -> str:
+        return self.name.capitalize()
+
+    @classmethod
+    def from_label(cls, label: str) -> "Priority":
+        """Map a stored label ("High", "Medium", "Low") to a priority."""
+        try:
+            return cls[label.upper()]
+        except (KeyError, AttributeError):
+            return cls.MEDIUM
+
+
+PRIORITY_LABELS = tuple(p.label for p in Priority)
+_PRIORITY_CODES = {p.label: p for p in Priority}
+
+
+class Task:
+    """Raw fields of one task; the display label is derived, never stored."""
+
+    __slots__ = ("id", "text", "done", "priority", "tag", "created_at")
+
+    def __init__(self, text: str, done: bool = False,
+                 priority: Priority = Priority.MEDIUM, tag: str = "",
+                 created_at: str = "", task_id: int = None):
+        self.id = task_id
+        self.text = text
+        self.done = bool(done)
+        self.priority = Priority(priority)
+        self.tag = sys.intern(tag)
+        self.created_at = created_at
+
+    @classmethod
+    def from_dict(cls, data: dict, task_id: int = None) -> "Task":
+        """Build a task from its stored form (priority as label, createdAt)."""
+        label = data.get("priority") or "Medium"
+        priority = _PRIORITY_CODES.get(label)
+        return cls(data.get("text", ""),
+                   data.get("done", False),
+                   Priority.from_label(label) if priority is None else priority,
+                   data.get("tag") or "",
+                   data.get("createdAt") or "",
+                   data.get("id") if task_id is None else task_id)
+
+    def to_dict(self) -> dict:
+        """Stored form of the task."""
+        return {
+            "id": self.id,
+            "text": self.text,
+            "done": self.done,
+            "priority": self.priority.label,
+            "tag": self.tag,
+            "createdAt": self.created_at
+        }
+
+    @property
+    def label(self) -> str:
+        return format_label(self.text, self.priority.label, self.tag)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"Task(id={self.id!r}, text={self.text!r}, done={self.done}, "
+                f"priority={self.priority.label}, tag={self.tag!r})")
+
+
+# Immutable copy of the model columns, safe to hand to a worker thread
+TaskSnapshot = namedtuple(
+    "TaskSnapshot", ["ids", "text", "done", "priority", "tag", "tags", "created"])
+
+
+def format_label(text: str, priority: str, tag: str) -> str:
+    """Build a display label: "text [Priority] #tag"."""
+    suffix = f" [{priority}]"
+    if tag:
+        suffix += f" #{tag}"
+    return text + suffix
+
+
+def strip_label(label: str) -> str:
+    """Recover the task text from a label built by format_label()."""
+    if " [" in label:
+        return label.split(" [")[0]
+    return label
+
+
+def priority_color(priority: str) -> str:
+    """Get color for a given priority."""
+    colors = {
+        "High": "#ef4444",
+        "Medium": "#f59e0b",
+        "Low": "#10b981"
+    }
+    return colors.get(priority, "#9ca3af")
+
+
+class TodoModel(QAbstractListModel):
+    """List model backed by parallel per-field arrays."""
+
+    CreatedAtRole = Qt.UserRole
+    PriorityRole = Qt.UserRole + 1
+    TagRole = Qt.UserRole + 2
+    TextRole = Qt.UserRole + 3
+    DoneRole = Qt.UserRole + 4
+    IdRole = Qt.UserRole + 5
+    PriorityCodeRole = Qt.UserRole + 6  # Priority code (int) instead of the label
+
+    # Flag combinations built once (enum arithmetic is slow per call)
+    _READ_ONLY_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+    _EDITABLE_FLAGS = _READ_ONLY_FLAGS | Qt.ItemIsUserCheckable | Qt.ItemIsEditable
+
+    taskAdded = Signal(int)              # row
+    tasksAppended = Signal(int, int)     # first row, last row (bulk insert)
+    taskFieldChanged = Signal(int, str)  # row, "text" or "done"
+    tasksInserted = Signal(list)         # ids of tasks restored at their position
+    tasksRemoved = Signal(list)          # removed task ids
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._id = array("Q")
+        self._next_id = 1
+        self._text = []
+        self._done = bytearray()
+        self._priority = array("B")
+        self._tag = array("I")
+        self._created = []
+
+        # Tag interning: id 0 is always the empty tag
+        self._tags = [""]
+        self._tag_ids = {"": 0}
+
+        # While read-only (e.g. during background loading) views can't edit
+        self.read_only = False
+        # TaskHistory installs itself here so view edits become undoable
+        self.history = None
+
+        # Running counters; debug mode recounts after every mutation
+        self.stats = TaskStats(len(Priority))
+        self.debug_stats = debug_stats_enabled()
+        self.filter_index = FilterIndex(len(Priority))
+        self._search_index = None  # built on first search
+
+        # Shared per-priority colors, created once
+        self._colors = [QColor(priority_color(p)) for p in PRIORITY_LABELS]
+
+        # data() dispatch by plain int role; comparing against Qt enum
+        # members one by one dominates the cost of painting a row
+        self._role_getters = {
+            int(Qt.DisplayRole): self.label,
+            int(Qt.CheckStateRole):
+                lambda row: Qt.Checked if self._done[row] else Qt.Unchecked,
+            int(Qt.ForegroundRole): lambda row: self._colors[self._priority[row]],
+            int(Qt.EditRole): self.text,
+            int(self.TextRole): self.text,
+            int(self.DoneRole): self.is_done,
+            int(self.PriorityRole): self.priority,
+            int(self.PriorityCodeRole): self.priority_code,
+            int(self.TagRole): self.tag,
+            int(self.CreatedAtRole): self.created_at,
+            int(self.IdRole): self.task_id,
+        }
+
+    # === Qt model interface ===
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._text)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if self.read_only:
+            return self._READ_ONLY_FLAGS
+        return self._EDITABLE_FLAGS
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        getter = self._role_getters.get(role)
+        if getter is None:
+            return None
+        return getter(index.row())
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row = index.row()
+
+        if role == Qt.CheckStateRole:
+            done = _is_checked(value)
+            if self.history is not None:
+                return self.history.set_done(row, done)
+            return self.set_done(row, done)
+        if role == Qt.EditRole or role == self.TextRole:
+            text = str(value).strip()
+            if not text:
+                return False
+            if self.history is not None:
+                return self.history.set_text(row, text)
+            return self.set_text(row, text)
+        return False
+
+    def roleNames(self):
+        roles = super().roleNames()
+        roles[self.TextRole] = b"text"
+        roles[self.DoneRole] = b"done"
+        roles[self.PriorityRole] = b"priority"
+        roles[self.TagRole] = b"tag"
+        roles[self.CreatedAtRole] = b"createdAt"
+        return roles
+
+    # === Field access ===
+
+    def task_id(self, row: int) -> int:
+        return self._id[row]
+
+    def task_ids(self) -> array:
+        """All ids in row order (shared, do not modify)."""
+        return self._id
+
+    def row_for_id(self, task_id: int) -> int:
+        """Find the row of a task id in O(log n), or -1."""
+        row = bisect_left(self._id, task_id)
+        if row < len(self._id) and self._id[row] == task_id:
+            return row
+        return -1
+
+    def task(self, row: int) -> Task:
+        """All stored fields of a row, as written by storage backends."""
+        return Task(self._text[row],
+                    self._done[row],
+                    self._priority[row],
+                    self._tags[self._tag[row]],
+                    self._created[row],
+                    self._id[row])
+
+    def text(self, row: int) -> str:
+        return self._text[row]
+
+    def is_done(self, row: int) -> bool:
+        return bool(self._done[row])
+
+    def priority(self, row: int) -> str:
+        return PRIORITY_LABELS[self._priority[row]]
+
+    def tag(self, row: int) -> str:
+        return self._tags[self._tag[row]]
+
+    def priority_code(self, row: int) -> int:
+        return self._priority[row]
+
+    def tag_code(self, row: int) -> int:
+        return self._tag[row]
+
+    def created_at(self, row: int) -> str:
+        return self._created[row]
+
+    def label(self, row: int) -> str:
+        """Build the display label for a row."""
+        return format_label(self._text[row],
+                            PRIORITY_LABELS[self._priority[row]],
+                            self._tags[self._tag[row]])
+
+    def done_count(self) -> int:
+        return self.stats.done
+
+    def tag_id(self, tag: str) -> int:
+        """Interned id of a tag, or -1 if no task ever used it."""
+        return self._tag_ids.get(tag, -1)
+
+    def tags(self):
+        """All tags seen so far, indexed by tag id."""
+        return list(self._tags)
+
+    def done_tasks(self) -> list:
+        """Task records of all completed tasks, in id order."""
+        return [self.task(row) for row, flag in enumerate(self._done) if flag]
+
+    def search_index(self) -> SearchIndex:
+        """The full-text index, built on first use."""
+        if self._search_index is None:
+            index = SearchIndex()
+            tags = self._tags
+            for task_id, text, tag_id in zip(self._id, self._text, self._tag):
+                index.add(task_id, text, tags[tag_id])
+            self._search_index = index
+        return self._search_index
+
+    def snapshot(self) -> TaskSnapshot:
+        """Copy all columns so they can be serialized off the GUI thread."""
+        return TaskSnapshot(
+            array("Q", self._id),
+            list(self._text),
+            bytes(self._done),
+            array("B", self._priority),
+            array("I", self._tag),
+            tuple(self._tags),
+            list(self._created),
+        )
+
+    # === Mutations ===
+
+    def append_task(self, text: str, done: bool = False, priority: str = "Medium",
+                    tag: str = "", created_at: str = "", task_id: int = None) -> int:
+        """Append one task and return its row.
+
+        A new id is assigned unless task_id is given (e.g. when loading);
+        explicit ids must be larger than every id already in the model.
+        """
+        if task_id is None:
+            task_id = self._next_id
+        elif self._id and task_id <= self._id[-1]:
+            raise ValueError(f"task id {task_id} is not increasing")
+        self._next_id = max(self._next_id, task_id + 1)
+
+        row = len(self._text)
+        priority_code = Priority.from_label(priority)
+        tag_id = self._intern_tag(tag)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._id.append(task_id)
+        self._text.append(text)
+        self._done.append(1 if done else 0)
+        self._priority.append(priority_code)
+        self._tag.append(tag_id)
+        self._created.append(created_at)
+        self.stats.add(priority_code, tag_id, done)
+        self.filter_index.add(task_id, done, priority_code, tag_id)
+        if self._search_index is not None:
+            self._search_index.add(task_id, text, tag)
+        self.endInsertRows()
+        self._check_stats()
+        self.taskAdded.emit(row)
+        return row
+
+    def append_tasks(self, tasks) -> int:
+        """Append many Task records with a single insert notification.
+
+        Tasks come from TodoStore.load() or an import; tasks without an
+        id get new ids. Returns the number of appended rows.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return 0
+        first = len(self._text)
+        last = first + len(tasks) - 1
+        next_id = self._next_id
+        last_id = self._id[-1] if self._id else 0
+        ids, priorities, tag_ids, done_flags = array("Q"), array("B"), array("I"), bytearray()
+        known_tags = self._tag_ids
+        for task in tasks:
+            task_id = task.id
+            if task_id is None:
+                task_id = next_id
+            elif task_id <= last_id:
+                raise ValueError(f"task id {task_id} is not increasing")
+            last_id = task_id
+            next_id = max(next_id, task_id + 1)
+            ids.append(task_id)
+            priorities.append(task.priority)
+            tag_id = known_tags.get(task.tag)
+            tag_ids.append(self._intern_tag(task.tag) if tag_id is None else tag_id)
+            done_flags.append(1 if task.done else 0)
+
+        self.beginInsertRows(QModelIndex(), first, last)
+        self._id.extend(ids)
+        self._text.extend(task.text for task in tasks)
+        self._done.extend(done_flags)
+        self._priority.extend(priorities)
+        self._tag.extend(tag_ids)
+        self._created.extend(task.created_at for task in tasks)
+        self._next_id = next_id
+        self.stats.add_many(done_flags, priorities, tag_ids)
+        self.filter_index.extend(ids, done_flags, priorities, tag_ids)
+        if self._search_index is not None:
+            tags = self._tags
+            for row in range(first, last + 1):
+                self._search_index.add(self._id[row], self._text[row], tags[self._tag[row]])
+        self.endInsertRows()
+        self._check_stats()
+        self.tasksAppended.emit(first, last)
+        return len(tasks)
+
+    def insert_tasks(self, tasks) -> int:
+        """Insert Task records at the rows matching their ids (e.g. undo).
+
+        Every task needs an id that is not in the model. A single task is
+        one row insert; more are merged into the columns with one reset.
+        Returns the number of inserted rows.
+        """
+        tasks = sorted(tasks, key=lambda task: task.id)
+        if not tasks:
+            return 0
+        ids = [task.id for task in tasks]
+        for task_id in ids:
+            if task_id is None or self.row_for_id(task_id) >= 0:
+                raise ValueError(f"cannot insert task id {task_id}")
+        self._next_id = max(self._next_id, ids[-1] + 1)
+        if len(tasks) == 1:
+            self._insert_one(tasks[0])
+        else:
+            self._insert_many(tasks)
+        self._check_stats()
+        self.tasksInserted.emit(ids)
+        return len(tasks)
+
+    def _insert_one(self, task: Task):
+        row = bisect_left(self._id, task.id)
+        tag_id = self._intern_tag(task.tag)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._id.insert(row, task.id)
+        self._text.insert(row, task.text)
+        self._done.insert(row, 1 if task.done else 0)
+        self._priority.insert(row, task.priority)
+        self._tag.insert(row, tag_id)
+        self._created.insert(row, task.created_at)
+        self.stats.add(task.priority, tag_id, task.done)
+        self.filter_index.add(task.id, task.done, task.priority, tag_id)
+        if self._search_index is not None:
+            self._search_index.add(task.id, task.text, task.tag)
+        self.endInsertRows()
+
+    def _insert_many(self, tasks):
+        done_flags = bytearray(1 if task.done else 0 for task in tasks)
+        priorities = array("B", (task.priority for task in tasks))
+        tag_ids = array("I", (self._intern_tag(task.tag) for task in tasks))
+        ids = self._id + array("Q", (task.id for task in tasks))
+        # Both runs are sorted, so this sort is a linear merge
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        text = self._text + [task.text for task in tasks]
+        done = self._done + done_flags
+        priority = self._priority + priorities
+        tag = self._tag + tag_ids
+        created = self._created + [task.created_at for task in tasks]
+
+        self.beginResetModel()
+        self._id = array("Q", (ids[i] for i in order))
+        self._text = [text[i] for i in order]
+        self._done = bytearray(done[i] for i in order)
+        self._priority = array("B", (priority[i] for i in order))
+        self._tag = array("I", (tag[i] for i in order))
+        self._created = [created[i] for i in order]
+        self.stats.add_many(done_flags, priorities, tag_ids)
+        self.filter_index.rebuild(self._id, self._done, self._priority, self._tag)
+        self._search_index = None  # rebuilt on the next search
+        self.endResetModel()
+
+    def set_done(self, row: int, done: bool) -> bool:
+        flag = 1 if done else 0
+        if self._done[row] == flag:
+            return False
+        self._done[row] = flag
+        self.stats.set_done(self._priority[row], self._tag[row], done)
+        self.filter_index.set_done(self._id[row], done)
+        self._check_stats()
+        self._emit_row_changed(row, [Qt.CheckStateRole, self.DoneRole])
+        self.taskFieldChanged.emit(row, "done")
+        return True
+
+    def set_text(self, row: int, text: str) -> bool:
+        old_text = self._text[row]
+        if old_text == text:
+            return False
+        self._text[row] = text
+        if self._search_index is not None:
+            self._search_index.update(self._id[row], old_text, text,
+                                      self._tags[self._tag[row]])
+        self._emit_row_changed(row, [Qt.DisplayRole, Qt.EditRole, self.TextRole])
+        self.taskFieldChanged.emit(row, "text")
+        return True
+
+    def remove_task(self, row: int):
+        """Remove a single row."""
+        task_id = self._id[row]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.stats.remove(self._priority[row], self._tag[row], self._done[row])
+        self.filter_index.remove(task_id, self._done[row], self._priority[row], self._tag[row])
+        if self._search_index is not None:
+            self._search_index.remove(task_id, self._text[row], self._tags[self._tag[row]])
+        del self._id[row]
+        del self._text[row]
+        del self._done[row]
+        del self._priority[row]
+        del self._tag[row]
+        del self._created[row]
+        self.endRemoveRows()
+        self._check_stats()
+        self.tasksRemoved.emit([task_id])
+
+    def clear_done(self) -> int:
+        """Remove all completed tasks. Returns the number of removed rows."""
+        removed = self.stats.done
+        if removed == 0:
+            return 0
+
+        keep = [i for i, flag in enumerate(self._done) if not flag]
+        removed_ids = [task_id for task_id, flag in zip(self._id, self._done) if flag]
+        self.beginResetModel()
+        self._keep_rows(keep)
+        stats = self.stats
+        for priority in range(len(stats.priority_done)):
+            stats.priority_total[priority] -= stats.priority_done[priority]
+            stats.priority_done[priority] = 0
+        for tag_id in range(len(stats.tag_done)):
+            stats.tag_total[tag_id] -= stats.tag_done[tag_id]
+            stats.tag_done[tag_id] = 0
+        stats.total -= stats.done
+        stats.done = 0
+        self.endResetModel()
+        self._check_stats()
+        self.tasksRemoved.emit(removed_ids)
+        return removed
+
+    def remove_ids(self, ids) -> int:
+        """Remove many tasks by id with one model reset (one row: one remove)."""
+        rows = sorted(row for row in map(self.row_for_id, set(ids)) if row >= 0)
+        if not rows:
+            return 0
+        if len(rows) == 1:
+            self.remove_task(rows[0])
+            return 1
+
+        removed_ids = [self._id[row] for row in rows]
+        removed = set(rows)
+        keep = [i for i in range(len(self._id)) if i not in removed]
+        self.beginResetModel()
+        for row in rows:
+            self.stats.remove(self._priority[row], self._tag[row], self._done[row])
+        self._keep_rows(keep)
+        self.endResetModel()
+        self._check_stats()
+        self.tasksRemoved.emit(removed_ids)
+        return len(rows)
+
+    def _keep_rows(self, keep):
+        """Shrink all columns to the given rows and rebuild the indexes."""
+        self._id = array("Q", (self._id[i] for i in keep))
+        self._text = [self._text[i] for i in keep]
+        self._done = bytearray(self._done[i] for i in keep)
+        self._priority = array("B", (self._priority[i] for i in keep))
+        self._tag = array("I", (self._tag[i] for i in keep))
+        self._created = [self._created[i] for i in keep]
+        self.filter_index.rebuild(self._id, self._done, self._priority, self._tag)
+        self._search_index = None  # rebuilt on the next search
+
+    # === Helpers ===
+
+    def _intern_tag(self, tag: str) -> int:
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = len(self._tags)
+            self._tags.append(tag)
+            self._tag_ids[tag] = tag_id
+        return tag_id
+
+    def _check_stats(self):
+        if self.debug_stats:
+            self.stats.verify(self._done, self._priority, self._tag)
+
+    def _emit_row_changed(self, row: int, roles):
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, roles)
+
+
+def _is_checked(value) -> bool:
+    """Normalize a check state coming from a view (enum or int)."""
+    if isinstance(value, Qt.CheckState):
+        return value == Qt.Checked
+    return int(value) == Qt.Checked.value
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Debounced background persistence
+
+SaveScheduler turns "something changed" notifications into as few writes
+as possible:
+- mark_dirty() restarts a single-shot quiet-period timer, so a burst of
+  changes results in one write
+- max_delay_ms bounds how long a continuous stream of changes can defer it
+- the model is snapshotted on the GUI thread (a cheap column copy) and
+  serialized/written on a single worker thread
+- flush() writes any pending change synchronously (used on aboutToQuit)
+
+Files are written atomically: temp file in the same directory, fsync,
+then os.replace().
+
+todos.json format (version 2) stores the raw task fields:
+
+    {"version": 2, "tasks": [{"id": 1, "text": "...", "done": false,
+                              "priority": "High", "tag": "work",
+                              "createdAt": "..."}, ...]}
+
+Version 1 was a bare array whose "text" held the display label
+("text [High] #work"); it is still read and rewritten as version 2.
+"""
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from model import PRIORITY_LABELS, TaskSnapshot
+
+
+TASKS_FORMAT_VERSION = 2
+DEFAULT_SAVE_DELAY_MS = 250
+DEFAULT_MAX_DELAY_MS = 2000
+
+
+def save_delay_from_env() -> int:
+    """Quiet period in milliseconds, configurable with TODO_SAVE_DELAY_MS."""
+    try:
+        return max(0, int(os.environ.get("TODO_SAVE_DELAY_MS", DEFAULT_SAVE_DELAY_MS)))
+    except ValueError:
+        return DEFAULT_SAVE_DELAY_MS
+
+
+def write_atomic(path: str, data: bytes):
+    """Write data to path via a temp file and rename."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".todos-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def snapshot_records(snapshot: TaskSnapshot) -> list:
+    """Stored form (raw fields) of every task in a snapshot."""
+    tags = snapshot.tags
+    return [
+        {
+            "id": task_id,
+            "text": text,
+            "done": bool(done),
+            "priority": PRIORITY_LABELS[priority],
+            "tag": tags[tag_id],
+            "createdAt": created_at
+        }
+        for task_id, text, done, priority, tag_id, created_at in zip(
+            snapshot.ids, snapshot.text, snapshot.done, snapshot.priority,
+            snapshot.tag, snapshot.created)
+    ]
+
+
+def encode_tasks_json(snapshot: TaskSnapshot) -> bytes:
+    """Serialize a snapshot in the todos.json format."""
+    return json.dumps({"version": TASKS_FORMAT_VERSION,
+                       "tasks": snapshot_records(snapshot)}).encode("utf-8")
+
+
+class SaveScheduler(QObject):
+    """Coalesce change notifications into debounced background writes."""
+
+    saved = Signal(float)  # write duration in ms
+    failed = Signal(str)
+
+    def __init__(self, snapshot_fn, write_fn, delay_ms: int = DEFAULT_SAVE_DELAY_MS,
+                 max_delay_ms: int = DEFAULT_MAX_DELAY_MS, parent=None):
+        """
+        snapshot_fn() runs on the GUI thread and must return an immutable
+        copy of the data; write_fn(snapshot) runs on the worker thread.
+        """
+        super().__init__(parent)
+        self._snapshot_fn = snapshot_fn
+        self._write_fn = write_fn
+        self._max_delay_ms = max_delay_ms
+        self._dirty = False
+        self._dirty_since = 0.0
+        self._pending = None
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="todo-save")
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._write_now)
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def set_delay(self, delay_ms: int):
+        self._timer.setInterval(delay_ms)
+
+    def mark_dirty(self):
+        """Record a change; the write happens after the quiet period."""
+        now = time.monotonic()
+        if not self._dirty:
+            self._dirty = True
+            self._dirty_since = now
+        elif (now - self._dirty_since) * 1000 >= self._max_delay_ms:
+            # Changes keep coming: don't postpone the write forever
+            self._write_now()
+            return
+        self._timer.start()
+
+    def cancel(self):
+        """Forget a pending change (the data on disk is already current)."""
+        self._timer.stop()
+        self._dirty = False
+
+    def flush(self):
+        """Write pending changes and wait for all queued writes."""
+        self._timer.stop()
+        if self._dirty:
+            self._write_now()
+        if self._pending is not None:
+            try:
+                self._pending.result()
+            except Exception:
+                pass  # already reported by _run_write
+            self._pending = None
+
+    def shutdown(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _write_now(self):
+        self._timer.stop()
+        if not self._dirty:
+            return
+        self._dirty = False
+        snapshot = self._snapshot_fn()
+        self._pending = self._executor.submit(self._run_write, snapshot)
+
+    def _run_write(self, snapshot):
+        start = time.perf_counter()
+        try:
+            self._write_fn(snapshot)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            self.failed.emit(str(e))
+            raise
+        self.saved.emit((time.perf_counter() - start) * 1000)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Full-text search index
+
+SearchIndex is an inverted index over task text and tags:
+- every word of the text and tag is a token (lowercased); the tag is also
+  indexed as "#tag" so a query term starting with "#" only matches tags
+- postings are sorted id arrays, and new ids are appended at the end
+- the vocabulary is kept sorted, so a query term matches all tokens that
+  start with it (bisect over the vocabulary: prefix search)
+
+A query matches tasks that contain every query term as a prefix of some
+token ("buy mil" finds "Buy milk"). TodoModel builds the index on first
+use and then updates it with every add, edit and remove.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, insort
+
+_WORD_RE = re.compile(r"#?\w+")
+
+
+def _contains(ids: array, task_id: int) -> bool:
+    pos = bisect_left(ids, task_id)
+    return pos < len(ids) and ids[pos] == task_id
+
+
+def tokenize(text: str, tag: str = "") -> set:
+    """Tokens of a task: words of text and tag, plus "#tag"."""
+    tokens = {word.lstrip("#") for word in _WORD_RE.findall(text.lower())}
+    if tag:
+        tag = tag.lower()
+        tokens.update(word.lstrip("#") for word in _WORD_RE.findall(tag))
+        tokens.add("#" + tag)
+    tokens.discard("")
+    return tokens
+
+
+def query_terms(query: str) -> list:
+    """Split a search string into lowercase prefix terms."""
+    return [term for term in _WORD_RE.findall(query.lower()) if term != "#"]
+
+
+def matches(terms, text: str, tag: str = "") -> bool:
+    """Check a single task against query terms without the index."""
+    if not terms:
+        return True
+    tokens = tokenize(text, tag)
+    return all(any(token.startswith(term) for token in tokens) for term in terms)
+
+
+class SearchIndex:
+    """Incrementally maintained prefix index: token -> sorted ids."""
+
+    def __init__(self):
+        self._postings = {}
+        self._vocab = []
+
+    def __len__(self):
+        return len(self._vocab)
+
+    def add(self, task_id: int, text: str, tag: str = ""):
+        for token in tokenize(text, tag):
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = array("Q")
+                insort(self._vocab, token)
+            if not ids or ids[-1] < task_id:
+                ids.append(task_id)
+            else:
+                ids.insert(bisect_left(ids, task_id), task_id)
+
+    def remove(self, task_id: int, text: str, tag: str = ""):
+        for token in tokenize(text, tag):
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            pos = bisect_left(ids, task_id)
+            if pos < len(ids) and ids[pos] == task_id:
+                del ids[pos]
+            if not ids:
+                del self._postings[token]
+                del self._vocab[bisect_left(self._vocab, token)]
+
+    def update(self, task_id: int, old_text: str, new_text: str, tag: str = ""):
+        self.remove(task_id, old_text, tag)
+        self.add(task_id, new_text, tag)
+
+    def _prefix_ids(self, term: str):
+        """Sorted ids of all tokens starting with term."""
+        vocab = self._vocab
+        start = bisect_left(vocab, term)
+        end = bisect_left(vocab, term + "\U0010ffff", start)
+        if end - start == 1:
+            return self._postings[vocab[start]]
+        if end == start:
+            return array("Q")
+        merged = set()
+        for token in vocab[start:end]:
+            merged.update(self._postings[token])
+        return array("Q", sorted(merged))
+
+    def search(self, query: str) -> array:
+        """Sorted ids of tasks matching every term of query."""
+        terms = query_terms(query)
+        if not terms:
+            return array("Q")
+        candidates = sorted((self._prefix_ids(term) for term in terms), key=len)
+        result = candidates[0]
+        for ids in candidates[1:]:
+            if not result:
+                break
+            result = array("Q", (task_id for task_id in result
+                                 if _contains(ids, task_id)))
+        return array("Q", result)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite storage backend
+
+SqliteStore keeps tasks in todos.db through QSqlDatabase/QSqlQuery (see
+the 07_sql examples). Every change is a row-level statement instead of a
+whole-file rewrite:
+- add:    INSERT of one row
+- toggle: UPDATE tasks SET done = ? WHERE id = ?
+- edit:   UPDATE tasks SET text = ? WHERE id = ?
+- remove: DELETE in chunks, inside one transaction
+
+Schema:
+
+    tasks(id INTEGER PRIMARY KEY, text, done, priority, tag, created_at)
+
+Filters and counts are not queried here: the whole list is loaded into
+TodoModel, whose FilterIndex (filtering.py) and TaskStats (stats.py)
+answer them in memory for every backend alike. On first use an existing
+todos.json is imported.
+"""
+
+import os
+
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+from model import Task
+from storage import JsonStore, TodoStore
+
+
+CONNECTION_NAME = "todo_store"
+DELETE_CHUNK = 500
+
+
+class SqliteStore(TodoStore):
+    """Row-level task storage in SQLite."""
+
+    name = "sqlite"
+
+    def __init__(self, data_dir: str, file_name: str = "todos.db"):
+        super().__init__(data_dir)
+        self.path = os.path.join(data_dir, file_name)
+        self.db = None
+        self._insert = None
+        self._update_done = None
+        self._update_text = None
+        self._load_total = 0
+        self._load_count = 0
+
+    @property
+    def location(self) -> str:
+        return self.path
+
+    # === Connection / schema ===
+
+    def open(self) -> bool:
+        if self.db is not None:
+            return True
+        if QSqlDatabase.contains(CONNECTION_NAME):
+            db = QSqlDatabase.database(CONNECTION_NAME, False)
+        else:
+            db = QSqlDatabase.addDatabase("QSQLITE", CONNECTION_NAME)
+        db.setDatabaseName(self.path)
+        if not db.open():
+            print(f"Error opening task database: {db.lastError().text()}")
+            return False
+        self.db = db
+
+        query = QSqlQuery(db)
+        query.exec("PRAGMA journal_mode=WAL")
+        query.exec("PRAGMA synchronous=NORMAL")
+        query.exec("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                text TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                priority INTEGER NOT NULL DEFAULT 1,
+                tag TEXT NOT NULL DEFAULT '',
+                created_at TEXT NOT NULL DEFAULT ''
+            )
+        """)
+        # Filter indexes of earlier versions only slowed down the writes
+        query.exec("DROP INDEX IF EXISTS tasks_done_priority")
+        query.exec("DROP INDEX IF EXISTS tasks_tag")
+
+        self._insert = self._prepare(
+            "INSERT INTO tasks (id, text, done, priority, tag, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)")
+        self._update_done = self._prepare("UPDATE tasks SET done = ? WHERE id = ?")
+        self._update_text = self._prepare("UPDATE tasks SET text = ? WHERE id = ?")
+        return True
+
+    def _prepare(self, sql: str) -> QSqlQuery:
+        query = QSqlQuery(self.db)
+        query.prepare(sql)
+        return query
+
+    def _exec(self, query: QSqlQuery, *values) -> bool:
+        for i, value in enumerate(values):
+            query.bindValue(i, value)
+        if not query.exec():
+            print(f"Error saving tasks: {query.lastError().text()}")
+            return False
+        return True
+
+    # === Loading ===
+
+    def load(self):
+        return list(self.load_iter())
+
+    def load_iter(self):
+        """Stream rows with a forward-only cursor."""
+        if not self.open():
+            return iter(())
+        self._load_total = self._count()
+        if self._load_total == 0:
+            self._import_json()
+            self._load_total = self._count()
+        self._load_count = 0
+        return self._rows()
+
+    def _rows(self):
+        query = QSqlQuery(self.db)
+        query.setForwardOnly(True)
+        query.exec("SELECT id, text, done, priority, tag, created_at FROM tasks ORDER BY id")
+        while query.next():
+            self._load_count += 1
+            yield Task(query.value(1),
+                       query.value(2),
+                       query.value(3),
+                       query.value(4),
+                       query.value(5),
+                       query.value(0))
+
+    def load_progress(self) -> float:
+        if self._load_total == 0:
+            return -1.0
+        return self._load_count / self._load_total
+
+    def _count(self) -> int:
+        """Number of stored tasks (the load progress total)."""
+        query = QSqlQuery(self.db)
+        if query.exec("SELECT COUNT(*) FROM tasks") and query.next():
+            return query.value(0)
+        return 0
+
+    def _import_json(self):
+        """Seed an empty database from an existing todos.json."""
+        tasks = JsonStore(self.data_dir).load()
+        if not tasks:
+            return
+        self.db.transaction()
+        for task in tasks:
+            self._insert_task(task)
+        self.db.commit()
+        print(f"Imported {len(tasks)} tasks from todos.json")
+
+    def _insert_task(self, task: Task):
+        self._exec(self._insert,
+                   task.id,
+                   task.text,
+                   1 if task.done else 0,
+                   int(task.priority),
+                   task.tag,
+                   task.created_at)
+
+    # === Row-level updates ===
+
+    def task_added(self, row: int):
+        self._insert_task(self.model.task(row))
+
+    def tasks_appended(self, first: int, last: int):
+        self.db.transaction()
+        for row in range(first, last + 1):
+            self._insert_task(self.model.task(row))
+        self.db.commit()
+
+    def tasks_inserted(self, ids):
+        self.db.transaction()
+        for task_id in ids:
+            self._insert_task(self.model.task(self.model.row_for_id(task_id)))
+        self.db.commit()
+
+    def task_changed(self, row: int, field: str):
+        task_id = self.model.task_id(row)
+        if field == "done":
+            self._exec(self._update_done, 1 if self.model.is_done(row) else 0, task_id)
+        elif field == "text":
+            self._exec(self._update_text, self.model.text(row), task_id)
+
+    def tasks_removed(self, ids):
+        ids = list(ids)
+        if not ids:
+            return
+        self.db.transaction()
+        query = QSqlQuery(self.db)
+        for start in range(0, len(ids), DELETE_CHUNK):
+            chunk = ids[start:start + DELETE_CHUNK]
+            query.prepare("DELETE FROM tasks WHERE id IN (%s)" % ",".join("?" * len(chunk)))
+            for i, task_id in enumerate(chunk):
+                query.bindValue(i, task_id)
+            if not query.exec():
+                print(f"Error saving tasks: {query.lastError().text()}")
+                self.db.rollback()
+                return
+        self.db.commit()
+
+    def flush(self):
+        if self.db is not None:
+            QSqlQuery(self.db).exec("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self):
+        if self.db is None:
+            return
+        self.flush()
+        self._insert = self._update_done = self._update_text = None
+        self.db.close()
+        self.db = None
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental task statistics
+
+TaskStats keeps running counters that every model mutation updates in O(1):
+- total / done (active is derived)
+- per-priority totals and done counts
+- per-tag totals and done counts (indexed by interned tag id)
+
+With debug mode enabled the counters can be checked against a full
+recount of the model arrays after each mutation.
+"""
+
+import os
+
+
+def debug_stats_enabled() -> bool:
+    """Debug recounts are enabled with TODO_DEBUG_STATS=1."""
+    return os.environ.get("TODO_DEBUG_STATS", "") not in ("", "0")
+
+
+class TaskStats:
+    """Running counters for a task table."""
+
+    __slots__ = ("total", "done", "priority_total", "priority_done",
+                 "tag_total", "tag_done")
+
+    def __init__(self, priority_count: int = 3):
+        self.total = 0
+        self.done = 0
+        self.priority_total = [0] * priority_count
+        self.priority_done = [0] * priority_count
+        self.tag_total = []
+        self.tag_done = []
+
+    @property
+    def active(self) -> int:
+        return self.total - self.done
+
+    def tag_count(self, tag_id: int) -> int:
+        return self.tag_total[tag_id] if tag_id < len(self.tag_total) else 0
+
+    # === Updates ===
+
+    def add(self, priority: int, tag_id: int, done: bool):
+        self._ensure_tag(tag_id)
+        flag = 1 if done else 0
+        self.total += 1
+        self.done += flag
+        self.priority_total[priority] += 1
+        self.priority_done[priority] += flag
+        self.tag_total[tag_id] += 1
+        self.tag_done[tag_id] += flag
+
+    def add_many(self, done_flags, priorities, tag_ids):
+        """Account for a batch of new tasks in one pass."""
+        if not tag_ids:
+            return
+        self._ensure_tag(max(tag_ids))
+        priority_total, priority_done = self.priority_total, self.priority_done
+        tag_total, tag_done = self.tag_total, self.tag_done
+        done = 0
+        for flag, priority, tag_id in zip(done_flags, priorities, tag_ids):
+            priority_total[priority] += 1
+            tag_total[tag_id] += 1
+            if flag:
+                done += 1
+                priority_done[priority] += 1
+                tag_done[tag_id] += 1
+        self.total += len(tag_ids)
+        self.done += done
+
+    def remove(self, priority: int, tag_id: int, done: bool):
+        flag = 1 if done else 0
+        self.total -= 1
+        self.done -= flag
+        self.priority_total[priority] -= 1
+        self.priority_done[priority] -= flag
+        self.tag_total[tag_id] -= 1
+        self.tag_done[tag_id] -= flag
+
+    def set_done(self, priority: int, tag_id: int, done: bool):
+        """Account for one task switching its done flag."""
+        delta = 1 if done else -1
+        self.done += delta
+        self.priority_done[priority] += delta
+        self.tag_done[tag_id] += delta
+
+    def reset(self):
+        count = len(self.priority_total)
+        self.total = 0
+        self.done = 0
+        self.priority_total = [0] * count
+        self.priority_done = [0] * count
+        self.tag_total = []
+        self.tag_done = []
+
+    # === Recount / verification ===
+
+    @classmethod
+    def recount(cls, done_flags, priorities, tag_ids,
+                priority_count: int = 3) -> "TaskStats":
+        """Build counters from scratch by scanning the arrays."""
+        stats = cls(priority_count)
+        for flag, priority, tag_id in zip(done_flags, priorities, tag_ids):
+            stats.add(priority, tag_id, flag)
+        return stats
+
+    def verify(self, done_flags, priorities, tag_ids):
+        """Compare against a full recount; raise AssertionError on mismatch."""
+        expected = TaskStats.recount(done_flags, priorities, tag_ids,
+                                     len(self.priority_total))
+        mismatches = [
+            name for name in self.__slots__
+            if _trimmed(getattr(self, name)) != _trimmed(getattr(expected, name))
+        ]
+        if mismatches:
+            raise AssertionError(
+                "TaskStats out of sync: " + ", ".join(
+                    f"{name}={getattr(self, name)!r} expected "
+                    f"{getattr(expected, name)!r}" for name in mismatches))
+
+    def _ensure_tag(self, tag_id: int):
+        missing = tag_id + 1 - len(self.tag_total)
+        if missing > 0:
+            self.tag_total.extend([0] * missing)
+            self.tag_done.extend([0] * missing)
+
+
+def _trimmed(value):
+    """Ignore trailing zero tag counters when comparing."""
+    if isinstance(value, list):
+        value = list(value)
+        while value and value[-1] == 0:
+            value.pop()
+    return value
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Todo storage backends
+
+A TodoStore loads Task records at startup (load_iter() may stream them)
+and then follows the model's change signals (taskAdded, tasksAppended,
+tasksInserted, taskFieldChanged, tasksRemoved), so each backend decides
+how much I/O a single change costs:
+- "json":    todos.json rewritten in full, debounced on a worker thread;
+             writes are locked and external changes are merged (sync.py)
+- "journal": append-only operation log plus periodic snapshot (journal.py)
+- "sqlite":  row-level updates in an indexed SQLite table (sqlite_store.py)
+
+The backend is chosen with the TODO_STORAGE environment variable.
+"""
+
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+
+from loader import JsonArrayReader
+from model import Task, strip_label
+from persistence import (
+    TASKS_FORMAT_VERSION, SaveScheduler, encode_tasks_json, save_delay_from_env,
+    write_atomic
+)
+from sync import (
+    TaskFileWatcher, file_lock, file_signature, merge_changes, read_task_file,
+    snapshot_base
+)
+
+
+STORAGE_BACKENDS = ("json", "journal", "sqlite")
+DEFAULT_STORAGE = "json"
+
+
+def storage_from_env() -> str:
+    """Backend name from TODO_STORAGE, falling back to the default."""
+    kind = os.environ.get("TODO_STORAGE", DEFAULT_STORAGE).strip().lower()
+    return kind if kind in STORAGE_BACKENDS else DEFAULT_STORAGE
+
+
+class TodoStore(ABC):
+    """Base class for storage backends."""
+
+    name = ""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.model = None
+
+    @property
+    def location(self) -> str:
+        """Human readable location of the data (for logging)."""
+        return self.data_dir
+
+    @abstractmethod
+    def load(self):
+        """Return the stored tasks as Task records, in id order."""
+
+    def load_iter(self):
+        """Iterate task records; backends that can parse lazily override this."""
+        return iter(self.load())
+
+    def load_progress(self) -> float:
+        """Progress of the current load_iter() as 0.0 - 1.0, or -1 if unknown."""
+        return -1.0
+
+    def attach(self, model):
+        """Start following changes of a model that was filled from load()."""
+        self.model = model
+        model.taskAdded.connect(self.task_added)
+        model.tasksAppended.connect(self.tasks_appended)
+        model.tasksInserted.connect(self.tasks_inserted)
+        model.taskFieldChanged.connect(self.task_changed)
+        model.tasksRemoved.connect(self.tasks_removed)
+
+    @abstractmethod
+    def task_added(self, row: int):
+        """A task was appended at row."""
+
+    def tasks_appended(self, first: int, last: int):
+        for row in range(first, last + 1):
+            self.task_added(row)
+
+    def tasks_inserted(self, ids):
+        """Tasks restored with their old ids (e.g. by undo)."""
+        for task_id in ids:
+            self.task_added(self.model.row_for_id(task_id))
+
+    @abstractmethod
+    def task_changed(self, row: int, field: str):
+        """One field of the task at row changed."""
+
+    @abstractmethod
+    def tasks_removed(self, ids):
+        """The tasks with these ids were removed."""
+
+    def flush(self):
+        """Make sure every change so far has reached the disk."""
+
+    def close(self):
+        """Flush and release resources (called on aboutToQuit)."""
+        self.flush()
+
+
+class JsonStore(TodoStore):
+    """Whole-file todos.json store with debounced background writes.
+
+    The file may be shared with other processes: every write happens
+    under the file lock and only if the file is still the version this
+    store last read or wrote; otherwise the write is skipped, the
+    external version is merged by task id and the result is saved again.
+
+    _write() runs on the save worker thread: the fields describing the
+    file version (_base, _signature, _written, _conflict) are only read
+    and assigned under _state_lock. The file lock only keeps other
+    processes out.
+    """
+
+    name = "json"
+
+    def __init__(self, data_dir: str, save_delay_ms: int = None, watch: bool = True):
+        super().__init__(data_dir)
+        self.path = os.path.join(data_dir, "todos.json")
+        if save_delay_ms is None:
+            save_delay_ms = save_delay_from_env()
+        self._save_delay_ms = save_delay_ms
+        self._watch = watch
+        self.saver = None
+        self.reader = None
+        self.watcher = None
+        self._base = None  # snapshot or {id: record} matching the file
+        self._signature = None  # file_signature() of that version
+        self._written = None  # file_signature() of this store's last write
+        self._conflict = False
+        self._state_lock = threading.Lock()
+
+    @property
+    def location(self) -> str:
+        return self.path
+
+    def load(self):
+        try:
+            return list(self.load_iter())
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+            return []
+
+    def load_iter(self):
+        """Stream records from todos.json without parsing it in one go."""
+        self._signature = file_signature(self.path)
+        self.reader = JsonArrayReader(self.path)
+        return self._records(self.reader)
+
+    def load_progress(self) -> float:
+        return self.reader.progress() if self.reader else -1.0
+
+    def format_version(self) -> int:
+        """Format version of the loaded file (1: bare array of labels)."""
+        if self.reader is None or self.reader.is_object is None:
+            return TASKS_FORMAT_VERSION
+        if not self.reader.is_object:
+            return 1
+        # Version 2 introduced the object layout; "version" may follow "tasks"
+        return self.reader.header.get("version", 2)
+
+    def _records(self, reader):
+        for task_id, task in enumerate(reader, start=1):
+            if self.format_version() >= 2:
+                yield Task.from_dict(task)
+            else:
+                # Version 1 stored the label: recover text, assign ids
+                task["text"] = strip_label(task.get("text", ""))
+                yield Task.from_dict(task, task_id)
+
+    def attach(self, model):
+        self.saver = SaveScheduler(self._snapshot, self._write,
+                                   delay_ms=self._save_delay_ms, parent=model)
+        self._base = model.snapshot()
+        self.watcher = TaskFileWatcher(self, parent=model)
+        if not self._watch:
+            self.watcher.stop()
+        super().attach(model)
+        if self.format_version() < TASKS_FORMAT_VERSION and os.path.exists(self.path):
+            self._migrate()
+
+    def _migrate(self):
+        """Rewrite an old todos.json in the current format, keeping a backup."""
+        backup = f"{self.path}.v{self.format_version()}.bak"
+        try:
+            if not os.path.exists(backup):
+                shutil.copy2(self.path, backup)
+        except OSError as e:
+            print(f"Error backing up tasks: {e}")
+            return
+        print(f"Migrating {self.path} to format version {TASKS_FORMAT_VERSION}")
+        self.saver.mark_dirty()
+
+    def _snapshot(self):
+        # The file version the snapshot is based on travels with it
+        with self._state_lock:
+            signature = self._signature
+        return self.model.snapshot(), signature
+
+    def _write(self, payload):
+        """Serialize and write a snapshot (runs on the save worker thread)."""
+        snapshot, expected = payload
+        data = encode_tasks_json(snapshot)
+        with file_lock(self.path):
+            current = file_signature(self.path)
+            with self._state_lock:
+                # Writes run in order, so a file from our own previous write is
+                # older than this snapshot even if it was queued before that write
+                ours = current in (expected, self._written)
+                if not ours:
+                    self._conflict = True
+            if not ours:
+                # Someone else wrote the file: merge first, then save again
+                self.watcher.conflict.emit()
+                return
+            write_atomic(self.path, data)
+            signature = file_signature(self.path)
+            with self._state_lock:
+                self._base = snapshot
+                self._signature = self._written = signature
+
+    def merge_external(self) -> int:
+        """Merge the file into the model if another process changed it.
+
+        Returns the number of tasks that changed.
+        """
+        if self.model is None:
+            return 0
+        with self._state_lock:
+            conflict, known = self._conflict, self._signature
+        if not conflict and file_signature(self.path) == known:
+            return 0
+        changes = 0
+        with file_lock(self.path):
+            signature = file_signature(self.path)
+            with self._state_lock:
+                known, base, conflict = self._signature, self._base, self._conflict
+            if signature != known:
+                theirs = read_task_file(self.path) if signature is not None else {}
+                if not isinstance(base, dict):
+                    base = snapshot_base(base)  # converted only when needed
+                pending = self.saver.dirty or conflict
+                changes = merge_changes(self.model, base, theirs)
+                with self._state_lock:
+                    self._base = theirs
+                    self._signature = signature
+                if not pending:
+                    self.saver.cancel()  # no local changes: the model equals the file
+        with self._state_lock:
+            conflict, self._conflict = self._conflict, False
+        if conflict:
+            # The skipped write is still due, whether or not there was anything to merge
+            self.saver.mark_dirty()
+        return changes
+
+    def task_added(self, row: int):
+        self.saver.mark_dirty()
+
+    def tasks_appended(self, first: int, last: int):
+        self.saver.mark_dirty()
+
+    def tasks_inserted(self, ids):
+        self.saver.mark_dirty()
+
+    def task_changed(self, row: int, field: str):
+        self.saver.mark_dirty()
+
+    def tasks_removed(self, ids):
+        self.saver.mark_dirty()
+
+    def flush(self):
+        if self.saver is None:
+            return
+        self.saver.flush()
+        for _ in range(3):
+            with self._state_lock:
+                conflict = self._conflict
+            if not conflict:
+                break
+            # The write was skipped: merge now instead of on the next event
+            self.merge_external()
+            self.saver.flush()
+
+    def close(self):
+        if self.saver is not None:
+            self.flush()
+            self.watcher.stop()
+            self.saver.shutdown()
+
+
+def create_store(kind: str, data_dir: str, save_delay_ms: int = None) -> TodoStore:
+    """Create a storage backend by name."""
+    if kind == "json":
+        return JsonStore(data_dir, save_delay_ms)
+    if kind == "journal":
+        from journal import JournalStore
+        return JournalStore(data_dir)
+    if kind == "sqlite":
+        from sqlite_store import SqliteStore
+        return SqliteStore(data_dir)
+    raise ValueError(f"Unknown storage backend: {kind}")
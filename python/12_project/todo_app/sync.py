@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Multi-process safe todos.json
+
+Several processes may share one todos.json (two app instances, the
+Clojure-embedded copy, a sync tool):
+- file_lock() holds an advisory QLockFile ("todos.json.lock") around
+  "check the file, then replace it", so a writer never overwrites a
+  version it has not merged; stale locks of crashed processes are broken
+- file_signature() (mtime, size, inode) tells our own writes apart from
+  external ones
+- TaskFileWatcher watches the file with QFileSystemWatcher and, when
+  someone else replaced it, merges the difference into the model
+
+Merging is a three-way diff by task id: "base" is the file content this
+process last read or wrote, "theirs" the new file content. Only tasks
+that differ between the two are touched in the model (set_done, set_text,
+insert_tasks, remove_ids), so the view is never reset and local changes
+that were not saved yet survive; the next save writes the merged list.
+Conflicts resolve per task: a local removal wins over an external edit,
+and two new tasks that got the same id keep both (theirs is renumbered).
+"""
+
+import json
+import os
+from contextlib import contextmanager
+
+from PySide6.QtCore import QFileSystemWatcher, QLockFile, QObject, QTimer, Signal
+
+from model import Task, strip_label
+from persistence import snapshot_records
+
+
+LOCK_TIMEOUT_MS = 5000
+STALE_LOCK_MS = 30000
+WATCH_DELAY_MS = 100
+INCREMENTAL_LIMIT = 64  # larger merges use one batch (one model reset)
+
+
+def file_signature(path: str):
+    """(mtime_ns, size, inode) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+@contextmanager
+def file_lock(path: str, timeout_ms: int = LOCK_TIMEOUT_MS):
+    """Hold the advisory lock of path ("<path>.lock") for a read or write."""
+    lock = QLockFile(path + ".lock")
+    lock.setStaleLockTime(STALE_LOCK_MS)
+    if not lock.tryLock(timeout_ms):
+        raise TimeoutError(f"{path} is locked by another process")
+    try:
+        yield
+    finally:
+        lock.unlock()
+
+
+def task_fields(task: Task) -> tuple:
+    """The compared fields of a task (everything except the id)."""
+    return (task.text, task.done, int(task.priority), task.tag, task.created_at)
+
+
+def snapshot_base(snapshot) -> dict:
+    """{id: stored record} of a TaskSnapshot, the base of the next merge."""
+    return {record["id"]: record for record in snapshot_records(snapshot)}
+
+
+def read_task_file(path: str) -> dict:
+    """Read todos.json into {id: stored record}.
+
+    Version 1 records are converted (positional ids, label stripped).
+    """
+    with open(path, 'rb') as f:
+        content = json.load(f)  # one pass is faster than the streaming reader
+    if isinstance(content, dict):
+        return {record.get("id"): record for record in content.get("tasks", [])}
+    records = {}
+    for position, data in enumerate(content, start=1):
+        data["text"] = strip_label(data.get("text", ""))
+        records[position] = Task.from_dict(data, position).to_dict()
+    return records
+
+
+def merge_changes(model, base: dict, theirs: dict) -> int:
+    """Apply the changes from base to theirs to the model, by task id.
+
+    Both map ids to stored records; records that compare equal are
+    skipped without building Task objects. Returns the number of changed
+    tasks.
+    """
+    removed = [task_id for task_id in base if task_id not in theirs]
+    inserts, replaced, rekeyed = [], [], []
+    changes = 0
+    for task_id, record in theirs.items():
+        old_record = base.get(task_id)
+        if old_record == record:
+            continue
+        task = Task.from_dict(record)
+        fields = task_fields(task)
+        old = None if old_record is None else task_fields(Task.from_dict(old_record))
+        if old == fields:
+            continue
+        changes += 1
+        row = model.row_for_id(task_id)
+        if old is None:
+            if row < 0:
+                inserts.append(task)
+            elif task_fields(model.task(row)) != fields:
+                # Both sides added a task with this id: keep ours, renumber theirs
+                task.id = None
+                rekeyed.append(task)
+        elif row < 0:
+            continue  # removed here; the local removal wins
+        elif old[2:] != fields[2:]:
+            replaced.append(task)  # priority/tag changed: replace the row
+        else:
+            if old[1] != task.done:
+                model.set_done(row, task.done)
+            if old[0] != task.text:
+                model.set_text(row, task.text)
+
+    changes += len(removed)
+    removed += [task.id for task in replaced]
+    inserts += replaced
+    if len(removed) + len(inserts) <= INCREMENTAL_LIMIT:
+        # Row by row: the view keeps its scroll position and selection
+        for task_id in removed:
+            model.remove_ids([task_id])
+        for task in inserts:
+            model.insert_tasks([task])
+    else:
+        model.remove_ids(removed)
+        model.insert_tasks(inserts)
+    model.append_tasks(rekeyed)
+    return changes
+
+
+class TaskFileWatcher(QObject):
+    """Merge external changes of a JsonStore's file into its model."""
+
+    merged = Signal(int)  # number of changed tasks
+    conflict = Signal()   # emitted by the save worker: file changed under us
+
+    def __init__(self, store, delay_ms: int = WATCH_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._watching = True
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.addPath(os.path.dirname(store.path))
+        self._watch_file()
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.check)
+        self.conflict.connect(self.check)  # queued from the worker thread
+
+    def stop(self):
+        """Stop watching (conflicts reported by the store still merge)."""
+        self._watching = False
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _watch_file(self):
+        # An atomic replace drops the old file from the watch list
+        path = self.store.path
+        if self._watching and os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def _schedule(self, path: str = ""):
+        self._timer.start()
+
+    def check(self):
+        """Merge the file if it changed since we last read or wrote it."""
+        self._watch_file()
+        try:
+            changes = self.store.merge_external()
+        except Exception as e:
+            print(f"Error merging external changes: {e}")
+            return
+        if changes:
+            self.merged.emit(changes)
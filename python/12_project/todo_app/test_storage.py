@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regression tests for the json storage backend
+
+    python3 test_storage.py
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from PySide6.QtCore import QCoreApplication
+
+from core import TodoCore
+from storage import create_store
+from sync import file_lock
+from transfer import read_tasks
+
+
+def read_texts(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [task["text"] for task in json.load(f)["tasks"]]
+
+
+class TestJsonStore(unittest.TestCase):
+    """JsonStore writes, conflicts and merges."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="todo-test-")
+        self.path = os.path.join(self.data_dir, "todos.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def write_file(self, content: str):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def open_core(self):
+        store = create_store("json", self.data_dir, save_delay_ms=10)
+        core = TodoCore(store)
+        core.load()
+        return core, store
+
+    def test_back_to_back_writes(self):
+        """A write queued before our previous write finished is not a conflict."""
+        core, store = self.open_core()
+        core.add_task("a")
+        store.saver._write_now()
+        core.add_task("b")
+        store.saver._write_now()
+        core.close()
+        self.assertFalse(store._conflict)
+        self.assertFalse(store.saver.dirty)
+        self.assertEqual(read_texts(self.path), ["a", "b"])
+
+    def test_external_write_is_merged(self):
+        """A file written by another process is merged before saving again."""
+        core, store = self.open_core()
+        core.add_task("a")
+        core.flush()
+        with file_lock(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            external = dict(data["tasks"][0], id=2, text="external")
+            data["tasks"].append(external)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        core.add_task("b")
+        core.close()
+        self.assertFalse(store._conflict)
+        self.assertEqual(sorted(read_texts(self.path)), ["a", "b", "external"])
+
+    def test_version_after_tasks(self):
+        """A version 2 file is read as version 2 whatever its key order."""
+        self.write_file('{"tasks": [{"id": 10, "text": "a [x] b", "done": false, '
+                        '"priority": "High", "tag": ""}], "version": 2}')
+        core, store = self.open_core()
+        self.assertEqual(store.format_version(), 2)
+        self.assertEqual(core.model.task_id(0), 10)
+        self.assertEqual(core.model.text(0), "a [x] b")
+        core.close()
+        self.assertFalse(os.path.exists(self.path + ".v1.bak"))  # no migration
+        self.assertEqual([task.text for task in read_tasks(self.path)], ["a [x] b"])
+
+    def test_version_1_is_migrated(self):
+        """A bare array of labels is converted and rewritten as version 2."""
+        self.write_file('[{"text": "a [High] #x", "done": true}]')
+        core, store = self.open_core()
+        self.assertEqual(store.format_version(), 1)
+        self.assertEqual(core.model.text(0), "a")
+        core.close()
+        self.assertTrue(os.path.exists(self.path + ".v1.bak"))
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["version"], 2)
+        imported = os.path.join(self.data_dir, "v1.json")
+        shutil.copy(self.path + ".v1.bak", imported)
+        self.assertEqual([task.text for task in read_tasks(imported)], ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
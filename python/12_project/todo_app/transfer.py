@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk task import/export
+
+The format is picked by file extension:
+- .json:            the todos.json format (any version)
+- .ndjson / .jsonl: one task object per line
+- .csv:             header row with text, done, priority, tag, createdAt
+
+Imports are parsed into Task records (without ids) and handed to
+TodoModel.append_tasks() at once: a single beginInsertRows/endInsertRows,
+so the stats label, the filter proxy and the storage backend react once
+per import instead of once per task.
+Exports serialize a snapshot of the model columns.
+"""
+
+import csv
+import io
+import json
+import os
+
+from loader import JsonArrayReader
+from model import PRIORITY_LABELS, Task, TaskSnapshot, strip_label
+from persistence import encode_tasks_json, write_atomic
+
+
+FIELDS = ("text", "done", "priority", "tag", "createdAt")
+FORMATS = {".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+FILE_FILTER = "Tasks (*.json *.ndjson *.jsonl *.csv)"
+
+_TRUE_VALUES = {"1", "true", "yes", "y", "x", "done"}
+
+
+def file_format(path: str) -> str:
+    """Format name for a file path; raises ValueError for unknown extensions."""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        return FORMATS[ext]
+    except KeyError:
+        raise ValueError(f"Unsupported file type: {ext or path}") from None
+
+
+def _is_true(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_VALUES
+    return bool(value)
+
+
+def normalize_record(task: dict, decorated: bool = False):
+    """Turn an imported object into a Task without id, or None if it has no text.
+
+    decorated is set for version 1 todos.json files, whose "text" is the
+    display label ("text [Priority] #tag").
+    """
+    text = str(task.get("text") or "").strip()
+    if decorated:
+        text = strip_label(text)
+    if not text:
+        return None
+    return Task.from_dict({
+        "text": text,
+        "done": _is_true(task.get("done", False)),
+        "priority": task.get("priority"),
+        "tag": str(task.get("tag") or "").strip(),
+        "createdAt": task.get("createdAt")
+    })
+
+
+def _read_ndjson(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_csv(path: str):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def read_tasks(path: str):
+    """Iterate normalized records from a task file."""
+    fmt = file_format(path)
+    reader = None
+    if fmt == "json":
+        tasks = reader = JsonArrayReader(path)
+    elif fmt == "ndjson":
+        tasks = _read_ndjson(path)
+    else:
+        tasks = _read_csv(path)
+    for task in tasks:
+        decorated = reader is not None and not reader.is_object  # version 1: labels
+        record = normalize_record(task, decorated)
+        if record is not None:
+            yield record
+
+
+def import_tasks(model, path: str) -> int:
+    """Append all tasks of a file to the model; returns the number added."""
+    return model.append_tasks(read_tasks(path))
+
+
+def _rows(snapshot: TaskSnapshot):
+    tags = snapshot.tags
+    for text, done, priority, tag_id, created_at in zip(
+            snapshot.text, snapshot.done, snapshot.priority,
+            snapshot.tag, snapshot.created):
+        yield {
+            "text": text,
+            "done": bool(done),
+            "priority": PRIORITY_LABELS[priority],
+            "tag": tags[tag_id],
+            "createdAt": created_at
+        }
+
+
+def encode_tasks(snapshot: TaskSnapshot, fmt: str) -> bytes:
+    """Serialize a snapshot in one of the FORMATS."""
+    if fmt == "json":
+        return encode_tasks_json(snapshot)
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in _rows(snapshot)).encode("utf-8")
+    if fmt == "csv":
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+        for row in _rows(snapshot):
+            row["done"] = "true" if row["done"] else "false"
+            writer.writerow(row)
+        return out.getvalue().encode("utf-8")
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+def export_tasks(snapshot: TaskSnapshot, path: str) -> int:
+    """Write a snapshot to path; returns the number of tasks written."""
+    write_atomic(path, encode_tasks(snapshot, file_format(path)))
+    return len(snapshot.text)